@@ -0,0 +1,111 @@
+"""
+Memory and string-operation benchmark: NumPy object columns vs Arrow-backed
+strings (``string[pyarrow]``) on a wide, text-heavy CSV.
+
+A synthetic file (or the CSV given with ``--csv``) is loaded twice: the
+legacy way (``dtype=str`` then ``pd.to_numeric`` per column, as the upload
+page did) and with ``FileValidation.read_file(arrow_strings=True)``. For each
+frame the deep memory footprint and the time of the text-heavy services
+(email/name anonymization, email hashing, categorical consistency) are printed.
+
+Usage (from the repository root):
+    python benchmarks/bench_arrow_strings.py [--rows N] [--text-columns N] [--csv PATH]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from domain.data_file import DataFile  # noqa: E402
+from services.anonymization import Anonymization  # noqa: E402
+from services.data_validation import FileValidation  # noqa: E402
+from services.quality_analysis import CategoricalValueChecker, DataAnonymizer  # noqa: E402
+
+WORDS = np.array(["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"])
+
+
+def make_csv(path, rows, text_columns, seed=0):
+    """Writes a wide CSV: emails, names, free text, low-cardinality codes and a few numbers."""
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(0, rows, rows).astype(str)
+    columns = {
+        "customer_name": np.char.add("Customer ", ids),
+        "email": np.char.add(np.char.add("user", ids), "@example.com"),
+        "amount": rng.normal(100, 20, rows).round(2),
+        "visits": rng.integers(0, 50, rows).astype(float),
+    }
+    columns["visits"][::13] = np.nan
+    for i in range(text_columns):
+        first, second = WORDS[rng.integers(0, len(WORDS), rows)], WORDS[rng.integers(0, len(WORDS), rows)]
+        columns[f"text_{i}"] = np.char.add(np.char.add(first, " "), second)
+    pd.DataFrame(columns).to_csv(path, index=False)
+
+
+def load_legacy(data_file):
+    df = FileValidation().read_file(data_file, arrow_strings=False, dtype=str)
+    for col in df.columns:
+        try:
+            df[col] = pd.to_numeric(df[col])
+        except (ValueError, TypeError):
+            pass
+    return df
+
+
+def load_arrow(data_file):
+    return FileValidation().read_file(data_file, arrow_strings=True)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def measure(df):
+    return {
+        "memory (MB)": df.memory_usage(deep=True).sum() / 1e6,
+        "DataAnonymizer (s)": timed(DataAnonymizer.anonymize_data, df),
+        "Anonymization hash (s)": timed(Anonymization().anonymize_dataframe, df[["email"]].copy()),
+        "CategoricalValueChecker (s)": timed(CategoricalValueChecker.check_categorical_values, df),
+        "str.lower + contains (s)": timed(lambda: [df[col].str.lower().str.contains("ha", regex=False).sum()
+                                                    for col in df.columns if col.startswith("text_")]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--text-columns", type=int, default=20)
+    parser.add_argument("--csv", help="benchmark this CSV instead of a synthetic one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv
+        if path is None:
+            path = os.path.join(tmp, "wide_text.csv")
+            make_csv(path, args.rows, args.text_columns)
+        data_file = DataFile.from_path(path)
+
+        results = {}
+        for label, loader in (("object", load_legacy), ("string[pyarrow]", load_arrow)):
+            start = time.perf_counter()
+            df = loader(data_file)
+            load_seconds = time.perf_counter() - start
+            results[label] = {"load (s)": load_seconds, **measure(df)}
+            del df
+
+    print(f"{data_file.name}: {data_file.size / 1e6:.1f} MB on disk")
+    print(f"{'':<30}{'object':>12}{'string[pyarrow]':>18}{'speedup':>10}")
+    for metric in results["object"]:
+        legacy, arrow = results["object"][metric], results["string[pyarrow]"][metric]
+        print(f"{metric:<30}{legacy:>12.2f}{arrow:>18.2f}{legacy / arrow:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
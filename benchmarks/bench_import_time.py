@@ -0,0 +1,69 @@
+"""
+Cold-start import benchmark for the Streamlit pages.
+
+Each module is imported in a fresh interpreter with ``python -X importtime``
+(after ``streamlit``, which every page needs anyway), and the cumulative
+time plus the slowest nested imports are printed.
+
+Usage (from the repository root):
+    python benchmarks/bench_import_time.py [module ...] [--repeat N] [--top N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+DEFAULT_MODULES = [
+    "presentation.ui",
+    "presentation.summary_page",
+    "presentation.visualization_page",
+    "services.quality_analysis",
+]
+
+
+def import_times(module):
+    """
+    Returns ({imported module: cumulative microseconds}, [top-level packages
+    first imported by ``module``]) for importing ``module`` after streamlit.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import streamlit, {module}"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    after_streamlit = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+        # Lines are printed when an import finishes, so everything after the
+        # streamlit line was pulled in by the module under test
+        if "streamlit" in times and name.strip() != "streamlit":
+            after_streamlit.append(name.strip())
+    return times, [name for name in after_streamlit if "." not in name and name != module]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per module; the best is reported")
+    parser.add_argument("--top", type=int, default=8, help="slowest top-level imports to list")
+    args = parser.parse_args()
+
+    print(f"{'module':<40}{'streamlit (ms)':>16}{'module (ms)':>14}")
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        times, packages = min(runs, key=lambda run: run[0].get(module, 0))
+        print(f"{module:<40}{times.get('streamlit', 0) / 1000:>16.1f}{times.get(module, 0) / 1000:>14.1f}")
+
+        for name in sorted(packages, key=times.get, reverse=True)[:args.top]:
+            print(f"    {name:<36}{times[name] / 1000:>10.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,28 @@
+import os
+import sys
 import pandas as pd
 
-def export_clean_data(df, file_name="cleaned_data"):
-    df.to_csv(f"{file_name}.csv", index=False)
-    df.to_json(f"{file_name}.json", orient="records")
-    print(f"✅ Data exported as {file_name}.csv and {file_name}.json")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from infrastructure.data_export import DataExporter  # noqa: E402
+
+
+def print_progress(stage, fraction):
+    print(f"\r⏳ {stage}: {fraction:.0%}", end="", flush=True)
+
+
+def export_clean_data(df, file_name="cleaned_data", formats=("csv", "ndjson"), compression=None, chunk_rows=None):
+    """
+    Writes ``df`` to ``file_name`` + extension in each format (csv, ndjson,
+    parquet, feather), chunk by chunk and in parallel, optionally compressed
+    with gzip or zstd. Returns {format: path}.
+    """
+    paths = DataExporter(chunk_rows=chunk_rows).export(df, file_name, formats, compression, progress_callback=print_progress)
+    print(f"\n✅ Data exported as {', '.join(paths.values())}")
+    return paths
 
 if __name__ == "__main__":
     # Example usage with dummy data
     data = {'A': [1, 2, None], 'B': ['X', 'Y', 'Z']}
     df = pd.DataFrame(data).fillna(0)  # Clean missing values
-    export_clean_data(df)
+    export_clean_data(df, formats=("csv", "ndjson", "parquet"), compression="zstd")
@@ -1,3 +1,74 @@
 import os
+import tempfile
 
-# Configuration settings go here
\ No newline at end of file
+# Configuration settings go here
+
+# Number of rows read per chunk when streaming files from disk
+CHUNK_SIZE = int(os.environ.get("SMARTSANITIZE_CHUNK_SIZE", 100_000))
+
+# Working directory for caches and temporary files
+WORK_DIR = os.environ.get("SMARTSANITIZE_WORK_DIR", os.path.join(tempfile.gettempdir(), "smartsanitize"))
+
+# Rendered report charts, cached by data fingerprint
+REPORT_CACHE_DIR = os.path.join(WORK_DIR, "chart_cache")
+
+# Worker processes used to render report charts (0 renders in-process)
+REPORT_RENDER_WORKERS = int(os.environ.get("SMARTSANITIZE_RENDER_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Background worker threads for long-running analyses
+JOB_WORKERS = int(os.environ.get("SMARTSANITIZE_JOB_WORKERS", 2))
+
+# Sample-first profiling: datasets larger than APPROX_MIN_ROWS are profiled on a
+# sample of APPROX_SAMPLE_SIZE rows first while the exact pass runs in the background
+APPROX_SAMPLE_SIZE = int(os.environ.get("SMARTSANITIZE_APPROX_SAMPLE_SIZE", 50_000))
+APPROX_MIN_ROWS = int(os.environ.get("SMARTSANITIZE_APPROX_MIN_ROWS", 200_000))
+
+# Categorical association (Cramér's V / NMI) is estimated on at most this many rows (0 = all rows)
+ASSOCIATION_SAMPLE_SIZE = int(os.environ.get("SMARTSANITIZE_ASSOCIATION_SAMPLE_SIZE", 100_000))
+
+# Candidate keys and functional dependencies are searched on at most this many rows
+# (0 = all rows); every candidate found on the sample is then verified on the full data
+KEY_DISCOVERY_SAMPLE_SIZE = int(os.environ.get("SMARTSANITIZE_KEY_DISCOVERY_SAMPLE_SIZE", 10_000))
+
+# Local HTTP service: worker processes for CPU-heavy analyzers, requests allowed
+# in flight before the service answers 503, the largest accepted request body,
+# and the disk space of parsed datasets kept for reuse (spilled as Arrow files)
+SERVICE_HOST = os.environ.get("SMARTSANITIZE_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.environ.get("SMARTSANITIZE_SERVICE_PORT", 8765))
+SERVICE_WORKERS = int(os.environ.get("SMARTSANITIZE_SERVICE_WORKERS", min(4, os.cpu_count() or 1)))
+SERVICE_MAX_PENDING = int(os.environ.get("SMARTSANITIZE_SERVICE_MAX_PENDING", 2 * SERVICE_WORKERS))
+SERVICE_MAX_BODY_BYTES = int(os.environ.get("SMARTSANITIZE_SERVICE_MAX_BODY_BYTES", 1 << 30))
+SERVICE_CACHE_BYTES = int(os.environ.get("SMARTSANITIZE_SERVICE_CACHE_BYTES", 4 << 30))
+SERVICE_CACHE_DIR = os.path.join(WORK_DIR, "service_cache")
+
+# Uploaded files are spilled here (one directory per session) and parsed from disk;
+# session directories older than UPLOAD_MAX_AGE_HOURS are swept on startup
+UPLOAD_DIR = os.path.join(WORK_DIR, "uploads")
+UPLOAD_MAX_AGE_HOURS = float(os.environ.get("SMARTSANITIZE_UPLOAD_MAX_AGE_HOURS", 24))
+
+# Load text columns as Arrow-backed strings (string[pyarrow]) and integer/boolean
+# columns with missing values as nullable dtypes; set to 0 for NumPy object columns
+ARROW_STRINGS = os.environ.get("SMARTSANITIZE_ARROW_STRINGS", "1").lower() not in ("0", "false", "no")
+
+# Data export: target uncompressed size of each written chunk / Parquet row group
+# (rows per chunk are derived from it unless set explicitly), formats written in
+# parallel, and the largest export offered as an in-browser download
+EXPORT_CHUNK_BYTES = int(os.environ.get("SMARTSANITIZE_EXPORT_CHUNK_MB", 64)) * (1 << 20)
+EXPORT_WORKERS = int(os.environ.get("SMARTSANITIZE_EXPORT_WORKERS", min(4, os.cpu_count() or 1)))
+EXPORT_DOWNLOAD_LIMIT_BYTES = int(os.environ.get("SMARTSANITIZE_EXPORT_DOWNLOAD_LIMIT_MB", 200)) * (1 << 20)
+
+# Memory governor: operations whose estimated footprint exceeds the budget run in
+# chunks or on a sample instead of risking an out-of-memory kill. The budget is
+# MEMORY_BUDGET_FRACTION of the RAM available when the operation starts, capped
+# at SMARTSANITIZE_MEMORY_BUDGET_MB when set (0 = no fixed cap)
+MEMORY_BUDGET_BYTES = int(os.environ.get("SMARTSANITIZE_MEMORY_BUDGET_MB", 0)) * (1 << 20)
+MEMORY_BUDGET_FRACTION = float(os.environ.get("SMARTSANITIZE_MEMORY_BUDGET_FRACTION", 0.5))
+
+# Session snapshots: after every change the working dataset (Arrow IPC, memory-mapped
+# on restore), the exact report and the edit history are saved here in the background,
+# so a session survives a server restart or timeout. A restore link works once: the
+# restored session continues under a new token. Snapshots not saved for
+# SNAPSHOT_MAX_AGE_HOURS are swept on startup; set SMARTSANITIZE_SNAPSHOTS=0 to disable
+SESSION_SNAPSHOTS = os.environ.get("SMARTSANITIZE_SNAPSHOTS", "1").lower() not in ("0", "false", "no")
+SNAPSHOT_DIR = os.path.join(WORK_DIR, "snapshots")
+SNAPSHOT_MAX_AGE_HOURS = float(os.environ.get("SMARTSANITIZE_SNAPSHOT_MAX_AGE_HOURS", 72))
@@ -1 +1,49 @@
-# Defines data file structure
\ No newline at end of file
+# Defines data file structure
+import os
+
+SUPPORTED_FORMATS = {
+    ".csv": "csv",
+    ".xls": "excel",
+    ".xlsx": "excel",
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+class DataFile:
+    """Describes a data file (name, format and size) independently of how it is read."""
+
+    def __init__(self, name, size=None, path=None):
+        self.name = name
+        self.size = size
+        self.path = path
+
+    @classmethod
+    def from_path(cls, path):
+        path = str(path)
+        return cls(os.path.basename(path), size=os.path.getsize(path), path=path)
+
+    @classmethod
+    def from_upload(cls, uploaded_file):
+        return cls(uploaded_file.name, size=getattr(uploaded_file, "size", None))
+
+    @property
+    def extension(self):
+        return os.path.splitext(self.name)[1].lower()
+
+    @property
+    def format(self):
+        return SUPPORTED_FORMATS.get(self.extension)
+
+    @property
+    def is_supported(self):
+        return self.format is not None
+
+    @property
+    def is_streamable(self):
+        """True for formats that can be read chunk by chunk without loading the whole file."""
+        return self.format in ("csv", "jsonl")
+
+    def __repr__(self):
+        return f"DataFile(name={self.name!r}, format={self.format!r}, size={self.size!r})"
@@ -1 +1,325 @@
 # Validation rules
+import ast
+import json
+import re
+import numpy as np
+import pandas as pd
+
+
+class Rule:
+    """
+    A single expectation about the data.
+
+    ``violations(chunk)`` returns a boolean NumPy mask (True = row violates the
+    rule) computed with vectorized pandas/NumPy operations. Rules that need to
+    see earlier chunks (e.g. uniqueness) keep that state on the instance;
+    call ``reset()`` before validating a new stream.
+    """
+
+    kind = "rule"
+
+    def __init__(self, column=None, name=None):
+        self.column = column
+        self.name = name or (f"{column}:{self.kind}" if column is not None else self.kind)
+
+    def reset(self):
+        pass
+
+    def violations(self, chunk):
+        raise NotImplementedError
+
+    def _values(self, chunk):
+        if self.column not in chunk.columns:
+            raise KeyError(f"Column '{self.column}' required by rule '{self.name}' not found")
+        return chunk[self.column]
+
+
+class RequiredRule(Rule):
+    """Value must not be missing."""
+
+    kind = "required"
+
+    def violations(self, chunk):
+        return self._values(chunk).isna().to_numpy()
+
+
+class TypeRule(Rule):
+    """Non-missing values must be parseable as the declared type."""
+
+    kind = "type"
+    TYPES = ("integer", "number", "float", "string", "boolean", "datetime")
+    BOOLEAN_VALUES = {"true", "false", "yes", "no", "1", "0", "t", "f", "y", "n"}
+
+    def __init__(self, column, dtype, name=None):
+        if dtype not in self.TYPES:
+            raise ValueError(f"Unknown type '{dtype}' for column '{column}'. Use one of {self.TYPES}")
+        self.dtype = dtype
+        super().__init__(column, name)
+
+    def violations(self, chunk):
+        values = self._values(chunk)
+        present = values.notna().to_numpy()
+
+        if self.dtype in ("integer", "number", "float"):
+            numeric = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnan(numeric)
+            if self.dtype == "integer":
+                with np.errstate(invalid="ignore"):
+                    valid &= np.equal(np.mod(numeric, 1), 0)
+        elif self.dtype == "datetime":
+            valid = pd.to_datetime(values, errors="coerce", format="mixed").notna().to_numpy()
+        elif self.dtype == "boolean":
+            if pd.api.types.is_bool_dtype(values.dtype):
+                valid = np.ones(len(values), dtype=bool)
+            else:
+                valid = values.astype(str).str.strip().str.lower().isin(self.BOOLEAN_VALUES).to_numpy()
+        else:
+            if pd.api.types.is_string_dtype(values.dtype) and values.dtype != object:
+                valid = np.ones(len(values), dtype=bool)
+            else:
+                valid = values.map(type).eq(str).to_numpy()
+
+        return present & ~valid
+
+
+class RangeRule(Rule):
+    """Non-missing numeric values must lie within [min, max]."""
+
+    kind = "range"
+
+    def __init__(self, column, min=None, max=None, name=None):
+        self.min = min
+        self.max = max
+        super().__init__(column, name)
+
+    def violations(self, chunk):
+        values = self._values(chunk)
+        numeric = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        out = np.zeros(len(numeric), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            if self.min is not None:
+                out |= numeric < self.min
+            if self.max is not None:
+                out |= numeric > self.max
+        return out
+
+
+class RegexRule(Rule):
+    """Non-missing values must fully match a regular expression."""
+
+    kind = "regex"
+
+    def __init__(self, column, pattern, name=None):
+        re.compile(pattern)  # fail early on invalid patterns
+        self.pattern = pattern
+        super().__init__(column, name)
+
+    def violations(self, chunk):
+        values = self._values(chunk)
+        present = values.notna().to_numpy()
+        matches = values.astype(str).str.fullmatch(self.pattern).fillna(False).to_numpy(dtype=bool)
+        return present & ~matches
+
+
+class AllowedValuesRule(Rule):
+    """Non-missing values must belong to an allowed set."""
+
+    kind = "allowed"
+
+    def __init__(self, column, values, name=None):
+        self.values = list(values)
+        super().__init__(column, name)
+
+    def violations(self, chunk):
+        values = self._values(chunk)
+        return (values.notna() & ~values.isin(self.values)).to_numpy()
+
+
+class UniqueRule(Rule):
+    """
+    Values (or combinations of columns) must not repeat across the whole stream.
+
+    Only 64-bit hashes of the values seen so far are kept, so the state grows
+    with the number of distinct values rather than with the data itself. Every
+    occurrence after the first is reported as a violation.
+    """
+
+    kind = "unique"
+
+    def __init__(self, column, name=None):
+        self.columns = [column] if isinstance(column, str) else list(column)
+        super().__init__(column if isinstance(column, str) else "+".join(self.columns), name)
+        self._seen = np.empty(0, dtype=np.uint64)
+
+    def reset(self):
+        self._seen = np.empty(0, dtype=np.uint64)
+
+    def violations(self, chunk):
+        missing = [col for col in self.columns if col not in chunk.columns]
+        if missing:
+            raise KeyError(f"Columns {missing} required by rule '{self.name}' not found")
+
+        hashes = pd.util.hash_pandas_object(chunk[self.columns], index=False).to_numpy()
+        present = chunk[self.columns].notna().all(axis=1).to_numpy()
+
+        duplicated = pd.Series(hashes).duplicated().to_numpy()
+        duplicated |= np.isin(hashes, self._seen, assume_unique=False)
+        duplicated &= present
+
+        self._seen = np.union1d(self._seen, hashes[present])
+        return duplicated
+
+
+class ExpressionRule(Rule):
+    """
+    Cross-column condition written as a pandas expression, e.g.
+    ``end_date >= start_date`` or ``discount <= price``. Rows where the
+    expression is False are violations.
+
+    Schemas may come from users, so expressions are limited to column names
+    (in backticks when they contain spaces), literals, arithmetic,
+    comparisons and boolean operators; calls, attributes, subscripts and
+    ``@`` variables are rejected before anything is evaluated. The result
+    must be boolean.
+    """
+
+    kind = "expression"
+
+    ALLOWED_NODES = (
+        ast.Expression, ast.BoolOp, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Name, ast.Load, ast.Constant,
+        ast.List, ast.Tuple,
+        ast.And, ast.Or, ast.Not, ast.Invert, ast.USub, ast.UAdd, ast.BitAnd, ast.BitOr,
+        ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+        ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn,
+    )
+    # Backtick-quoted column names (pandas syntax) are checked as placeholders
+    QUOTED_NAME = re.compile(r"`([^`]*)`")
+
+    def __init__(self, expression, name=None):
+        self.expression = expression
+        self.columns = self._parse(expression)
+        super().__init__(None, name or expression)
+
+    @classmethod
+    def _parse(cls, expression):
+        """Names the expression refers to; ValueError if it uses anything outside ALLOWED_NODES."""
+        quoted = {}
+
+        def placeholder(match):
+            return quoted.setdefault(match.group(1), f"__column_{len(quoted)}")
+
+        try:
+            tree = ast.parse(cls.QUOTED_NAME.sub(placeholder, str(expression)), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression '{expression}': {e.msg}") from None
+        names = set()
+        for node in ast.walk(tree):
+            if not isinstance(node, cls.ALLOWED_NODES):
+                raise ValueError(f"Expression '{expression}' may not use {type(node).__name__}")
+            if isinstance(node, ast.Name):
+                names.add(node.id)
+        by_placeholder = {value: name for name, value in quoted.items()}
+        return {by_placeholder.get(name, name) for name in names}
+
+    def violations(self, chunk):
+        missing = sorted(self.columns - set(map(str, chunk.columns)))
+        if missing:
+            raise KeyError(f"Columns {missing} required by rule '{self.name}' not found")
+        result = chunk.eval(self.expression, local_dict={}, global_dict={})
+        if not isinstance(result, pd.Series):
+            raise ValueError(f"Expression '{self.expression}' must evaluate to one value per row")
+        if not pd.api.types.is_bool_dtype(result.dtype):
+            raise ValueError(f"Expression '{self.expression}' must be a condition, not {result.dtype} values")
+        return ~result.fillna(True).to_numpy(dtype=bool)
+
+
+class RuleSet:
+    """
+    Collection of rules compiled from a declarative schema:
+
+        columns:
+          age:    {type: integer, min: 0, max: 120, required: true}
+          email:  {regex: "[^@]+@[^@]+", unique: true}
+          status: {allowed: [active, inactive]}
+        unique:
+          - [first_name, last_name, birth_date]
+        conditions:
+          - {name: end_after_start, expression: "end_date >= start_date"}
+    """
+
+    COLUMN_KEYS = {"type", "min", "max", "regex", "allowed", "unique", "required"}
+
+    def __init__(self, rules=None):
+        self.rules = list(rules or [])
+        # Reports key results by rule name: repeated names (e.g. ``email: {unique: true}``
+        # plus ``unique: [email]``) get a " (2)", " (3)", ... suffix
+        names = set()
+        for rule in self.rules:
+            name, copy = rule.name, 1
+            while name in names:
+                copy += 1
+                name = f"{rule.name} ({copy})"
+            rule.name = name
+            names.add(name)
+
+    @classmethod
+    def from_dict(cls, schema):
+        rules = []
+
+        for column, spec in (schema.get("columns") or {}).items():
+            unknown = set(spec) - cls.COLUMN_KEYS
+            if unknown:
+                raise ValueError(f"Unknown rule keys for column '{column}': {sorted(unknown)}")
+
+            if spec.get("required"):
+                rules.append(RequiredRule(column))
+            if "type" in spec:
+                rules.append(TypeRule(column, spec["type"]))
+            if "min" in spec or "max" in spec:
+                rules.append(RangeRule(column, spec.get("min"), spec.get("max")))
+            if "regex" in spec:
+                rules.append(RegexRule(column, spec["regex"]))
+            if "allowed" in spec:
+                rules.append(AllowedValuesRule(column, spec["allowed"]))
+            if spec.get("unique"):
+                rules.append(UniqueRule(column))
+
+        for columns in schema.get("unique") or []:
+            rules.append(UniqueRule(columns))
+
+        for condition in schema.get("conditions") or []:
+            if isinstance(condition, str):
+                condition = {"expression": condition}
+            rules.append(ExpressionRule(condition["expression"], condition.get("name")))
+
+        return cls(rules)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+    @classmethod
+    def from_yaml(cls, text):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError("PyYAML is required to read YAML validation schemas (pip install pyyaml)") from e
+        return cls.from_dict(yaml.safe_load(text) or {})
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        if str(path).endswith((".yml", ".yaml")):
+            return cls.from_yaml(text)
+        return cls.from_json(text)
+
+    def reset(self):
+        for rule in self.rules:
+            rule.reset()
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
@@ -0,0 +1,278 @@
+import gzip
+import logging
+from abc import ABC, abstractmethod
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from config.settings import EXPORT_CHUNK_BYTES, EXPORT_WORKERS
+from services.dtypes import STRING_DTYPE
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("csv", "ndjson", "parquet", "feather")
+COMPRESSIONS = (None, "gzip", "zstd")
+
+# Rows sampled to estimate the in-memory size of one row
+SIZE_SAMPLE_ROWS = 1_000
+MIN_CHUNK_ROWS = 1_000
+MAX_CHUNK_ROWS = 1_000_000
+
+
+class ExportCancelled(Exception):
+    """Raised in a writer when another format of the same export has failed."""
+
+
+# gzip level 6 (zlib's default) instead of Arrow's level 9: several times faster, ~2% larger
+GZIP_LEVEL = 6
+
+
+def _open_stream(path, compression):
+    """Binary output stream for ``path``, compressed on the fly with gzip or zstd."""
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=GZIP_LEVEL)
+    import pyarrow as pa  # pyarrow is imported on demand
+
+    if compression == "zstd":
+        return pa.CompressedOutputStream(path, "zstd")
+    return pa.OSFile(path, "wb")
+
+
+class ChunkedWriter(ABC):
+    """
+    Writes a DataFrame to one file chunk by chunk. Output goes to a temporary
+    file that replaces ``path`` only once every chunk has been written.
+    """
+
+    extension = None
+
+    def __init__(self, path, compression=None):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}'. Choose from gzip, zstd or None")
+        self.path = path
+        self.compression = compression
+        self.tmp_path = path + ".part"
+        self.sink = None
+        self.stream = None
+
+    @abstractmethod
+    def open(self, df):
+        """Opens the output; ``df`` is the whole source, for writers that need its schema."""
+
+    @abstractmethod
+    def write(self, chunk, first):
+        """Appends ``chunk``; ``first`` is True for the first chunk of the file."""
+
+    def _close_outputs(self):
+        for output in (self.sink, self.stream):
+            if output is not None:
+                output.close()
+        self.sink = self.stream = None
+
+    def close(self):
+        self._close_outputs()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        try:
+            self._close_outputs()
+        except Exception:
+            self.sink = self.stream = None
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class NDJSONWriter(ChunkedWriter):
+    """One JSON object per line, so readers can stream the file back; compressed as a stream."""
+
+    extension = ".ndjson"
+
+    def open(self, df):
+        self.stream = _open_stream(self.tmp_path, self.compression)
+
+    def write(self, chunk, first):
+        text = chunk.to_json(orient="records", lines=True, date_format="iso", default_handler=str)
+        self.stream.write((text if text.endswith("\n") else text + "\n").encode("utf-8"))
+
+
+class _ColumnarWriter(ChunkedWriter):
+    """Arrow-based writers: each chunk becomes one record batch / row group with a fixed schema."""
+
+    def open(self, df):
+        import pyarrow as pa  # pyarrow is imported on demand
+
+        # Object columns mixing strings with other types are written as strings
+        self.mixed_columns = [
+            col for col in df.columns
+            if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) != "string"
+        ]
+        # Sparse columns (one-hot / hashed encodings) are written densely
+        self.sparse_columns = [col for col in df.columns if isinstance(df[col].dtype, pd.SparseDtype)]
+        self.schema = pa.Schema.from_pandas(self._prepare(df.iloc[:SIZE_SAMPLE_ROWS]), preserve_index=False)
+        # Columns that are all-missing in the sample get their type from the full column
+        for i, field in enumerate(self.schema):
+            if pa.types.is_null(field.type):
+                full = pa.Schema.from_pandas(self._prepare(df[[df.columns[i]]]), preserve_index=False).field(0)
+                self.schema = self.schema.set(i, full)
+        self._open_sink()
+
+    def _prepare(self, chunk):
+        chunk = chunk.copy(deep=False)
+        if self.sparse_columns:
+            dense = chunk[self.sparse_columns].sparse.to_dense()
+            chunk = pd.concat([chunk.drop(columns=self.sparse_columns), dense], axis=1)[chunk.columns]
+        for col in self.mixed_columns:
+            chunk[col] = chunk[col].astype(STRING_DTYPE)
+        chunk.columns = [str(col) for col in chunk.columns]
+        return chunk
+
+    def _table(self, chunk):
+        import pyarrow as pa
+
+        return pa.Table.from_pandas(self._prepare(chunk), schema=self.schema, preserve_index=False)
+
+    def write(self, chunk, first):
+        self.sink.write_table(self._table(chunk))
+
+
+class CSVWriter(_ColumnarWriter):
+    """
+    CSV through Arrow's writer, which formats values in C++ without holding
+    the GIL; strings are quoted only when needed and the output is
+    compressed as a stream.
+    """
+
+    extension = ".csv"
+
+    def _open_sink(self):
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        # Whole-second timestamps are written without a nanosecond fraction
+        for i, field in enumerate(self.schema):
+            if pa.types.is_timestamp(field.type) and field.type.unit == "ns" and self._whole_seconds[i]:
+                self.schema = self.schema.set(i, field.with_type(pa.timestamp("s", tz=field.type.tz)))
+
+        self.stream = _open_stream(self.tmp_path, self.compression)
+        options = pa_csv.WriteOptions(quoting_style="needed")
+        self.sink = pa_csv.CSVWriter(self.stream, self.schema, write_options=options)
+
+    def open(self, df):
+        self._whole_seconds = [
+            pd.api.types.is_datetime64_any_dtype(df.iloc[:, i])
+            and bool((pd.DatetimeIndex(df.iloc[:, i].dropna()).as_unit("ns").asi8 % 10 ** 9 == 0).all())
+            for i in range(df.shape[1])
+        ]
+        super().open(df)
+
+
+class ParquetWriter(_ColumnarWriter):
+    """Parquet with one row group per chunk; compression is applied per column chunk."""
+
+    extension = ".parquet"
+
+    def _open_sink(self):
+        import pyarrow.parquet as pq
+
+        self.sink = pq.ParquetWriter(self.tmp_path, self.schema, compression=self.compression or "none")
+
+    def write(self, chunk, first):
+        self.sink.write_table(self._table(chunk), row_group_size=len(chunk))
+
+
+class FeatherWriter(_ColumnarWriter):
+    """Feather v2 (Arrow IPC file); supports zstd buffer compression, not gzip."""
+
+    extension = ".feather"
+
+    def _open_sink(self):
+        import pyarrow as pa
+
+        if self.compression == "gzip":
+            raise ValueError("Feather files support zstd compression, not gzip")
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        self.sink = pa.ipc.new_file(self.tmp_path, self.schema, options=options)
+
+
+WRITERS = {"csv": CSVWriter, "ndjson": NDJSONWriter, "parquet": ParquetWriter, "feather": FeatherWriter}
+
+
+def export_path(base_path, file_format, compression=None):
+    """``base_path`` with the format's extension; text formats add .gz / .zst when compressed."""
+    path = base_path + WRITERS[file_format].extension
+    if file_format in ("csv", "ndjson") and compression:
+        path += {"gzip": ".gz", "zstd": ".zst"}[compression]
+    return path
+
+
+class DataExporter:
+    """
+    Exports one in-memory DataFrame to several formats at once.
+
+    Every format is written by its own thread from the same source frame,
+    one chunk at a time, so memory beyond the frame itself is a few chunks
+    per format, never a full serialized copy. Chunk size (rows per chunk and
+    per Parquet row group) is either given or derived from ``chunk_bytes``.
+    ``progress_callback(stage, fraction)`` follows the JobManager convention.
+    """
+
+    def __init__(self, chunk_rows=None, chunk_bytes=EXPORT_CHUNK_BYTES, max_workers=EXPORT_WORKERS):
+        self.chunk_rows = chunk_rows
+        self.chunk_bytes = chunk_bytes
+        self.max_workers = max_workers
+
+    def rows_per_chunk(self, df):
+        if self.chunk_rows:
+            return int(self.chunk_rows)
+        sample = df.iloc[:SIZE_SAMPLE_ROWS]
+        if sample.empty:
+            return MIN_CHUNK_ROWS
+        bytes_per_row = max(1.0, sample.memory_usage(deep=True, index=False).sum() / len(sample))
+        return int(min(MAX_CHUNK_ROWS, max(MIN_CHUNK_ROWS, self.chunk_bytes // bytes_per_row)))
+
+    def export(self, df, base_path, formats, compression=None, progress_callback=None):
+        """Writes ``df`` to ``base_path`` + extension for each format; returns {format: path}."""
+        unknown = [fmt for fmt in formats if fmt not in WRITERS]
+        if unknown:
+            raise ValueError(f"Unknown export format(s) {unknown}. Choose from {', '.join(EXPORT_FORMATS)}")
+        formats = list(dict.fromkeys(formats))
+        writers = {fmt: WRITERS[fmt](export_path(base_path, fmt, compression), compression) for fmt in formats}
+        chunk_rows = self.rows_per_chunk(df)
+
+        total = max(1, len(df)) * len(formats)
+        written = dict.fromkeys(formats, 0)
+        lock = threading.Lock()
+        failed = threading.Event()
+
+        def report(file_format, rows):
+            with lock:
+                written[file_format] += rows
+                if progress_callback is not None:
+                    progress_callback(f"Writing {file_format.upper()}", sum(written.values()) / total)
+
+        def run(file_format):
+            writer = writers[file_format]
+            try:
+                writer.open(df)
+                for start in range(0, max(len(df), 1), chunk_rows):
+                    if failed.is_set():
+                        raise ExportCancelled(file_format)
+                    chunk = df.iloc[start:start + chunk_rows]
+                    writer.write(chunk, first=start == 0)
+                    report(file_format, len(chunk))
+                writer.close()
+            except BaseException:
+                failed.set()
+                writer.abort()
+                raise
+            return writer.path
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(formats))), thread_name_prefix="smartsanitize-export") as pool:
+            futures = {fmt: pool.submit(run, fmt) for fmt in formats}
+        errors = [f.exception() for f in futures.values() if f.exception() is not None]
+        if errors:
+            # Report the root cause rather than the writers stopped because of it
+            raise next((e for e in errors if not isinstance(e, ExportCancelled)), errors[0])
+
+        logger.info("Exported %d rows to %s in chunks of %d rows", len(df), ", ".join(formats), chunk_rows)
+        return {fmt: future.result() for fmt, future in futures.items()}
@@ -1,20 +1,50 @@
 import pandas as pd
-import streamlit as st
+from config.settings import CHUNK_SIZE
 from services.data_validation import FileValidation
 
 class FileHandler:
     def __init__(self):
         self.file_validator = FileValidation()
 
-    def handle_file_upload(self):
-        """Handles file upload and validation using Streamlit's uploader"""
-        uploaded_file = st.file_uploader("Upload CSV, Excel, or JSON", type=["csv", "xls", "xlsx", "json"])
+    def load_upload(self, uploaded_file, uploads):
+        """
+        Spills an upload into ``uploads`` (a session's upload area) and parses
+        it from disk instead of from the in-memory upload. Returns None, and
+        removes the spilled file, when it cannot be read.
+        """
+        data_file = uploads.spill(uploaded_file)
+        df = self.file_validator.read_file(data_file)
+        if df is None:
+            uploads.discard(data_file.path)
+        return df
 
-        if uploaded_file:
-            df = self.file_validator.validate_file_format(uploaded_file)
 
-            if df is not None:
-                st.session_state.uploaded_df = df
-                st.dataframe(df.head(10))  # Display preview
+class ChunkedFileLoader:
+    """Streams a data file from disk as a sequence of DataFrame chunks."""
+
+    def __init__(self, path, chunksize=CHUNK_SIZE, **read_kwargs):
+        self.path = str(path)
+        self.chunksize = chunksize
+        self.read_kwargs = read_kwargs
+
+    def iter_chunks(self):
+        """Yields DataFrames of at most ``chunksize`` rows."""
+        if self.path.endswith(".csv"):
+            with pd.read_csv(self.path, chunksize=self.chunksize, **self.read_kwargs) as reader:
+                yield from reader
+        elif self.path.endswith((".jsonl", ".ndjson")):
+            with pd.read_json(self.path, lines=True, chunksize=self.chunksize, **self.read_kwargs) as reader:
+                yield from reader
+        elif self.path.endswith((".xls", ".xlsx", ".json")):
+            # These formats cannot be read incrementally; slice the loaded frame instead
+            if self.path.endswith(".json"):
+                df = pd.read_json(self.path, **self.read_kwargs)
             else:
-                st.error("❌ Invalid file format or corrupted file. Please upload a valid CSV, Excel, or JSON.")
+                df = pd.read_excel(self.path, **self.read_kwargs)
+            for start in range(0, len(df), self.chunksize):
+                yield df.iloc[start:start + self.chunksize]
+        else:
+            raise ValueError(f"Unsupported file format for streaming: {self.path}")
+
+    def __iter__(self):
+        return self.iter_chunks()
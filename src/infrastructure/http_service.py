@@ -0,0 +1,366 @@
+import asyncio
+import contextlib
+import hashlib
+import io
+import logging
+import os
+import shutil
+import threading
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from config.settings import (
+    SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_MAX_PENDING, SERVICE_MAX_BODY_BYTES, SERVICE_CACHE_BYTES,
+    SERVICE_CACHE_DIR,
+)
+from domain.data_file import DataFile
+from infrastructure.report_export import ReportJSONWriter
+from infrastructure.session_snapshot import SessionSnapshot
+from services.data_validation import FileValidation
+from services.near_duplicates import drop_near_duplicates
+from services.preprocessing import handle_missing_values
+from services.quality_analysis import DataSummary, DataAnonymizer
+
+logger = logging.getLogger(__name__)
+
+CLEAN_METHODS = ("mean", "median", "mode", "drop")
+
+
+class ServiceBusy(Exception):
+    """Raised when every worker slot is taken; mapped to HTTP 503."""
+
+
+class ServiceError(Exception):
+    """A client error with the HTTP status it should be reported with."""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# --- Worker-process tasks (top-level so they can be pickled) ---
+# Datasets reach the workers as the directory they were spilled to, never pickled
+
+def _directory_bytes(directory):
+    return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+
+def _parse_task(data, filename, directory):
+    """Parses an upload and spills it to ``directory``; returns its cache entry, or None if unparseable."""
+    buffer = io.BytesIO(data)
+    buffer.name = filename
+    df = FileValidation().validate_file_format(buffer)
+    if df is None:
+        return None
+    SessionSnapshot(os.path.basename(directory), directory).save(df, version=0)
+    return {
+        "directory": directory,
+        "rows": len(df),
+        "columns": {str(col): str(dtype) for col, dtype in df.dtypes.items()},
+        "bytes": _directory_bytes(directory),
+    }
+
+
+def _load(directory):
+    """The spilled dataset; its Arrow file is memory-mapped (see SessionSnapshot.load_data)."""
+    return SessionSnapshot(os.path.basename(directory), directory).load_data()
+
+
+def _profile_task(directory, target_column):
+    report = DataSummary(_load(directory), target_column=target_column).generate_report()
+    out = io.StringIO()
+    ReportJSONWriter().write(report, out)
+    return out.getvalue()
+
+
+def _anonymize_task(directory, output):
+    return _serialize(DataAnonymizer.anonymize_data(_load(directory)), output)
+
+
+def _clean_task(directory, method, drop_duplicates, output, near_duplicate_threshold=None):
+    cleaned = handle_missing_values(_load(directory), method)
+    if drop_duplicates:
+        cleaned = cleaned.drop_duplicates()
+    if near_duplicate_threshold is not None:
+        cleaned = drop_near_duplicates(cleaned, threshold=near_duplicate_threshold)
+    return _serialize(cleaned, output)
+
+
+def _serialize(df, output):
+    if output == "json":
+        return df.to_json(orient="records", default_handler=str)
+    return df.to_csv(index=False)
+
+
+class DatasetCache:
+    """
+    LRU index of parsed datasets keyed by the SHA-256 of the uploaded bytes,
+    so the same file posted twice (or referenced by ID) is parsed once.
+
+    Each dataset is spilled to its own directory as a SessionSnapshot (an
+    Arrow IPC file the workers memory-map), and entries only hold that path
+    and the dataset's shape. Least recently used datasets are deleted once
+    the spilled files exceed ``max_bytes``; datasets acquired by a running
+    request and the newest one are kept.
+    """
+
+    def __init__(self, max_bytes=SERVICE_CACHE_BYTES, directory=SERVICE_CACHE_DIR):
+        self.max_bytes = max_bytes
+        # One directory per cache, so servers sharing SERVICE_CACHE_DIR never delete each other's files
+        self.directory = os.path.join(directory, uuid.uuid4().hex)
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._pins = Counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def directory_for(self, dataset_id):
+        return os.path.join(self.directory, dataset_id)
+
+    def acquire(self, dataset_id):
+        """The entry of ``dataset_id`` (or None), kept on disk until ``release``."""
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is not None:
+                self._entries.move_to_end(dataset_id)
+                self._pins[dataset_id] += 1
+            return entry
+
+    def release(self, dataset_id):
+        with self._lock:
+            self._pins[dataset_id] -= 1
+            if self._pins[dataset_id] <= 0:
+                del self._pins[dataset_id]
+            self._evict()
+
+    def put(self, dataset_id, entry):
+        """Adds a spilled dataset, acquired by the caller (see ``acquire``)."""
+        with self._lock:
+            previous = self._entries.pop(dataset_id, None)
+            self.nbytes += entry["bytes"] - (previous["bytes"] if previous is not None else 0)
+            self._entries[dataset_id] = entry
+            self._pins[dataset_id] += 1
+            self._evict()
+
+    def _evict(self):
+        for dataset_id in list(self._entries)[:-1]:
+            if self.nbytes <= self.max_bytes:
+                break
+            if self._pins[dataset_id]:
+                continue
+            entry = self._entries.pop(dataset_id)
+            self.nbytes -= entry["bytes"]
+            shutil.rmtree(entry["directory"], ignore_errors=True)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __contains__(self, dataset_id):
+        return dataset_id in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ProfilingService:
+    """
+    Runs parsing and analyzers in a bounded process pool.
+
+    At most ``max_pending`` tasks may be queued or running; further requests
+    are rejected with ServiceBusy instead of piling up behind the pool.
+    """
+
+    def __init__(self, max_workers=SERVICE_WORKERS, max_pending=SERVICE_MAX_PENDING, cache=None,
+                 max_body_bytes=SERVICE_MAX_BODY_BYTES):
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self.max_body_bytes = max_body_bytes
+        self.cache = cache if cache is not None else DatasetCache()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            # spawn: the server runs threads (event loop, uvicorn), which fork does not mix with
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context("spawn"))
+        return self._executor
+
+    async def run(self, fn, *args):
+        """Runs ``fn(*args)`` in the pool, or raises ServiceBusy when the pool is saturated."""
+        if not self._slots.acquire(blocking=False):
+            raise ServiceBusy()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), fn, *args)
+        finally:
+            self._slots.release()
+
+    async def load(self, data, filename):
+        """
+        Returns (dataset_id, entry, cached) for uploaded bytes, parsing them
+        only on a cache miss; the entry is acquired (see DatasetCache.acquire).
+        """
+        data_file = DataFile(filename, size=len(data))
+        if not data_file.is_supported:
+            raise ServiceError(415, f"Unsupported file format: {data_file.extension or filename}")
+
+        # Hashing a large upload takes a while; keep it off the event loop
+        dataset_id = await asyncio.get_running_loop().run_in_executor(None, self.cache.content_hash, data)
+        entry = self.cache.acquire(dataset_id)
+        if entry is not None:
+            return dataset_id, entry, True
+
+        entry = await self.run(_parse_task, data, filename, self.cache.directory_for(dataset_id))
+        if entry is None:
+            raise ServiceError(400, f"Could not parse {filename} as {data_file.format}")
+        self.cache.put(dataset_id, entry)
+        return dataset_id, entry, False
+
+    async def read_body(self, request):
+        """The request body, or ServiceError 413 as soon as it exceeds ``max_body_bytes``."""
+        too_large = ServiceError(413, f"Request body exceeds {self.max_body_bytes:,} bytes")
+        length = request.headers.get("content-length", "")
+        if length.isdigit() and int(length) > self.max_body_bytes:
+            raise too_large
+        chunks, size = [], 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                raise too_large
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @contextlib.asynccontextmanager
+    async def resolve(self, request):
+        """
+        Dataset for a request, as (dataset_id, entry, cached): ``?dataset_id=``
+        of an earlier upload, or the request body. Its files stay on disk
+        until the block exits.
+        """
+        dataset_id = request.query_params.get("dataset_id")
+        if dataset_id:
+            entry, cached = self.cache.acquire(dataset_id), True
+            if entry is None:
+                raise ServiceError(404, f"Unknown dataset_id {dataset_id}; upload the file again")
+        else:
+            data = await self.read_body(request)
+            if not data:
+                raise ServiceError(400, "Send the file as the request body or pass ?dataset_id=")
+            dataset_id, entry, cached = await self.load(data, request.query_params.get("filename", "upload.csv"))
+        try:
+            yield dataset_id, entry, cached
+        finally:
+            self.cache.release(dataset_id)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.cache.clear()
+
+
+def _output_format(request):
+    output = request.query_params.get("output", "csv")
+    if output not in ("csv", "json"):
+        raise ServiceError(400, "output must be 'csv' or 'json'")
+    return output
+
+
+def _data_response(payload, output, dataset_id):
+    media_type = "application/json" if output == "json" else "text/csv"
+    return Response(payload, media_type=media_type, headers={"X-Dataset-Id": dataset_id})
+
+
+def create_app(service=None):
+    """Builds the Starlette app; all endpoints take the file as the raw POST body."""
+    service = service or ProfilingService()
+
+    async def health(request):
+        return JSONResponse({"status": "ok", "cached_datasets": len(service.cache), "cached_bytes": service.cache.nbytes})
+
+    async def upload(request):
+        async with service.resolve(request) as (dataset_id, entry, cached):
+            return JSONResponse({
+                "dataset_id": dataset_id,
+                "cached": cached,
+                "rows": entry["rows"],
+                "columns": entry["columns"],
+            })
+
+    async def profile(request):
+        async with service.resolve(request) as (dataset_id, entry, _):
+            target_column = request.query_params.get("target_column")
+            if target_column is not None and target_column not in entry["columns"]:
+                raise ServiceError(400, f"Unknown target_column '{target_column}'")
+            payload = await service.run(_profile_task, entry["directory"], target_column)
+        return Response(payload, media_type="application/json", headers={"X-Dataset-Id": dataset_id})
+
+    async def anonymize(request):
+        output = _output_format(request)
+        async with service.resolve(request) as (dataset_id, entry, _):
+            payload = await service.run(_anonymize_task, entry["directory"], output)
+        return _data_response(payload, output, dataset_id)
+
+    async def clean(request):
+        output = _output_format(request)
+        method = request.query_params.get("method", "mean")
+        if method not in CLEAN_METHODS:
+            raise ServiceError(400, f"method must be one of {', '.join(CLEAN_METHODS)}")
+        drop_duplicates = request.query_params.get("drop_duplicates", "false").lower() in ("1", "true", "yes")
+        near_duplicate_threshold = request.query_params.get("near_duplicate_threshold")
+        if near_duplicate_threshold is not None:
+            try:
+                near_duplicate_threshold = float(near_duplicate_threshold)
+            except ValueError:
+                raise ServiceError(400, "near_duplicate_threshold must be a number") from None
+            if not 0 < near_duplicate_threshold <= 1:
+                raise ServiceError(400, "near_duplicate_threshold must be in (0, 1]")
+        async with service.resolve(request) as (dataset_id, entry, _):
+            payload = await service.run(_clean_task, entry["directory"], method, drop_duplicates, output,
+                                        near_duplicate_threshold)
+        return _data_response(payload, output, dataset_id)
+
+    async def service_busy(request, exc):
+        return JSONResponse({"error": "Service busy, retry later"}, status_code=503, headers={"Retry-After": "1"})
+
+    async def service_error(request, exc):
+        return JSONResponse({"error": str(exc)}, status_code=exc.status_code)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        yield
+        service.shutdown()
+
+    routes = [
+        Route("/health", health, methods=["GET"]),
+        Route("/upload", upload, methods=["POST"]),
+        Route("/profile", profile, methods=["POST"]),
+        Route("/anonymize", anonymize, methods=["POST"]),
+        Route("/clean", clean, methods=["POST"]),
+    ]
+    app = Starlette(
+        routes=routes,
+        exception_handlers={ServiceBusy: service_busy, ServiceError: service_error},
+        lifespan=lifespan,
+    )
+    app.state.service = service
+    return app
+
+
+def main():
+    import uvicorn
+
+    uvicorn.run(create_app(), host=SERVICE_HOST, port=SERVICE_PORT)
+
+
+if __name__ == "__main__":
+    main()
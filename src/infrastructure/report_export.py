@@ -1 +1,260 @@
-# Export as PDF, JSON
\ No newline at end of file
+# Export as PDF, JSON
+import hashlib
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import numpy as np
+import pandas as pd
+from config.settings import REPORT_CACHE_DIR, REPORT_RENDER_WORKERS
+
+JSON_ROWS_PER_WRITE = 1000
+
+
+def _to_jsonable(value):
+    """Converts NumPy/pandas scalars and containers into plain JSON types."""
+    if isinstance(value, dict):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, pd.Series):
+        return _to_jsonable(value.to_dict())
+    if isinstance(value, np.ndarray):
+        return _to_jsonable(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _frame_for_export(df):
+    """Keeps a meaningful index (e.g. column names in the missing values report) as a column."""
+    if isinstance(df.index, pd.RangeIndex):
+        return df
+    return df.reset_index(names="index" if df.index.name is None else df.index.name)
+
+
+class ReportJSONWriter:
+    """
+    Writes a DataSummary report to JSON incrementally: sections are emitted
+    one at a time and DataFrames are streamed in blocks of records, so the
+    full JSON document never exists as one string in memory.
+    """
+
+    def __init__(self, rows_per_write=JSON_ROWS_PER_WRITE):
+        self.rows_per_write = rows_per_write
+
+    def write(self, report, f):
+        f.write("{")
+        for i, (section, value) in enumerate(report.items()):
+            if i:
+                f.write(",")
+            f.write(f"\n{json.dumps(str(section))}: ")
+            if isinstance(value, pd.DataFrame):
+                self._write_frame(value, f)
+            else:
+                json.dump(_to_jsonable(value), f)
+        f.write("\n}\n")
+
+    def _write_frame(self, df, f):
+        df = _frame_for_export(df)
+        f.write("[")
+        for start in range(0, len(df), self.rows_per_write):
+            block = df.iloc[start:start + self.rows_per_write].to_json(orient="records", default_handler=str)
+            if start:
+                f.write(",")
+            f.write(block[1:-1])
+        f.write("]")
+
+    def export(self, report, path):
+        with open(path, "w", encoding="utf-8") as f:
+            self.write(report, f)
+        return path
+
+
+def _render_chart(spec, path):
+    """Renders one chart spec to a PNG file. Runs inside a worker process."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(6, 3.5), dpi=100)
+    if spec["kind"] == "histogram":
+        edges = np.asarray(spec["edges"])
+        ax.bar(edges[:-1], spec["counts"], width=np.diff(edges), align="edge", color="#636EFA")
+        ax.set_ylabel("Count")
+    else:
+        labels = [str(label) for label in spec["labels"]]
+        ax.bar(range(len(labels)), spec["values"], color="#EF553B")
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, rotation=45, ha="right", fontsize=7)
+        ax.set_ylabel(spec.get("ylabel", "Count"))
+    ax.set_title(spec["title"])
+    fig.tight_layout()
+    fig.savefig(path, format="png")
+    plt.close(fig)
+    return path
+
+
+class ChartRenderer:
+    """
+    Renders report charts in a process pool and caches the PNGs on disk.
+
+    Charts are described by small aggregate specs (histogram counts, bar
+    values) computed in the parent process; the cache key is a fingerprint of
+    that spec, so an unchanged column is never re-rendered.
+    """
+
+    def __init__(self, cache_dir=REPORT_CACHE_DIR, max_workers=REPORT_RENDER_WORKERS):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(spec):
+        return hashlib.sha1(pickle.dumps(spec, protocol=4)).hexdigest()
+
+    def cache_path(self, spec):
+        return os.path.join(self.cache_dir, f"{self.fingerprint(spec)}.png")
+
+    @staticmethod
+    def histogram_spec(series, bins=30):
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return None
+        counts, edges = np.histogram(values, bins=bins)
+        return {"kind": "histogram", "title": f"Distribution of {series.name}", "counts": counts.tolist(), "edges": edges.tolist()}
+
+    @staticmethod
+    def bar_spec(title, labels, values, ylabel="Count"):
+        return {"kind": "bar", "title": title, "labels": list(labels), "values": [_to_jsonable(v) for v in values], "ylabel": ylabel}
+
+    def render(self, specs):
+        """Returns the PNG paths for ``specs`` (same order), rendering only cache misses."""
+        paths = [self.cache_path(spec) for spec in specs]
+        todo = [(spec, path) for spec, path in zip(specs, paths) if not os.path.exists(path)]
+        # Deduplicate identical specs within one call
+        todo = list({path: (spec, path) for spec, path in todo}.values())
+
+        if not todo:
+            return paths
+
+        if self.max_workers and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(todo)), mp_context=get_context("spawn")) as pool:
+                list(pool.map(_render_chart, *zip(*[(spec, path + ".tmp") for spec, path in todo])))
+        else:
+            for spec, path in todo:
+                _render_chart(spec, path + ".tmp")
+
+        for _, path in todo:
+            os.replace(path + ".tmp", path)
+        return paths
+
+
+class ReportPDFWriter:
+    """
+    Writes a DataSummary report to PDF with the ReportLab canvas API, laying
+    out and emitting one page at a time instead of building a full story.
+    """
+
+    MARGIN = 50
+    LINE_HEIGHT = 13
+    MAX_TABLE_ROWS = 200
+
+    def __init__(self, chart_renderer=None):
+        self.chart_renderer = chart_renderer or ChartRenderer()
+
+    def chart_specs(self, report, df=None):
+        specs = []
+        missing = report.get("Missing Values Report")
+        if isinstance(missing, pd.DataFrame) and missing["Missing Values"].sum() > 0:
+            nonzero = missing[missing["Missing Values"] > 0]
+            specs.append(ChartRenderer.bar_spec("Missing Values per Column", nonzero.index, nonzero["Missing Values"]))
+
+        if df is not None:
+            for col in report.get("Numerical Columns", []):
+                spec = ChartRenderer.histogram_spec(df[col])
+                if spec is not None:
+                    specs.append(spec)
+        return specs
+
+    def export(self, report, path, df=None):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+
+        chart_paths = self.chart_renderer.render(self.chart_specs(report, df))
+
+        pdf = canvas.Canvas(str(path), pagesize=A4, pageCompression=1)
+        self._width, self._height = A4
+        self._pdf = pdf
+        self._y = self._height - self.MARGIN
+
+        self._line("SmartSanitize - Data Quality Report", font=("Helvetica-Bold", 16), height=24)
+        for section, value in report.items():
+            self._line(str(section), font=("Helvetica-Bold", 12), height=20)
+            self._section(value)
+            self._y -= self.LINE_HEIGHT
+
+        if chart_paths:
+            self._new_page()
+            self._line("Charts", font=("Helvetica-Bold", 12), height=20)
+            for chart_path in chart_paths:
+                self._image(chart_path)
+
+        pdf.save()
+        return path
+
+    def _new_page(self):
+        self._pdf.showPage()
+        self._y = self._height - self.MARGIN
+
+    def _line(self, text, font=("Helvetica", 9), height=None, indent=0):
+        height = height or self.LINE_HEIGHT
+        if self._y - height < self.MARGIN:
+            self._new_page()
+        self._pdf.setFont(*font)
+        self._pdf.drawString(self.MARGIN + indent, self._y - height + 4, str(text)[:120])
+        self._y -= height
+
+    def _section(self, value):
+        if isinstance(value, pd.DataFrame):
+            frame = _frame_for_export(value)
+            self._line(" | ".join(map(str, frame.columns)), font=("Helvetica-Bold", 9))
+            for row in frame.head(self.MAX_TABLE_ROWS).itertuples(index=False):
+                self._line(" | ".join(str(_to_jsonable(v)) for v in row))
+            if len(frame) > self.MAX_TABLE_ROWS:
+                self._line(f"... {len(frame) - self.MAX_TABLE_ROWS} more rows in the JSON report")
+        elif isinstance(value, dict):
+            if not value:
+                self._line("None")
+            for key, item in value.items():
+                self._line(f"{key}: {json.dumps(_to_jsonable(item))}", indent=10)
+        elif isinstance(value, (list, tuple)):
+            self._line(", ".join(map(str, value)) if value else "None")
+        else:
+            self._line(str(value))
+
+    def _image(self, path, width=400, height=233):
+        if self._y - height < self.MARGIN:
+            self._new_page()
+        self._pdf.drawImage(path, self.MARGIN, self._y - height, width=width, height=height)
+        self._y -= height + 10
+
+
+class ReportExporter:
+    """Exports DataSummary reports as JSON and PDF files."""
+
+    def __init__(self, chart_renderer=None):
+        self.json_writer = ReportJSONWriter()
+        self.pdf_writer = ReportPDFWriter(chart_renderer)
+
+    def export_json(self, report, path):
+        return self.json_writer.export(report, path)
+
+    def export_pdf(self, report, path, df=None):
+        return self.pdf_writer.export(report, path, df=df)
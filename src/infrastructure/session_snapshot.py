@@ -0,0 +1,229 @@
+import json
+import logging
+import os
+import pickle
+import re
+import secrets
+import shutil
+import threading
+import time
+import uuid
+import pandas as pd
+from config.settings import SNAPSHOT_DIR, SNAPSHOT_MAX_AGE_HOURS
+from infrastructure.data_export import DataExporter
+from services.dtypes import STRING_DTYPE
+
+logger = logging.getLogger(__name__)
+
+DATA_FILE = "data.arrow"
+PICKLED_DATA_FILE = "data.pkl"
+MANIFEST_FILE = "manifest.json"
+REPORT_FILE = "report-{version}.pkl"
+
+# Snapshot keys are random restore tokens (128 bits, hex); anything else never reaches the filesystem
+_KEY_PATTERN = re.compile(r"[0-9a-f]{32}")
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(directory):
+    with _locks_guard:
+        return _locks.setdefault(directory, threading.Lock())
+
+
+def _plain(name):
+    """Column label as JSON: strings and numbers as they are, anything else as its text."""
+    return name if isinstance(name, (str, int, float, bool)) or name is None else str(name)
+
+
+def _write_atomic(path, write):
+    """Calls ``write(file)`` on a temporary file and renames it to ``path``; the temporary is removed on failure."""
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+class SessionSnapshot:
+    """
+    One session saved on disk: the working dataset as an uncompressed Arrow
+    IPC file, the exact report of that dataset version and the edit history,
+    tied together by ``manifest.json``.
+
+    Every file is written under a temporary name and renamed into place, so a
+    snapshot on disk is always complete. Saves of an older dataset version
+    that finish after a newer one are dropped. Restoring memory-maps the
+    Arrow file: Arrow-backed string columns are used in place, without a
+    re-parse or a copy. Frames Arrow cannot represent exactly (e.g. object
+    columns mixing types) are pickled instead.
+    """
+
+    def __init__(self, key, directory):
+        self.key = key
+        self.directory = directory
+
+    def manifest(self):
+        try:
+            with open(os.path.join(self.directory, MANIFEST_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @property
+    def exists(self):
+        manifest = self.manifest()
+        return manifest is not None and os.path.exists(os.path.join(self.directory, manifest["data_file"]))
+
+    def save(self, df, version, history=(), progress_callback=None):
+        """Writes dataset version ``version`` and its edit history; returns the manifest now on disk."""
+        os.makedirs(self.directory, exist_ok=True)
+        started = time.time()
+        manifest = {
+            "version": int(version),
+            "rows": len(df),
+            "columns": [_plain(col) for col in df.columns],
+            "object_columns": [i for i, dtype in enumerate(df.dtypes) if dtype == object],
+            "range_index": [df.index.start, df.index.stop, df.index.step] if isinstance(df.index, pd.RangeIndex) else None,
+            "history": list(history),
+        }
+        path = os.path.join(self.directory, f"{DATA_FILE}.{uuid.uuid4().hex}.tmp")
+        try:
+            import pyarrow as pa  # pyarrow is imported on demand
+
+            try:
+                self._write_arrow(df, path, manifest["range_index"] is None, progress_callback)
+                manifest["data_file"] = DATA_FILE
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                logger.info("Snapshot %s: %s; pickling the dataset instead", self.key, e)
+                df.to_pickle(path)
+                manifest["data_file"] = PICKLED_DATA_FILE
+
+            with _lock_for(self.directory):
+                current = self.manifest()
+                if current is not None and current["version"] > manifest["version"]:
+                    return current
+                os.replace(path, os.path.join(self.directory, manifest["data_file"]))
+                manifest["saved_at"] = time.time()
+                _write_atomic(os.path.join(self.directory, MANIFEST_FILE), lambda f: f.write(json.dumps(manifest).encode()))
+                for name in os.listdir(self.directory):
+                    if name in (DATA_FILE, PICKLED_DATA_FILE) and name != manifest["data_file"]:
+                        os.remove(os.path.join(self.directory, name))
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+        logger.info("Saved snapshot %s (version %d, %d rows) in %.1fs", self.key, version, len(df), time.time() - started)
+        return manifest
+
+    def _write_arrow(self, df, path, preserve_index, progress_callback=None):
+        """Streams ``df`` to an Arrow IPC file, one record batch per chunk of rows."""
+        import pyarrow as pa
+
+        # Positional field names: Arrow needs unique string names; the labels live in the manifest
+        frame = df.copy(deep=False)
+        frame.columns = [f"c{i}" for i in range(frame.shape[1])]
+        schema = pa.Schema.from_pandas(frame, preserve_index=preserve_index)
+        step = DataExporter().rows_per_chunk(frame)
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            for start in range(0, len(frame), step):
+                writer.write_batch(pa.RecordBatch.from_pandas(frame.iloc[start:start + step], schema=schema,
+                                                              preserve_index=preserve_index))
+                if progress_callback is not None:
+                    progress_callback("Saving session snapshot", min(1.0, (start + step) / len(frame)))
+
+    def load_data(self):
+        """The saved dataset; Arrow snapshots are memory-mapped rather than read into memory."""
+        manifest = self.manifest()
+        path = os.path.join(self.directory, manifest["data_file"])
+        if manifest["data_file"] == PICKLED_DATA_FILE:
+            return pd.read_pickle(path)
+
+        import pyarrow as pa
+
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        df = table.to_pandas(types_mapper={pa.string(): STRING_DTYPE, pa.large_string(): STRING_DTYPE}.get)
+        for i in manifest["object_columns"]:
+            df.isetitem(i, table.column(f"c{i}").to_numpy(zero_copy_only=False))  # None stays None, not <NA>
+        df.columns = manifest["columns"]
+        if manifest["range_index"] is not None:
+            df.index = pd.RangeIndex(*manifest["range_index"])
+        return df
+
+    def save_report(self, report, version, progress_callback=None):
+        """Stores the exact report of dataset version ``version``; reports of older versions are removed."""
+        os.makedirs(self.directory, exist_ok=True)
+        _write_atomic(os.path.join(self.directory, REPORT_FILE.format(version=int(version))),
+                      lambda f: pickle.dump(report, f, protocol=pickle.HIGHEST_PROTOCOL))
+        for name in os.listdir(self.directory):
+            match = re.fullmatch(REPORT_FILE.format(version=r"(\d+)"), name)
+            if match and int(match.group(1)) < int(version):
+                os.remove(os.path.join(self.directory, name))
+
+    def load_report(self):
+        """The report saved for the snapshot's dataset version, or None."""
+        manifest = self.manifest()
+        path = os.path.join(self.directory, REPORT_FILE.format(version=manifest["version"]))
+        if not os.path.exists(path):
+            return None
+        # Written by this server only (see save_report), never by users
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+class SnapshotStore:
+    """
+    Snapshot area with one subdirectory per restore token. Tokens are secret
+    and separate from session keys; restoring claims a snapshot under a new
+    token, so each token restores at most once.
+    """
+
+    def __init__(self, root=SNAPSHOT_DIR, max_age_hours=SNAPSHOT_MAX_AGE_HOURS):
+        self.root = root
+        self.max_age_seconds = max_age_hours * 3600
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def new_key():
+        return secrets.token_hex(16)
+
+    def snapshot(self, key):
+        """The snapshot of token ``key``; None when the key is not a token."""
+        if not isinstance(key, str) or not _KEY_PATTERN.fullmatch(key):
+            return None
+        return SessionSnapshot(key, os.path.join(self.root, key))
+
+    def claim(self, key):
+        """
+        Moves snapshot ``key`` under a new token (one rename, nothing is
+        copied) and returns it; None when ``key`` is not a token or was
+        already claimed. Memory-mapped files stay valid across the rename.
+        """
+        snapshot = self.snapshot(key)
+        if snapshot is None or not snapshot.exists:
+            return None
+        claimed = self.snapshot(self.new_key())
+        try:
+            os.rename(snapshot.directory, claimed.directory)
+        except FileNotFoundError:
+            return None  # claimed concurrently
+        return claimed
+
+    def sweep_stale(self):
+        """Removes snapshots not saved for ``max_age_hours``."""
+        cutoff = time.time() - self.max_age_seconds
+        removed = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed.append(name)
+            except FileNotFoundError:
+                continue
+        if removed:
+            logger.info("Removed %d stale session snapshots from %s", len(removed), self.root)
+        return removed
@@ -0,0 +1,94 @@
+import logging
+import os
+import shutil
+import time
+import uuid
+import weakref
+from config.settings import UPLOAD_DIR, UPLOAD_MAX_AGE_HOURS
+from domain.data_file import DataFile
+
+logger = logging.getLogger(__name__)
+
+SPILL_BLOCK_SIZE = 1 << 20  # copy uploads to disk 1 MB at a time
+
+
+class SessionUploads:
+    """
+    Temp directory holding one session's uploaded files.
+
+    The directory is removed when this object is garbage collected (i.e. when
+    the Streamlit session holding it ends), on ``cleanup()``, or at interpreter
+    exit, whichever comes first.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.current = None
+        os.makedirs(directory, exist_ok=True)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, directory, True)
+
+    def spill(self, uploaded_file):
+        """
+        Streams an uploaded file-like object to disk and closes it, so parsing
+        can read from the file instead of the in-memory upload. The previous
+        upload of this session is deleted. Returns a DataFile with its path.
+        """
+        data_file = DataFile.from_upload(uploaded_file)
+        path = os.path.join(self.directory, f"{uuid.uuid4().hex}{data_file.extension}")
+        uploaded_file.seek(0)
+        with open(path + ".tmp", "wb") as f:
+            shutil.copyfileobj(uploaded_file, f, SPILL_BLOCK_SIZE)
+        os.replace(path + ".tmp", path)
+        uploaded_file.close()
+
+        if self.current is not None:
+            self.discard(self.current.path)
+        self.current = DataFile(data_file.name, size=os.path.getsize(path), path=path)
+        return self.current
+
+    def discard(self, path):
+        if self.current is not None and self.current.path == path:
+            self.current = None
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def files(self):
+        return sorted(os.listdir(self.directory)) if os.path.isdir(self.directory) else []
+
+    def cleanup(self):
+        self.current = None
+        self._finalizer()
+
+    @property
+    def alive(self):
+        return self._finalizer.alive
+
+
+class UploadStore:
+    """Managed temp area for uploads with one subdirectory per session."""
+
+    def __init__(self, root=UPLOAD_DIR, max_age_hours=UPLOAD_MAX_AGE_HOURS):
+        self.root = root
+        self.max_age_seconds = max_age_hours * 3600
+        os.makedirs(root, exist_ok=True)
+
+    def session_area(self, session_key):
+        return SessionUploads(os.path.join(self.root, session_key))
+
+    def sweep_stale(self):
+        """Removes session directories left behind by crashed or killed processes."""
+        cutoff = time.time() - self.max_age_seconds
+        removed = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed.append(name)
+            except FileNotFoundError:
+                continue
+        if removed:
+            logger.info("Removed %d stale upload directories from %s", len(removed), self.root)
+        return removed
@@ -1,6 +1,5 @@
 import streamlit as st
 from presentation.ui import UIHandler
-from presentation.visualization_page import VisualizationPage
 
 
 # Sidebar Navigation
@@ -9,7 +8,6 @@ page = st.sidebar.radio("Go to:", ["Upload File", "Data Summary", "Preprocessing
 
 # Create an instance of UIHandler
 ui = UIHandler()
-visualization = VisualizationPage()
 
 # File Upload Page
 if page == "Upload File":
@@ -26,6 +24,10 @@ elif page == "Preprocessing":
 
 # Visualization Page
 elif page == "Visualization":
+    # Plotly and friends are only imported when this page is opened
+    from presentation.visualization_page import VisualizationPage
+    visualization = VisualizationPage()
+
     # ✅ Ensure uploaded_df exists before using it
     st.subheader("📊 Exploratory Data Analysis (EDA)")
     if "uploaded_df" in st.session_state and st.session_state.uploaded_df is not None:
@@ -0,0 +1,200 @@
+import time
+import uuid
+import streamlit as st
+from config.settings import JOB_WORKERS, SESSION_SNAPSHOTS
+from services.jobs import JobManager
+from infrastructure.session_snapshot import SnapshotStore
+from infrastructure.upload_store import UploadStore
+from services.datetime_profile import DatetimeColumns
+
+
+@st.cache_resource
+def get_job_manager():
+    """One worker pool per server process, shared by all sessions and reruns."""
+    return JobManager(max_workers=JOB_WORKERS)
+
+
+@st.cache_resource
+def get_upload_store():
+    """Shared upload area; leftovers from earlier server runs are swept once per process."""
+    store = UploadStore()
+    store.sweep_stale()
+    return store
+
+
+@st.cache_resource
+def get_snapshot_store():
+    """Shared snapshot area; snapshots older than the retention period are swept once per process."""
+    store = SnapshotStore()
+    store.sweep_stale()
+    return store
+
+
+def session_uploads():
+    """This session's upload directory, deleted when the session's state is released."""
+    if "upload_area" not in st.session_state:
+        st.session_state.upload_area = get_upload_store().session_area(_session_key())
+    return st.session_state.upload_area
+
+
+def dataset_version():
+    """Counter bumped whenever the uploaded dataset is replaced or modified."""
+    return st.session_state.get("df_version", 0)
+
+
+def dataset_datetimes(df):
+    """Detected datetime columns of the current dataset, each parsed at most once per dataset version."""
+    version = dataset_version()
+    cached = st.session_state.get("dataset_datetimes")
+    if cached is None or cached[0] != version:
+        cached = (version, DatetimeColumns.detect(df))
+        st.session_state.dataset_datetimes = cached
+    return cached[1]
+
+
+def set_uploaded_df(df, step=None, new_dataset=False):
+    """
+    Stores the working dataset and bumps its version so cached results are
+    invalidated. ``step`` describes the change for the edit history (which
+    ``new_dataset`` restarts) and the session snapshot is saved in the background.
+    Jobs still working on the previous version are cancelled.
+    """
+    discard_version_jobs(dataset_version())
+    st.session_state.uploaded_df = df
+    st.session_state.df_version = dataset_version() + 1
+    history = [] if new_dataset else st.session_state.get("edit_history", [])
+    if step is not None:
+        history = history + [{"Step": step, "Rows": len(df), "Columns": df.shape[1],
+                              "Time": time.strftime("%Y-%m-%d %H:%M:%S")}]
+    st.session_state.edit_history = history
+    save_session_snapshot()
+
+
+def save_session_snapshot():
+    """
+    Saves the working dataset and edit history as this session's snapshot in
+    a background job (an unfinished save of an older version is cancelled).
+    The snapshot's restore token, not the session key, goes into the URL so a
+    reload after a restart can restore it.
+    """
+    if not SESSION_SNAPSHOTS:
+        return None
+    previous = st.session_state.get("snapshot_job_id")
+    if previous is not None:
+        get_job_manager().discard(previous)
+    snapshot = get_snapshot_store().snapshot(_snapshot_token())
+    job = start_job("session_snapshot", snapshot.save, st.session_state.uploaded_df, dataset_version(),
+                    st.session_state.edit_history, restart=True)
+    st.session_state.snapshot_job_id = job.id
+    st.query_params["session"] = _snapshot_token()
+    return job
+
+
+def save_report_snapshot(report):
+    """Adds the exact report of the current dataset version to the session snapshot, once per version."""
+    if not SESSION_SNAPSHOTS or st.session_state.get("snapshot_report_version") == dataset_version():
+        return
+    st.session_state.snapshot_report_version = dataset_version()
+    snapshot = get_snapshot_store().snapshot(_snapshot_token())
+    start_job("session_snapshot_report", snapshot.save_report, report, dataset_version())
+
+
+def restorable_snapshot():
+    """
+    The snapshot named by the ``session`` URL parameter while this session has
+    no dataset (after a server restart or session timeout), else None.
+    """
+    if not SESSION_SNAPSHOTS or st.session_state.get("uploaded_df") is not None:
+        return None
+    snapshot = get_snapshot_store().snapshot(st.query_params.get("session"))
+    return snapshot if snapshot is not None and snapshot.exists else None
+
+
+def restore_session(snapshot):
+    """
+    Reopens a snapshot (memory-mapped) as this session's dataset, with its
+    version, history and report; None when another session claimed it first.
+    The snapshot moves to a new restore token, so the old URL stops working
+    and a duplicated tab cannot keep writing to it. The session key (jobs,
+    uploads) stays this session's own.
+    """
+    snapshot = get_snapshot_store().claim(snapshot.key)
+    if snapshot is None:
+        return None
+    st.session_state.snapshot_token = snapshot.key
+    st.query_params["session"] = snapshot.key
+    df = snapshot.load_data()
+    manifest = snapshot.manifest()
+    st.session_state.uploaded_df = df
+    st.session_state.df_version = manifest["version"]
+    st.session_state.edit_history = manifest["history"]
+    report = snapshot.load_report()
+    if report is not None:
+        st.session_state.restored_report = (manifest["version"], report)
+        st.session_state.snapshot_report_version = manifest["version"]
+    return df
+
+
+def _session_key():
+    if "session_key" not in st.session_state:
+        st.session_state.session_key = uuid.uuid4().hex
+    return st.session_state.session_key
+
+
+def _snapshot_token():
+    if "snapshot_token" not in st.session_state:
+        st.session_state.snapshot_token = SnapshotStore.new_key()
+    return st.session_state.snapshot_token
+
+
+def session_job_id(name):
+    """Job ID that stays stable across reruns for this session and dataset version."""
+    return f"{_session_key()}:{name}:{dataset_version()}"
+
+
+def get_job(name):
+    return get_job_manager().get(session_job_id(name))
+
+
+def start_job(name, fn, *args, restart=False, **kwargs):
+    """Returns the running/finished job ``name`` or starts it in the background."""
+    manager = get_job_manager()
+    job_id = session_job_id(name)
+    job = manager.get(job_id)
+    if job is None or restart:
+        if job is not None:
+            manager.discard(job_id)
+        job = manager.submit(fn, *args, job_id=job_id, name=name, **kwargs)
+    return job
+
+
+def discard_job(name):
+    return get_job_manager().discard(session_job_id(name))
+
+
+def discard_version_jobs(version):
+    """Cancels and forgets this session's jobs for dataset ``version``; their results would never be shown."""
+    manager = get_job_manager()
+    prefix, suffix = f"{_session_key()}:", f":{version}"
+    for job in manager.jobs():
+        if job.id.startswith(prefix) and job.id.endswith(suffix):
+            manager.discard(job.id)
+
+
+def render_job_progress(job, label=None, poll_interval=1.0):
+    """
+    Shows a progress bar and a cancel button for a running job. The fragment
+    polls the job and reruns the whole page once it has finished.
+    """
+    label = label or job.name
+
+    @st.fragment(run_every=poll_interval)
+    def _job_status():
+        if job.is_finished:
+            st.rerun()
+        st.progress(job.progress, text=f"⏳ {label}: {job.stage or 'queued'}")
+        if st.button("✖ Cancel", key=f"cancel_{job.id}"):
+            job.cancel()
+            st.rerun()
+
+    _job_status()
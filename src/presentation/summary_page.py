@@ -1,15 +1,172 @@
+import io
+import os
+import tempfile
 import streamlit as st
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 import numpy as np
-from services.quality_analysis import DataSummary, ClassImbalanceAnalyzer
+from services.quality_analysis import DataSummary, ClassImbalanceAnalyzer, CorrelationHandler
+from services.data_validation import RuleValidator
+from domain.validation_rules import RuleSet
+from config.settings import CHUNK_SIZE, APPROX_SAMPLE_SIZE, APPROX_MIN_ROWS
+from infrastructure.report_export import ReportExporter, ReportJSONWriter
+from services.profiles import DatasetProfile, compare_profiles
+from services.outliers import OutlierEngine, IsolationForestDetector
+from services.missingness import MissingnessMatrix
+from services.association import MEASURES, pairs_to_matrix
+from services.key_discovery import key_violations
+from presentation.session import (
+    get_job, start_job, render_job_progress, dataset_version, dataset_datetimes, save_report_snapshot,
+)
+from services.jobs import Job
+
+# Bars shown in the missing values chart (largest gaps first)
+MAX_MISSING_BARS = 40
+
+# Heatmaps: cells are annotated up to MAX_ANNOTATED_COLUMNS columns; categorical
+# association heatmaps show at most MAX_HEATMAP_COLUMNS columns
+MAX_ANNOTATED_COLUMNS = 15
+MAX_HEATMAP_COLUMNS = 40
+
+OUTLIER_METHODS = {
+    "IQR": "iqr",
+    "Z-score": "zscore",
+    "MAD (modified z-score)": "mad",
+    "Isolation Forest (multivariate)": "isolation_forest",
+}
+
+
+def _build_profile(df, progress_callback=None):
+    return DatasetProfile.from_dataframe(df)
+
+
+def _build_missingness(df, progress_callback=None):
+    return MissingnessMatrix.from_dataframe(df)
+
+
+def _outlier_scan(df, method, progress_callback=None):
+    """
+    (per-column report, RowBitmap of flagged rows, None) for a non-default
+    method, or ({}, None, reason) when the method does not apply to ``df``.
+    """
+    try:
+        if method == "isolation_forest":
+            return {}, IsolationForestDetector().detect(df), None
+        result = OutlierEngine(method=method).detect(df)
+        return result.report(), result.rows, None
+    except ValueError as e:
+        return {}, None, str(e)
+
+
+def _report_json(report):
+    buffer = io.StringIO()
+    ReportJSONWriter().write(report, buffer)
+    return buffer.getvalue()
+
+
+def _build_pdf(report, df, progress_callback=None):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "data_quality_report.pdf")
+        ReportExporter().export_pdf(report, pdf_path, df=df)
+        with open(pdf_path, "rb") as f:
+            return f.read()
+
 
 class SummaryPage:
     """
     Displays Data Quality Analysis summary in an interactive dashboard.
     """
 
+    def resolve_report(self, df):
+        """
+        Returns the best report available right now. The exact analysis always
+        runs as a background job; on large datasets an approximate report
+        computed on a sample is shown until the exact one is ready.
+        """
+        sample_size = None
+        if len(df) > APPROX_MIN_ROWS:
+            if st.toggle("⚡ Fast approximate profiling", value=True, key="approximate_profiling"):
+                sample_size = int(st.number_input(
+                    "Sample size (rows):", min_value=1000, max_value=len(df),
+                    value=min(APPROX_SAMPLE_SIZE, len(df)), step=1000, key="approximate_sample_size",
+                ))
+
+        version, restored = st.session_state.get("restored_report", (None, None))
+        if version == dataset_version():
+            st.success(f"✅ Exact results for all {len(df):,} rows, restored from the session snapshot.")
+            return restored
+
+        data_summary = DataSummary(df, sample_size=sample_size, datetimes=dataset_datetimes(df))  # Change target column as needed
+        exact_job = start_job("data_summary", data_summary.generate_report)
+
+        if exact_job.status == Job.DONE:
+            save_report_snapshot(exact_job.result)
+            st.success(f"✅ Exact results computed on all {len(df):,} rows.")
+            return exact_job.result
+        if exact_job.status == Job.FAILED:
+            st.error(f"❌ Data quality analysis failed: {exact_job.error}")
+            if st.button("🔄 Retry Analysis"):
+                start_job("data_summary", data_summary.generate_report, restart=True)
+                st.rerun()
+            return None
+        if exact_job.status == Job.CANCELLED:
+            st.warning("⚠ Exact data quality analysis was cancelled.")
+            if st.button("🔄 Restart Analysis"):
+                start_job("data_summary", data_summary.generate_report, restart=True)
+                st.rerun()
+            if sample_size is None:
+                return None
+
+        if sample_size is not None:
+            approx_job = start_job(f"data_summary_sample_{sample_size}", data_summary.generate_report, approximate=True)
+            if approx_job.status == Job.DONE:
+                if not exact_job.is_finished:
+                    render_job_progress(exact_job, label="Refining exact statistics")
+                st.info(
+                    f"⚡ Approximate results from a {sample_size:,}-row sample of {len(df):,} rows "
+                    "(95% confidence intervals shown). They are replaced by exact values when the background pass completes."
+                )
+                return approx_job.result
+            if not approx_job.is_finished:
+                render_job_progress(approx_job, label="Profiling a sample")
+                return None
+
+        if not exact_job.is_finished:
+            render_job_progress(exact_job, label="Analyzing data quality")
+        return None
+
+    @staticmethod
+    def background(name, fn, *args, label):
+        """
+        Result of the background job ``name`` (one per dataset version), or
+        None while it runs (its progress is shown) or after it failed.
+        """
+        job = start_job(name, fn, *args)
+        if job.status == Job.DONE:
+            return job.result
+        if job.status == Job.FAILED:
+            st.error(f"❌ {label} failed: {job.error}")
+        elif job.status == Job.CANCELLED:
+            st.warning(f"⚠ {label} was cancelled.")
+        else:
+            render_job_progress(job, label=label)
+            return None
+        if st.button(f"🔄 Retry {label}", key=f"retry_{name}"):
+            start_job(name, fn, *args, restart=True)
+            st.rerun()
+        return None
+
+    @staticmethod
+    def plot_heatmap(matrix, cmap, vmin=None, vmax=None):
+        """Correlation-style heatmap; cells are annotated while the matrix is small enough to read."""
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        size = max(8, min(16, 0.35 * len(matrix)))
+        fig, ax = plt.subplots(figsize=(size, 0.75 * size))
+        sns.heatmap(matrix, annot=len(matrix) <= MAX_ANNOTATED_COLUMNS, cmap=cmap, vmin=vmin, vmax=vmax,
+                    fmt=".2f", linewidths=0.5 if len(matrix) <= MAX_ANNOTATED_COLUMNS else 0, ax=ax)
+        st.pyplot(fig)
+
     def display(self):
         st.title("📊 Data Quality Analysis")
 
@@ -17,9 +174,13 @@ class SummaryPage:
             st.warning("⚠ No file uploaded. Please upload a dataset first.")
             return
 
-        # Generate Data Summary
-        data_summary = DataSummary(st.session_state.uploaded_df)  # Change target column as needed
-        report = data_summary.generate_report()
+        report = self.resolve_report(st.session_state.uploaded_df)
+        if report is None:
+            return
+
+        # The plotting stack is only needed once a report is ready to draw
+        import matplotlib.pyplot as plt
+        import seaborn as sns
         
         
         # --- 1️⃣ Missing Values Report ---
@@ -29,11 +190,33 @@ class SummaryPage:
             st.dataframe(missing_df)
             # Plot missing values if any exist
             if missing_df["Missing Values"].sum() > 0:
+                # Wide tables: chart only the columns that actually have gaps
+                plotted = missing_df[missing_df["Missing Values"] > 0].nlargest(MAX_MISSING_BARS, "Missing Values")
                 fig, ax = plt.subplots(figsize=(8, 4))
-                sns.barplot(x=missing_df.index, y=missing_df["Missing Values"], ax=ax, palette="coolwarm", hue=missing_df.index, legend=False)
+                sns.barplot(x=plotted.index.astype(str), y=plotted["Missing Values"], ax=ax, palette="coolwarm", hue=plotted.index.astype(str), legend=False)
                 plt.xticks(rotation=45)
                 plt.ylabel("Count")
                 st.pyplot(fig)
+
+                patterns = report.get("Missing Value Patterns")
+                if isinstance(patterns, pd.DataFrame) and not patterns.empty:
+                    st.write("**Most frequent missing patterns (per row)**")
+                    st.dataframe(patterns)
+                pairs = report.get("Co-Missing Columns")
+                if isinstance(pairs, pd.DataFrame) and not pairs.empty:
+                    st.write("**Columns that go missing together**")
+                    st.dataframe(pairs)
+
+                    missingness = self.background("missingness", _build_missingness, st.session_state.uploaded_df,
+                                                  label="Clustering co-missing columns")
+                    heatmap = missingness.clustered_jaccard() if missingness is not None else pd.DataFrame()
+                    if not heatmap.empty:
+                        size = min(12, 3 + 0.25 * len(heatmap))
+                        fig, ax = plt.subplots(figsize=(size, size * 0.8))
+                        sns.heatmap(heatmap, cmap="Blues", vmin=0, vmax=1, square=True, ax=ax,
+                                    xticklabels=True, yticklabels=True, cbar_kws={"label": "Jaccard co-missingness"})
+                        ax.tick_params(labelsize=7)
+                        st.pyplot(fig)
         else:
             st.write("No missing values report available.")
 
@@ -42,6 +225,61 @@ class SummaryPage:
         duplicate_report = report.get("Duplicate Report", {})
         total_duplicates = duplicate_report.get("Total Duplicates", 0)
         st.write(f"**Total Duplicates:** {total_duplicates}")
+        if "Lower Bound" in duplicate_report:
+            st.caption(f"Approximate: at least {duplicate_report['Lower Bound']:,} ({duplicate_report.get('Note', '')})")
+        if duplicate_report.get("Compared Columns") == []:
+            st.caption("Near duplicates: no record-like text columns (names, e-mails, addresses) to compare.")
+        elif "Near Duplicates" in duplicate_report:
+            st.write(f"**Near Duplicates:** {duplicate_report['Near Duplicates']} "
+                     f"(text similarity ≥ {duplicate_report.get('Similarity Threshold')})")
+            if "Near Duplicates Lower Bound" in duplicate_report:
+                st.caption(f"Approximate: at least {duplicate_report['Near Duplicates Lower Bound']:,} "
+                           f"({duplicate_report.get('Note', '')})")
+        near_duplicates = report.get("Near-Duplicate Rows")
+        if isinstance(near_duplicates, pd.DataFrame) and not near_duplicates.empty:
+            df = st.session_state.uploaded_df
+            preview = near_duplicates.head(100)
+            rows = df.loc[df.index.intersection(preview["Row"])]
+            st.dataframe(preview.set_index("Row").join(rows, rsuffix=" (data)"))
+            st.caption("Rows of each cluster after the first can be removed on the Preprocessing page.")
+
+        # --- 🔑 Candidate Keys & Functional Dependencies ---
+        st.subheader("🔑 Candidate Keys & Functional Dependencies")
+        keys = report.get("Candidate Keys")
+        if isinstance(keys, pd.DataFrame) and not keys.empty:
+            st.dataframe(keys.assign(Columns=keys["Columns"].map(lambda cols: " + ".join(map(str, cols)))))
+            search = report.get("Key Search", {})
+            st.caption(f"Combinations of up to {search.get('Max Key Size')} columns searched on {search.get('Sample Rows', 0):,} "
+                       f"sampled rows, every key verified on all {search.get('Rows', 0):,} rows; search {search.get('Search')}.")
+            near_keys = keys[keys["Status"] == "Near key"]
+            if not near_keys.empty:
+                choice = st.selectbox("🔍 Show the rows that break a near key", near_keys.index,
+                                      format_func=lambda i: " + ".join(map(str, near_keys.at[i, "Columns"])), key="near_key_choice")
+                st.dataframe(key_violations(st.session_state.uploaded_df, near_keys.at[choice, "Columns"]).head(100))
+        else:
+            st.write("No column combination uniquely identifies the rows.")
+        dependencies = report.get("Functional Dependencies")
+        if isinstance(dependencies, pd.DataFrame) and not dependencies.empty:
+            st.write("**Functional dependencies** (the determinant fixes the dependent value)")
+            st.dataframe(dependencies)
+
+        # --- 📇 Cardinality Report ---
+        st.subheader("📇 Cardinality & Top Values")
+        cardinality_report = report.get("Cardinality Report")
+        if isinstance(cardinality_report, pd.DataFrame) and not cardinality_report.empty:
+            st.dataframe(cardinality_report)
+        else:
+            st.write("No cardinality report available.")
+
+        # --- 🕒 Datetime Profile ---
+        st.subheader("🕒 Date & Time Columns")
+        datetime_profile = report.get("Datetime Profile")
+        if isinstance(datetime_profile, pd.DataFrame) and not datetime_profile.empty:
+            st.dataframe(datetime_profile.astype(str).replace({"None": "", "NaT": ""}))
+            for _, row in datetime_profile[datetime_profile["Gaps"] > 0].iterrows():
+                st.caption(f"⏳ '{row['Column']}': {row['Gaps']:,} gap(s), the largest {row['Largest Gap']} after {row['Largest Gap Start']}.")
+        else:
+            st.write("No date or time columns detected.")
 
         # --- 3️⃣ Class Imbalance Report ---
         st.subheader("⚖ Class Imbalance Report")
@@ -110,18 +348,54 @@ class SummaryPage:
         else:
             st.write("No highly correlated features detected!")
         # Additionally, display the correlation heatmap for numerical columns
-        numerical_df = st.session_state.uploaded_df.select_dtypes(include=['number'])
-        if numerical_df.shape[1] > 1:
-            fig, ax = plt.subplots(figsize=(8, 6))
-            sns.heatmap(numerical_df.corr(), annot=True, cmap="coolwarm", fmt=".2f", linewidths=0.5, ax=ax)
-            st.pyplot(fig)
+        df = st.session_state.uploaded_df
+        numerical_cols = df.select_dtypes(include=['number']).columns.tolist()
+        if len(numerical_cols) > 1:
+            self.plot_heatmap(CorrelationHandler.correlation_matrix(df, numerical_cols), cmap="coolwarm")
         else:
             st.info("Not enough numeric columns for correlation analysis (need at least 2).")
 
+        # --- Categorical association (Cramér's V / mutual information) ---
+        st.subheader("🔗 Categorical Association Heatmap")
+        redundant = report.get("Redundant Categorical Features")
+        if isinstance(redundant, list) and len(redundant) > 0:
+            st.write("Redundant Categorical Features:", redundant)
+        else:
+            st.write("No redundant categorical features detected!")
+        pairs = report.get("Categorical Associations")
+        if isinstance(pairs, pd.DataFrame) and not pairs.empty:
+            measure = st.radio("Association measure", list(MEASURES), format_func=MEASURES.get, horizontal=True, key="association_measure")
+            matrix = pairs_to_matrix(pairs, measure)
+            if len(matrix) > MAX_HEATMAP_COLUMNS:
+                # Keep the columns with the strongest associations readable
+                st.caption(f"Showing the {MAX_HEATMAP_COLUMNS} most strongly associated of {len(matrix)} categorical columns.")
+                strongest = (matrix - np.eye(len(matrix))).max().nlargest(MAX_HEATMAP_COLUMNS).index
+                matrix = matrix.loc[strongest, strongest]
+            self.plot_heatmap(matrix, cmap="Blues", vmin=0, vmax=1)
+            st.dataframe(pairs.head(20))
+        else:
+            st.info("Not enough categorical columns for association analysis (need at least 2).")
+
         # --- 8️⃣ Outlier Detection ---
         st.subheader("🚨 Extreme Value Report (Outliers)")
+        methods = list(OUTLIER_METHODS)
+        if st.session_state.uploaded_df.select_dtypes(include=["number"]).empty:
+            methods.remove("Isolation Forest (multivariate)")  # needs numeric columns
+        method = st.selectbox("Detection method", methods, key="outlier_method")
         extreme_values = report.get("Extreme Value Report")
-        if isinstance(extreme_values, dict) and extreme_values:
+        flagged_rows = None
+        if OUTLIER_METHODS[method] != "iqr":
+            scan = self.background(f"outlier_scan_{OUTLIER_METHODS[method]}", _outlier_scan, st.session_state.uploaded_df,
+                                   OUTLIER_METHODS[method], label=f"Scanning for outliers ({method})")
+            extreme_values, flagged_rows, unavailable = scan if scan is not None else ({}, None, None)
+            if unavailable:
+                st.info(f"ℹ️ {method} is not available for this dataset: {unavailable}.")
+            elif flagged_rows is not None:
+                st.caption(f"{flagged_rows.count()} of {len(st.session_state.uploaded_df)} rows flagged by {method}.")
+        if OUTLIER_METHODS[method] == "isolation_forest":
+            if flagged_rows is not None:
+                st.dataframe(st.session_state.uploaded_df.iloc[flagged_rows.indices()[:100]])
+        elif isinstance(extreme_values, dict) and extreme_values:
             st.write(extreme_values)
             # Plot boxplots for outlier detection
             numerical_cols = st.session_state.uploaded_df.select_dtypes(include=['number']).columns
@@ -137,6 +411,62 @@ class SummaryPage:
         else:
             st.write("No extreme values detected!")
 
+        # --- 9️⃣ Validation Rules ---
+        st.subheader("📋 Validation Rules")
+        schema_file = st.file_uploader("Upload a validation schema (JSON or YAML)", type=["json", "yaml", "yml"], key="validation_schema")
+        if schema_file is not None:
+            try:
+                schema_text = schema_file.getvalue().decode("utf-8")
+                if schema_file.name.endswith((".yaml", ".yml")):
+                    rule_set = RuleSet.from_yaml(schema_text)
+                else:
+                    rule_set = RuleSet.from_json(schema_text)
+
+                validation_report = RuleValidator(rule_set).validate(st.session_state.uploaded_df, chunksize=CHUNK_SIZE)
+                st.dataframe(validation_report.summary())
+                if validation_report.is_valid:
+                    st.success("✅ All validation rules passed!")
+                else:
+                    failing = validation_report.failing_rows()
+                    st.warning(f"⚠ {failing.count()} rows violate at least one rule.")
+                    st.dataframe(st.session_state.uploaded_df.iloc[failing.indices()[:100]])
+            except Exception as e:
+                st.error(f"❌ Could not apply validation schema: {e}")
+
+        # --- Dataset Profile & Drift ---
+        st.subheader("🧾 Dataset Profile & Drift")
+        baseline_file = st.file_uploader("Compare with a saved profile", type=["ssprof"], key="baseline_profile")
+        # Built on request only: one pass over every column
+        profile = None
+        if get_job("dataset_profile") is not None or baseline_file is not None or st.button("🧾 Build Profile"):
+            profile = self.background("dataset_profile", _build_profile, st.session_state.uploaded_df,
+                                      label="Building the dataset profile")
+        if profile is not None:
+            st.download_button("📥 Download Profile", data=profile.to_bytes(), file_name="dataset_profile.ssprof", mime="application/octet-stream")
+        if profile is not None and baseline_file is not None:
+            try:
+                comparison = compare_profiles(DatasetProfile.from_bytes(baseline_file.getvalue()), profile)
+                if comparison["Schema Changes"].empty:
+                    st.success("✅ No schema changes.")
+                else:
+                    st.dataframe(comparison["Schema Changes"])
+                st.dataframe(comparison["Distribution Drift"])
+            except Exception as e:
+                st.error(f"❌ Could not compare profiles: {e}")
+
+        # --- 🔟 Export Report ---
+        st.subheader("📥 Export Report")
+        export_json, export_pdf = st.columns(2)
+        with export_json:
+            # Written only when the download is clicked, not on every rerun
+            st.download_button("📥 Download JSON Report", data=lambda: _report_json(report), file_name="data_quality_report.json", mime="application/json")
+        with export_pdf:
+            # The approximate report is replaced by the exact one for the same dataset version
+            pdf_job = f"report_pdf_{report.get('Profile Mode', {}).get('Mode', 'Exact').lower()}"
+            if get_job(pdf_job) is not None or st.button("📄 Generate PDF Report"):
+                pdf = self.background(pdf_job, _build_pdf, report, st.session_state.uploaded_df, label="Building the PDF report")
+                if pdf is not None:
+                    st.download_button("📥 Download PDF Report", data=pdf, file_name="data_quality_report.pdf", mime="application/pdf")
 
         st.success("✅ Data Quality Analysis Completed!")
 
@@ -1,10 +1,22 @@
-import streamlit as st
-import matplotlib.pyplot as plt
-import seaborn as sns
+import io
+import json
+import os
+import time
 import pandas as pd
+import streamlit as st
+from config.settings import EXPORT_DOWNLOAD_LIMIT_BYTES
+from infrastructure.data_export import DataExporter, EXPORT_FORMATS
 from infrastructure.file_loader import FileHandler
+from services.encoding import CategoricalEncoder
 from services.preprocessing import DataPreprocessing
-from presentation.summary_page import SummaryPage
+from services.quality_analysis import DataTypeHandler, CategoricalValueChecker
+from services.categorical_consistency import CategoricalConsistencyEngine
+from services.near_duplicates import NearDuplicateDetector
+from presentation.session import (
+    set_uploaded_df, get_job, start_job, discard_job, render_job_progress, session_uploads, dataset_version,
+    restorable_snapshot, restore_session,
+)
+from services.jobs import Job
 
 class UIHandler:
     def __init__(self):
@@ -13,13 +25,53 @@ class UIHandler:
 
     def display_upload_page(self):
         """Handles file upload UI and processing"""
+        self.display_restore_option()
         st.subheader("📤 Upload Your File")
-        self.file_handler.handle_file_upload()  # Calls file upload handler
+        self.handle_file_upload()
+
+    def handle_file_upload(self):
+        """Handles file upload and validation using Streamlit's uploader"""
+        uploaded_file = st.file_uploader("Upload CSV, Excel, or JSON", type=["csv", "xls", "xlsx", "json"])
+
+        if uploaded_file:
+            # Parse each upload once; reruns keep the (possibly preprocessed) session copy
+            if st.session_state.get("uploaded_file_id") != uploaded_file.file_id:
+                df = self.file_handler.load_upload(uploaded_file, session_uploads())
+                if df is None:
+                    st.error("❌ Invalid file format or corrupted file. Please upload a valid CSV, Excel, or JSON.")
+                    return
+
+                st.session_state.uploaded_file_id = uploaded_file.file_id
+                set_uploaded_df(df, step=f"Uploaded {uploaded_file.name}", new_dataset=True)
+
+            st.dataframe(st.session_state.uploaded_df.head(10))  # Display preview
+
+    def display_restore_option(self):
+        """Offers to reopen this session's snapshot after a server restart or session timeout."""
+        snapshot = restorable_snapshot()
+        if snapshot is None:
+            return
+        manifest = snapshot.manifest()
+        st.subheader("♻️ Restore Previous Session")
+        saved_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(manifest["saved_at"]))
+        st.info(f"A snapshot saved at {saved_at} is available: {manifest['rows']:,} rows x "
+                f"{len(manifest['columns'])} columns, {len(manifest['history'])} edit steps.")
+        if manifest["history"]:
+            st.dataframe(pd.DataFrame(manifest["history"]))
+        if st.button("♻️ Restore Session"):
+            started = time.time()
+            df = restore_session(snapshot)
+            if df is None:
+                st.warning("⚠ This snapshot was already restored in another session.")
+            else:
+                st.success(f"✅ Restored {len(df):,} rows in {time.time() - started:.1f}s!")
 
     def display_data_summary(self):
         """Displays data analysis UI"""
         
         if "uploaded_df" in st.session_state and st.session_state.uploaded_df is not None:
+            from presentation.summary_page import SummaryPage  # loads the plotting stack on demand
+
             df = st.session_state.uploaded_df
             summary = SummaryPage()
             summary.display()
@@ -35,17 +87,136 @@ class UIHandler:
 
             # Column Management: Rename or Delete Columns
             st.subheader("🛠 Column Management")
-            df = self.data_preprocessor.modify_columns(df)
-            st.session_state.uploaded_df = df  # Update session state after modification
+            columns_before = list(df.columns)
+            df = self.data_preprocessor.modify_columns(df.copy(deep=False))  # renames/drops in place
+            if list(df.columns) != columns_before:
+                set_uploaded_df(df, step="Renamed or deleted columns")  # Update session state after modification
 
             # Null Value Handling
             # st.subheader("🔍 Null Value Handling")
             selected_methods = self.data_preprocessor.display_null_filling_options(df)
 
+            fill_job = get_job("fill_missing_values")
             if selected_methods and st.button("Apply Changes"):
-                df = self.data_preprocessor.fill_missing_values(df, selected_methods)
-                st.session_state.uploaded_df = df  # Update session state
-                st.success("✅ Missing values have been handled successfully!")
+                fill_job = start_job("fill_missing_values", self.data_preprocessor.apply_fill_methods, df.copy(), selected_methods, restart=True)
+
+            if fill_job is not None:
+                if fill_job.status == Job.DONE:
+                    discard_job("fill_missing_values")
+                    df, errors, dropped_columns = fill_job.result
+                    set_uploaded_df(df, step="Handled missing values")  # Update session state
+                    for col, error in errors.items():
+                        st.error(f"⚠ Error filling missing values for '{col}': {error}")
+                    if dropped_columns:
+                        st.success(f"✅ Dropped columns: {', '.join(dropped_columns)}")
+                    st.success("✅ Missing values have been handled successfully!")
+                elif fill_job.status == Job.FAILED:
+                    discard_job("fill_missing_values")
+                    st.error(f"❌ Missing value handling failed: {fill_job.error}")
+                elif fill_job.status == Job.CANCELLED:
+                    discard_job("fill_missing_values")
+                    st.warning("⚠ Missing value handling was cancelled.")
+                else:
+                    render_job_progress(fill_job, label="Handling missing values")
+
+            # Categorical Consistency
+            st.subheader("🔤 Categorical Value Normalization")
+            df = self.display_categorical_options(df)
+
+            # Near-Duplicate Records
+            st.subheader("🪞 Near-Duplicate Records")
+            df = self.display_near_duplicate_options(df)
+
+            # Feature Scaling
+            st.subheader("📐 Feature Scaling")
+            scaling_method, scaling_columns = self.data_preprocessor.display_scaling_options(df)
+
+            if scaling_method and scaling_columns and st.button("Apply Scaling"):
+                df, scaler = self.data_preprocessor.scale_columns(df, scaling_method, scaling_columns)
+                set_uploaded_df(df, step=f"Scaled {', '.join(map(str, scaling_columns))} ({scaling_method})")
+                st.session_state.feature_scaler = scaler.to_dict()
+                st.success("✅ Selected columns have been scaled successfully!")
+
+            if st.session_state.get("feature_scaler"):
+                st.download_button(
+                    label="📥 Download Scaling Parameters",
+                    data=json.dumps(st.session_state.feature_scaler),
+                    file_name="scaling_params.json",
+                    mime="application/json",
+                )
+
+            # Categorical Encoding
+            st.subheader("🔢 Categorical Encoding")
+            encoding_method, encoding_columns, n_hash_features = self.data_preprocessor.display_encoding_options(df)
+
+            if encoding_method and encoding_columns and st.button("Apply Encoding"):
+                df, encoder = self.data_preprocessor.encode_columns(df, encoding_method, encoding_columns, n_hash_features)
+                st.session_state.categorical_encoder = encoder.to_json()
+                if encoding_method in CategoricalEncoder.SPARSE_METHODS:
+                    # Wide indicator features stay sparse and are offered as a download
+                    from scipy import sparse  # SciPy is imported on demand
+
+                    matrix = encoder.transform_sparse(df)
+                    buffer = io.BytesIO()
+                    sparse.save_npz(buffer, matrix)
+                    st.session_state.encoded_matrix = (dataset_version(), buffer.getvalue())
+                    st.success(f"✅ Built a {matrix.shape[0]} x {matrix.shape[1]} sparse matrix ({matrix.nnz} non-zeros)!")
+                else:
+                    set_uploaded_df(df, step=f"Encoded {', '.join(map(str, encoding_columns))} ({encoding_method})")
+                    st.success(f"✅ Encoded {len(encoding_columns)} columns!")
+
+            if st.session_state.get("categorical_encoder"):
+                st.download_button(
+                    label="📥 Download Category Maps",
+                    data=st.session_state.categorical_encoder,
+                    file_name="encoding_params.json",
+                    mime="application/json",
+                )
+            version, matrix_bytes = st.session_state.get("encoded_matrix", (None, None))
+            if version == dataset_version():
+                st.download_button(
+                    label="📥 Download Sparse Features (.npz)",
+                    data=matrix_bytes,
+                    file_name="encoded_features.npz",
+                    mime="application/octet-stream",
+                )
+
+            # Feature Selection (PCA)
+            st.subheader("🧬 Feature Selection (PCA)")
+            numerical_cols, _ = DataTypeHandler.separate_columns(df)
+            reducer = None
+            if len(numerical_cols) < 2:
+                st.info("PCA requires at least two numerical columns.")
+            elif len(df) < 2:
+                st.info("PCA requires at least two rows.")
+            elif st.checkbox("Run PCA on numerical columns"):
+                max_components = min(len(numerical_cols), len(df), 50)
+                n_components = st.slider("Number of components:", 1, max_components, min(max_components, 5))
+                try:
+                    reducer = self.pca_fit(df, numerical_cols, n_components)
+                except ValueError as e:
+                    st.error(f"❌ PCA failed: {e}")
+                    reducer = None
+
+            if reducer is not None:
+                st.dataframe(reducer.explained_variance_report())
+                st.write("**Component Loadings**")
+                st.dataframe(reducer.loadings())
+
+                if st.button("Replace numerical columns with principal components"):
+                    df = reducer.reduce_dataframe(df)
+                    set_uploaded_df(df, step=f"Replaced {len(numerical_cols)} numerical columns with {n_components} principal components")
+                    st.success(f"✅ Replaced {len(numerical_cols)} columns with {n_components} components!")
+
+            # Edit History
+            history = st.session_state.get("edit_history")
+            if history:
+                st.subheader("🕘 Edit History")
+                st.dataframe(pd.DataFrame(history))
+
+            # Export Cleaned Data
+            st.subheader("💾 Export Cleaned Data")
+            self.display_export_options(df)
 
             # Show updated dataframe preview
             st.subheader("📌 Updated Dataset Preview")
@@ -54,8 +225,160 @@ class UIHandler:
         else:
             st.warning("⚠ No file uploaded. Please upload a file first.")
 
+    @staticmethod
+    def pca_fit(df, columns, n_components):
+        """PCAFeatureReducer fitted on ``columns``, cached per (dataset version, columns, n_components)."""
+        from services.feature_selection import PCAFeatureReducer  # scikit-learn is imported on demand
+
+        version = dataset_version()
+        cached = st.session_state.get("pca_fits")
+        if cached is None or cached[0] != version:
+            cached = (version, {})
+            st.session_state.pca_fits = cached
+        key = (tuple(columns), n_components)
+        if key not in cached[1]:
+            cached[1][key] = PCAFeatureReducer(n_components=n_components, columns=columns).fit(df)
+        return cached[1][key]
+
+    def display_categorical_options(self, df):
+        """
+        Lists category variants found by a background job (one per dataset
+        version) and merges them with that job's analysis. Returns the
+        (possibly normalized) dataset.
+        """
+        categorical_job = start_job("categorical_consistency", CategoricalValueChecker.analyze_categorical_values, df)
+        if categorical_job.status == Job.FAILED:
+            st.error(f"❌ Categorical consistency check failed: {categorical_job.error}")
+            if st.button("🔄 Retry Check"):
+                start_job("categorical_consistency", CategoricalValueChecker.analyze_categorical_values, df, restart=True)
+                st.rerun()
+            return df
+        if categorical_job.status == Job.CANCELLED:
+            st.warning("⚠ Categorical consistency check was cancelled.")
+            if st.button("🔄 Restart Check"):
+                start_job("categorical_consistency", CategoricalValueChecker.analyze_categorical_values, df, restart=True)
+                st.rerun()
+            return df
+        if categorical_job.status != Job.DONE:
+            render_job_progress(categorical_job, label="Checking categorical values")
+            return df
+
+        results = categorical_job.result
+        if not results:
+            st.info("No inconsistent categorical variants detected.")
+            return df
+        st.write({col: result["groups"] for col, result in results.items()})
+        if st.button("Merge Category Variants"):
+            engine = CategoricalConsistencyEngine()
+            df = df.copy(deep=False)  # background jobs may still be reading the current frame
+            for col, result in results.items():
+                df[col] = engine.normalize_column(df[col], result)
+            set_uploaded_df(df, step=f"Normalized category variants in {', '.join(map(str, results))}")
+            st.success(f"✅ Normalized variants in: {', '.join(map(str, results))}")
+        return df
+
+    def display_near_duplicate_options(self, df):
+        """
+        Finds rows that repeat another row up to casing, punctuation or small
+        typos in the chosen text columns (a background job) and removes all but
+        the first row of every cluster. Returns the (possibly reduced) dataset.
+        """
+        text_cols = NearDuplicateDetector.default_columns(df)
+        if not text_cols:
+            st.caption("No record-like text columns found; rows sharing only categories are not near duplicates.")
+        columns = st.multiselect("Compare columns:", list(df.columns), default=text_cols, key="near_duplicate_columns")
+        threshold = st.slider("Similarity threshold:", 0.5, 1.0, 0.8, 0.05, key="near_duplicate_threshold")
+
+        near_job = get_job("near_duplicates")
+        if columns and st.button("🔍 Find Near Duplicates"):
+            detector = NearDuplicateDetector(threshold=threshold)
+            near_job = start_job("near_duplicates", detector.detect, df, columns, restart=True)
+
+        if near_job is not None:
+            if near_job.status == Job.DONE:
+                discard_job("near_duplicates")
+                st.session_state.near_duplicates = (dataset_version(), near_job.result)
+            elif near_job.status == Job.FAILED:
+                discard_job("near_duplicates")
+                st.error(f"❌ Near-duplicate search failed: {near_job.error}")
+            elif near_job.status == Job.CANCELLED:
+                discard_job("near_duplicates")
+                st.warning("⚠ Near-duplicate search was cancelled.")
+            else:
+                render_job_progress(near_job, label="Finding near duplicates")
+
+        version, result = st.session_state.get("near_duplicates", (None, None))
+        if version != dataset_version():
+            return df
+        summary = result.summary()
+        if not summary["Near Duplicates"]:
+            st.info("No near-duplicate rows found.")
+            return df
+        st.write(f"**{summary['Near Duplicates']}** redundant rows in **{summary['Near-Duplicate Clusters']}** clusters "
+                 f"(similarity ≥ {summary['Similarity Threshold']})")
+        preview = result.clusters.head(100)
+        st.dataframe(preview.set_index("Row").join(df.loc[preview["Row"]], rsuffix=" (data)"))
+        if st.button("🧹 Remove Near Duplicates"):
+            df = result.drop(df)
+            set_uploaded_df(df, step=f"Removed {summary['Near Duplicates']} near-duplicate rows")
+            del st.session_state["near_duplicates"]
+            st.success(f"✅ Removed {summary['Near Duplicates']} near-duplicate rows, keeping the first row of each cluster!")
+        return df
+
+    def display_export_options(self, df):
+        """
+        Writes the working dataset to the chosen formats in a background job
+        (chunked, in parallel, optionally compressed) and offers the files for download.
+        """
+        formats = st.multiselect("Export formats:", list(EXPORT_FORMATS), default=["csv", "parquet"])
+        compression = st.selectbox("Compression:", ["None", "gzip", "zstd"])
+        compression = None if compression == "None" else compression
+        chunk_rows = st.number_input("Rows per chunk / Parquet row group (0 = automatic):", min_value=0, value=0, step=10_000)
+
+        export_job = get_job("export_data")
+        if "feather" in formats and compression == "gzip":
+            st.warning("⚠ Feather supports zstd compression only; choose zstd or drop Feather.")
+        elif formats and st.button("💾 Export Data"):
+            export_dir = os.path.join(session_uploads().directory, "exports")
+            os.makedirs(export_dir, exist_ok=True)
+            exporter = DataExporter(chunk_rows=chunk_rows or None)
+            export_job = start_job("export_data", exporter.export, df, os.path.join(export_dir, "cleaned_data"), formats, compression, restart=True)
+
+        if export_job is not None:
+            if export_job.status == Job.DONE:
+                discard_job("export_data")
+                st.session_state.exported_files = (dataset_version(), export_job.result)
+                st.success("✅ Export finished!")
+            elif export_job.status == Job.FAILED:
+                discard_job("export_data")
+                st.error(f"❌ Export failed: {export_job.error}")
+            elif export_job.status == Job.CANCELLED:
+                discard_job("export_data")
+                st.warning("⚠ Export was cancelled.")
+            else:
+                render_job_progress(export_job, label="Exporting data")
+
+        version, paths = st.session_state.get("exported_files", (None, {}))
+        if version != dataset_version():
+            return
+        paths = {file_format: path for file_format, path in paths.items() if os.path.exists(path)}
+        if not paths:
+            return
+        # A download button holds its file in memory on every rerun, so only the chosen one is offered
+        file_format = st.selectbox("File to download:", list(paths), key="download_export_format")
+        path = paths[file_format]
+        size = os.path.getsize(path)
+        if size <= EXPORT_DOWNLOAD_LIMIT_BYTES:
+            with open(path, "rb") as f:
+                st.download_button(f"📥 Download {os.path.basename(path)} ({size / 1e6:.1f} MB)", data=f, file_name=os.path.basename(path), key=f"download_export_{file_format}")
+        else:
+            st.caption(f"📁 {os.path.basename(path)} ({size / 1e6:.0f} MB) is too large for a browser download; it was written to {path}")
+
     def plot_null_values(self, df):
         """Visualizes missing values"""
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         null_counts = df.isnull().sum()
         null_counts = null_counts[null_counts > 0]  # Show only columns with missing values
 
@@ -1,5 +1,8 @@
 import streamlit as st
 import pandas as pd
+from config.settings import ARROW_STRINGS
+from services.data_validation import FileValidation
+from presentation.session import set_uploaded_df, session_uploads
 
 class UploadPage:
     def __init__(self):
@@ -11,25 +14,34 @@ class UploadPage:
 
         uploaded_file = st.file_uploader("Choose a CSV or Excel file", type=["csv", "xlsx"])
         
-        if uploaded_file is not None:
+        if uploaded_file is not None and st.session_state.get("uploaded_file_id") != uploaded_file.file_id:
             try:
-                if uploaded_file.name.endswith(".csv"):
-                    df = pd.read_csv(uploaded_file, dtype=str)  # ✅ Load all columns as strings
-                elif uploaded_file.name.endswith(".xlsx"):
-                    df = pd.read_excel(uploaded_file, dtype=str)
+                # ✅ Spill the upload to disk and parse it from there (CSV via memory map)
+                data_file = session_uploads().spill(uploaded_file)
+                if ARROW_STRINGS:
+                    # ✅ Let the parser infer types; text lands in string[pyarrow], gaps in nullable dtypes
+                    df = FileValidation().read_file(data_file)
+                else:
+                    df = FileValidation().read_file(data_file, arrow_strings=False, dtype=str)  # ✅ Load all columns as strings
+                if df is None:
+                    raise ValueError(f"could not parse {data_file.name}")
 
-                # ✅ Convert numeric columns back to proper types
-                for col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='ignore')
+                if not ARROW_STRINGS:
+                    # ✅ Convert numeric columns back to proper types
+                    for col in df.columns:
+                        df[col] = pd.to_numeric(df[col], errors='ignore')
 
                 # ✅ Store in session state
-                st.session_state.uploaded_df = df
+                st.session_state.uploaded_file_id = uploaded_file.file_id
+                set_uploaded_df(df, step=f"Uploaded {uploaded_file.name}", new_dataset=True)
 
                 st.success("✅ File uploaded successfully!")
                 st.write(df.head())  # Show first 5 rows for preview
 
             except Exception as e:
                 st.error(f"❌ Error loading file: {e}")
+        elif uploaded_file is not None and st.session_state.get("uploaded_df") is not None:
+            st.write(st.session_state.uploaded_df.head())  # Show first 5 rows for preview
 
         if "uploaded_df" not in st.session_state:
             st.session_state.uploaded_df = None
@@ -50,17 +50,78 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import seaborn as sns
-import matplotlib.pyplot as plt
 import io
+from services.sketches import MisraGries
+from services.filter_index import FilterIndex, NumericColumnIndex
+from services.dtypes import TEXT_DTYPES
+from services.datetime_profile import resample_for_chart
+from services.memory_governor import MemoryGovernor
+from services.profiles import DatasetProfile
+from services.quality_analysis import CorrelationHandler
+from presentation.session import dataset_datetimes
+
+# Streamlit's centered layout is about 700 px wide: line charts get roughly one time bucket per pixel
+LINE_CHART_POINTS = 700
 
 class VisualizationPage:
     def __init__(self):
         pass
 
+    @staticmethod
+    def top_values(df, column, limit=1000):
+        """
+        Most frequent values of ``column`` for filter widgets, from a bounded
+        Misra-Gries sketch instead of a full ``unique()`` array. Cached per
+        dataset version.
+        """
+        cache = st.session_state.setdefault("top_values_cache", {})
+        key = (st.session_state.get("df_version", 0), column, limit)
+        if key not in cache:
+            summary = MisraGries(capacity=limit).update(df[column])
+            for stale in [k for k in cache if k[0] != key[0]]:
+                del cache[stale]
+            cache[key] = [value for value, _ in summary.top_k()]
+        return cache[key]
+
+    @staticmethod
+    def filter_index(df):
+        """Column indexes for interactive filtering, built once per dataset version."""
+        version = st.session_state.get("df_version", 0)
+        cached = st.session_state.get("filter_index")
+        if cached is None or cached[0] != version:
+            cached = (version, FilterIndex(df))
+            st.session_state.filter_index = cached
+        return cached[1]
+
+    @staticmethod
+    def data_summary(df):
+        """
+        ``describe(include="all")`` when it fits the memory budget; otherwise a
+        mergeable profile built chunk by chunk (approximate medians and distinct
+        counts). Returns (summary, plan) with plan None for the exact summary.
+        """
+        plan = MemoryGovernor().plan_frame("Data summary", df, chunkable=True)
+        if plan.in_memory:
+            return df.describe(include="all"), None
+        return DatasetProfile.from_chunks(plan.chunks(df)).summary(), plan
+
+    @staticmethod
+    def range_widget(series, column_index):
+        """Range slider for a numeric/datetime column; returns None when the full range is selected."""
+        low, high = column_index.min, column_index.max
+        if low is None or low == high:
+            return None
+        if pd.api.types.is_datetime64_any_dtype(series):
+            low, high = pd.Timestamp(int(low)).to_pydatetime(), pd.Timestamp(int(high)).to_pydatetime()
+        selected = st.slider(f"📏 {series.name} range:", low, high, (low, high))
+        return None if tuple(selected) == (low, high) else tuple(selected)
+
     def display_visualization_options(self, df):
         """Enhanced EDA and Visualization with optional filtering."""
+        import plotly.express as px
+        import seaborn as sns
+        import matplotlib.pyplot as plt
+
         # st.subheader("📊 Explore Your Data")
 
         if df is None or df.empty:
@@ -69,23 +130,45 @@ class VisualizationPage:
 
         ## **✨ Auto-Detect Numerical and Categorical Columns**
         num_cols = df.select_dtypes(include=["number"]).columns.tolist()
-        cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+        cat_cols = df.select_dtypes(include=TEXT_DTYPES).columns.tolist()
 
         ## **📑 Data Summary Before Visualization**
         if st.checkbox("🔍 Show Data Summary"):
-            st.write(df.describe(include="all"))
+            summary, plan = self.data_summary(df)
+            st.write(summary)
+            if plan is not None:
+                st.caption(f"🧮 Profiled in chunks to stay within the memory budget ({plan.describe()}); "
+                           "medians and distinct counts are approximate.")
 
         ## **🔽 Optional Advanced Filtering**
         apply_filter = st.checkbox("⚙️ Enable Advanced Filtering")  # Checkbox to enable filtering
 
         if apply_filter:
             with st.expander("🔽 Advanced Filtering Options"):
-                filter_column = st.selectbox("📂 Select column to filter:", df.columns)
-                unique_values = df[filter_column].unique()
-                selected_values = st.multiselect(f"🎯 Filter {filter_column}:", unique_values, default=unique_values[:5])
-                df_filtered = df[df[filter_column].isin(selected_values)]
+                filter_columns = st.multiselect("📂 Select columns to filter:", df.columns.tolist())
+                index = self.filter_index(df)
+                filters = {}
+                for filter_column in filter_columns:
+                    column_index = index.column(filter_column)
+                    if isinstance(column_index, NumericColumnIndex):
+                        bounds = self.range_widget(df[filter_column], column_index)
+                        if bounds is not None:
+                            filters[filter_column] = bounds
+                    else:
+                        # Counts reflect the filters chosen above (cross-filtering)
+                        counts = column_index.value_counts(index.filter(filters) if filters else None)
+                        unique_values = self.top_values(df, filter_column)
+                        filters[filter_column] = st.multiselect(
+                            f"🎯 Filter {filter_column}:", unique_values, default=unique_values[:5],
+                            format_func=lambda value, counts=counts: f"{value} ({counts.get(value, 0):,})",
+                        )
+                rows = index.filter(filters)
+                st.caption(f"🔎 {rows.count():,} of {len(df):,} rows match.")
+                positions = rows.indices() if filters else None
+                df_filtered = df.iloc[positions] if filters else df
         else:
-            df_filtered = df.copy()  # Keep original data if filtering is not applied
+            positions = None
+            df_filtered = df  # Keep original data if filtering is not applied
 
         ## **📈 Select Column(s) for Visualization**
         col_selection = st.multiselect("🎯 Select columns for visualization:", num_cols + cat_cols, default=[num_cols[0]] if num_cols else [])
@@ -94,6 +177,7 @@ class VisualizationPage:
         plot_type = st.radio("📌 Choose a Plot Type", ["Histogram", "Boxplot", "Scatter", "Line Chart", "Correlation Heatmap", "Bar Chart"])
 
         ## **📌 Handling Different Chart Types**
+        fig = None
         if plot_type == "Histogram":
             fig = px.histogram(df_filtered, x=col_selection[0], title=f"📊 Distribution of {col_selection[0]}", nbins=30, color_discrete_sequence=["#636EFA"])
             fig.update_layout(bargap=0.2)  # Adds spacing between bars
@@ -112,16 +196,34 @@ class VisualizationPage:
                 st.plotly_chart(fig)
 
         elif plot_type == "Line Chart":
-            time_col = st.selectbox("⏳ Select a time column (if applicable):", df_filtered.columns)
-            fig = px.line(df_filtered, x=time_col, y=col_selection[0], title=f"📈 Line Chart of {col_selection[0]} Over Time")
-            st.plotly_chart(fig)
+            datetimes = dataset_datetimes(df)
+            if not datetimes.columns:
+                st.error("⚠️ Line chart requires a date/time column; none was detected.")
+            else:
+                time_col = st.selectbox("⏳ Select a time column:", datetimes.columns)
+                value_col = col_selection[0] if col_selection and col_selection[0] in num_cols else None
+                agg = st.selectbox("🧮 Aggregate per time bucket:", ["mean", "sum", "min", "max", "count"] if value_col else ["count"])
+                times = datetimes.parsed(time_col)
+                times = times if positions is None else times.iloc[positions]
+                values = df_filtered[value_col].to_numpy(dtype="float64", na_value=float("nan")) if value_col else None
+
+                # Aggregate on the server into about one time bucket per pixel of chart width
+                points, freq = resample_for_chart(times, values, max_points=LINE_CHART_POINTS, agg=agg)
+                if freq is None:
+                    st.info(f"No parsable dates in '{time_col}' for the selected rows.")
+                    return
+                label = value_col or "rows"
+                fig = px.line(points, x="time", y="value", labels={"time": time_col, "value": f"{agg} of {label}"},
+                              title=f"📈 {agg.title()} of {label} per {freq} over {time_col}")
+                st.plotly_chart(fig)
+                st.caption(f"{len(df_filtered):,} rows aggregated into {len(points):,} buckets of {freq}.")
 
         elif plot_type == "Correlation Heatmap":
             if len(num_cols) < 2:
                 st.error("⚠️ Not enough numerical columns for correlation heatmap.")
             else:
                 fig, ax = plt.subplots(figsize=(10, 6))
-                sns.heatmap(df_filtered[num_cols].corr(), annot=True, cmap="coolwarm", fmt=".2f", linewidths=0.5, ax=ax)
+                sns.heatmap(CorrelationHandler.correlation_matrix(df_filtered, num_cols), annot=True, cmap="coolwarm", fmt=".2f", linewidths=0.5, ax=ax)
                 st.pyplot(fig)
 
         elif plot_type == "Bar Chart":
@@ -129,7 +231,14 @@ class VisualizationPage:
             st.plotly_chart(fig)
 
         ## **📥 Download Chart Option**
-        # st.markdown("### 💾 Download Chart as PNG")
-        # buf = io.BytesIO()
-        # fig.write_image(buf, format="png")
-        # st.download_button(label="📥 Download Image", data=buf, file_name="visualization.png", mime="image/png")
+        if fig is not None:
+            st.markdown("### 💾 Download Chart as PNG")
+            buf = io.BytesIO()
+            try:
+                if hasattr(fig, "savefig"):
+                    fig.savefig(buf, format="png", bbox_inches="tight")  # matplotlib figure
+                else:
+                    fig.write_image(buf, format="png")  # plotly figure, requires kaleido
+                st.download_button(label="📥 Download Image", data=buf.getvalue(), file_name="visualization.png", mime="image/png")
+            except Exception as e:
+                st.info(f"PNG export is unavailable for this chart: {e}")
@@ -1,6 +1,7 @@
 import pandas as pd
 import hashlib
 import re
+from services.dtypes import is_text_dtype, map_strings
 
 class Anonymization:
     def hash_value(self, value):
@@ -10,7 +11,8 @@ class Anonymization:
     def anonymize_dataframe(self, df):
         """Anonymizes sensitive data such as emails and names"""
         for col in df.columns:
-            if df[col].dtype == 'object':
-                if df[col].str.contains('@').any():  # If it looks like an email
-                    df[col] = df[col].apply(lambda x: self.hash_value(x) if isinstance(x, str) else x)
+            if is_text_dtype(df[col].dtype):
+                if df[col].str.contains('@', regex=False).any():  # If it looks like an email
+                    # Hash each distinct value once; the column keeps its dtype
+                    df[col] = map_strings(df[col], self.hash_value)
         return df
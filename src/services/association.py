@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+from config.settings import ASSOCIATION_SAMPLE_SIZE
+from services.dtypes import TEXT_DTYPES
+from services.sampling import sample_rows
+
+MEASURES = {"cramers_v": "Cramér's V", "nmi": "NMI"}
+# Cells (rows x column pairs) counted per bincount call; bounds the scratch memory
+BATCH_CELLS = 1 << 22
+
+
+class AssociationResult:
+    """Pairwise association matrices (Cramér's V and normalized mutual information)."""
+
+    def __init__(self, columns, cramers_v, nmi, rows):
+        self.columns = list(columns)
+        self.cramers_v = cramers_v
+        self.nmi = nmi
+        self.rows = rows
+
+    def matrix(self, measure="cramers_v"):
+        values = self.cramers_v if measure == "cramers_v" else self.nmi
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def pairs(self):
+        """One row per column pair, strongest Cramér's V first."""
+        upper = np.triu_indices(len(self.columns), k=1)
+        columns = np.asarray(self.columns, dtype=object)
+        pairs = pd.DataFrame({
+            "Column A": columns[upper[0]],
+            "Column B": columns[upper[1]],
+            MEASURES["cramers_v"]: self.cramers_v[upper].round(4),
+            MEASURES["nmi"]: self.nmi[upper].round(4),
+        })
+        return pairs.sort_values(MEASURES["cramers_v"], ascending=False, kind="stable").reset_index(drop=True)
+
+    def redundant_features(self, threshold=0.9, measure="cramers_v"):
+        """Columns strongly associated with an earlier column (same rule as CorrelationHandler)."""
+        return redundant_features(self.matrix(measure), threshold)
+
+
+def redundant_features(matrix, threshold=0.9):
+    upper = matrix.where(np.triu(np.ones(matrix.shape), k=1).astype(bool))
+    return [column for column in upper.columns if any(upper[column] > threshold)]
+
+
+def pairs_to_matrix(pairs, measure="cramers_v"):
+    """Rebuilds the symmetric matrix from ``AssociationResult.pairs()`` (e.g. a stored report)."""
+    columns = pd.Index(pd.unique(pd.concat([pairs["Column A"], pairs["Column B"]], ignore_index=True)))
+    a, b = columns.get_indexer(pairs["Column A"]), columns.get_indexer(pairs["Column B"])
+    values = np.eye(len(columns))
+    values[a, b] = values[b, a] = pairs[MEASURES[measure]].to_numpy(dtype=np.float64)
+    return pd.DataFrame(values, index=columns, columns=columns)
+
+
+class CategoricalAssociation:
+    """
+    Cramér's V and normalized mutual information for every pair of
+    categorical columns.
+
+    Each column is factorized once into integer codes (missing values are a
+    level of their own; rare levels beyond ``max_levels`` are pooled into one
+    "other" level). Contingency tables for one column against a batch of
+    other columns are then counted with a single ``np.bincount`` over offset
+    codes, and both measures are reduced from the flat counts, so no table is
+    ever built pair by pair in Python.
+    """
+
+    def __init__(self, max_levels=50, sample_size=ASSOCIATION_SAMPLE_SIZE, random_state=0):
+        self.max_levels = max_levels
+        self.sample_size = sample_size
+        self.random_state = random_state
+
+    @staticmethod
+    def categorical_columns(df):
+        return df.select_dtypes(include=TEXT_DTYPES + ["bool", "boolean"]).columns.tolist()
+
+    def encode(self, series):
+        """Dense codes 0..k-1 for one column, with missing values and rare levels pooled."""
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        if len(uniques) > self.max_levels:
+            # Keep the most frequent levels; the rest share the last code
+            keep = np.argsort(-counts, kind="stable")[:self.max_levels - 1]
+            remap = np.full(len(uniques), self.max_levels - 1, dtype=np.int32)
+            remap[keep] = np.arange(len(keep), dtype=np.int32)
+            codes = np.where(codes >= 0, remap[np.maximum(codes, 0)], -1)
+        codes = np.where(codes >= 0, codes, codes.max(initial=-1) + 1)
+        # Renumber so the codes are contiguous
+        _, codes = np.unique(codes, return_inverse=True)
+        return codes.astype(np.int32)
+
+    def compute(self, df, columns=None):
+        columns = self.categorical_columns(df) if columns is None else list(columns)
+        if self.sample_size and len(df) > self.sample_size:
+            df = sample_rows(df[columns], self.sample_size, random_state=self.random_state)
+
+        codes = {col: self.encode(df[col]) for col in columns}
+        # Constant columns carry no information about any other column
+        columns = [col for col in columns if len(codes[col]) and codes[col].max() > 0]
+        m, n = len(columns), len(df)
+        cramers_v, nmi = np.eye(m), np.eye(m)
+        if m < 2:
+            return AssociationResult(columns, cramers_v, nmi, n)
+
+        levels = np.array([codes[col].max() + 1 for col in columns])
+        stride = int(levels.max())
+        table = stride * stride
+        marginals = np.zeros((m, stride))
+        for j, col in enumerate(columns):
+            marginals[j, :levels[j]] = np.bincount(codes[col], minlength=levels[j])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            p = marginals / n
+            entropy = -np.where(p > 0, p * np.log(p), 0.0).sum(axis=1)
+
+        # Every table has the same stride x stride shape, so column j's cells can be
+        # pre-shifted into its own table slot once: cell = j * table + a * stride + b
+        batch = max(1, min(m, BATCH_CELLS // max(n, 1), np.iinfo(np.int32).max // table - 1))
+        shifted = np.empty((m, n), dtype=np.int32)
+        for j, col in enumerate(columns):
+            shifted[j] = codes[col] + (j % batch) * table
+
+        for i in range(m - 1):
+            row_cells = codes[columns[i]] * stride
+            start = i + 1
+            while start < m:
+                # Slot numbers restart every `batch` columns, so a batch never wraps around
+                stop = min(m, (start // batch + 1) * batch)
+                first_slot = start % batch
+                cells = shifted[start:stop] + row_cells
+                observed = np.bincount(cells.ravel(), minlength=(first_slot + stop - start) * table)
+                observed = observed[first_slot * table:].reshape(stop - start, stride, stride).astype(np.float64)
+                chi2, mutual_info = self._pair_statistics(observed, marginals[i], marginals[start:stop], n)
+
+                js = np.arange(start, stop)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    v = np.sqrt(chi2 / n / (np.minimum(levels[i], levels[js]) - 1))
+                    normalized = 2 * mutual_info / (entropy[i] + entropy[js])
+                cramers_v[i, js] = cramers_v[js, i] = np.clip(np.nan_to_num(v), 0, 1)
+                nmi[i, js] = nmi[js, i] = np.clip(np.nan_to_num(normalized), 0, 1)
+                start = stop
+
+        return AssociationResult(columns, cramers_v, nmi, n)
+
+    @staticmethod
+    def _pair_statistics(observed, row_totals, col_totals, n):
+        """(chi-square, mutual information) per table of a (pairs, stride, stride) count array."""
+        margins = row_totals[None, :, None] * col_totals[:, None, :]
+        present = observed > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Pearson's chi-square written as n * (sum O^2 / (r c) - 1), since E = r c / n
+            ratio = np.where(present, observed / np.where(present, margins, 1), 0.0)
+            chi2 = n * ((observed * ratio).sum(axis=(1, 2)) - 1)
+            mutual_info = (np.where(present, observed * np.log(np.where(present, ratio * n, 1)), 0.0) / n).sum(axis=(1, 2))
+        return chi2, mutual_info
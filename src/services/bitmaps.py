@@ -0,0 +1,111 @@
+import numpy as np
+
+
+def popcount(words):
+    """Number of set bits in an unsigned integer array."""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+    return int(np.unpackbits(words.view(np.uint8)).sum(dtype=np.int64))
+
+
+def popcount_rows(words):
+    """Set bits per row of a 2-D unsigned integer array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8).reshape(*words.shape[:-1], -1), axis=-1)
+    return bits.sum(axis=-1, dtype=np.int64)
+
+
+class RowBitmap:
+    """
+    Compact row-index bitmap (one bit per row) that can be grown chunk by chunk.
+
+    Bits are stored packed in a uint8 array (little bit order), so a bitmap
+    over 100M rows costs ~12 MB instead of 100 MB for a boolean mask.
+    """
+
+    def __init__(self, packed=None, length=0):
+        self.packed = packed if packed is not None else np.zeros(0, dtype=np.uint8)
+        self.length = int(length)
+
+    @classmethod
+    def from_mask(cls, mask):
+        mask = np.asarray(mask, dtype=bool)
+        return cls(np.packbits(mask, bitorder="little"), len(mask))
+
+    @classmethod
+    def from_indices(cls, indices, length):
+        mask = np.zeros(length, dtype=bool)
+        mask[np.asarray(indices, dtype=np.int64)] = True
+        return cls.from_mask(mask)
+
+    @classmethod
+    def zeros(cls, length):
+        return cls(np.zeros((length + 7) // 8, dtype=np.uint8), length)
+
+    def append(self, mask):
+        """Appends the bits of a boolean chunk mask."""
+        mask = np.asarray(mask, dtype=bool)
+        offset = self.length % 8
+        if offset == 0:
+            self.packed = np.concatenate([self.packed, np.packbits(mask, bitorder="little")])
+        else:
+            # Re-pack the trailing partial byte together with the new bits
+            tail = np.unpackbits(self.packed[-1:], bitorder="little")[:offset].astype(bool)
+            merged = np.packbits(np.concatenate([tail, mask]), bitorder="little")
+            self.packed = np.concatenate([self.packed[:-1], merged])
+        self.length += len(mask)
+        return self
+
+    def to_mask(self):
+        return np.unpackbits(self.packed, count=self.length, bitorder="little").astype(bool)
+
+    def indices(self):
+        """Row positions whose bit is set."""
+        return np.flatnonzero(self.to_mask())
+
+    def count(self):
+        return popcount(self.packed)
+
+    def any(self):
+        return bool(self.packed.any())
+
+    @property
+    def nbytes(self):
+        return self.packed.nbytes
+
+    def _check_compatible(self, other):
+        if self.length != other.length:
+            raise ValueError(f"Bitmap lengths differ: {self.length} != {other.length}")
+
+    def __and__(self, other):
+        self._check_compatible(other)
+        return RowBitmap(np.bitwise_and(self.packed, other.packed), self.length)
+
+    def __or__(self, other):
+        self._check_compatible(other)
+        return RowBitmap(np.bitwise_or(self.packed, other.packed), self.length)
+
+    def __invert__(self):
+        inverted = np.invert(self.packed)
+        if self.length % 8:
+            # Clear the padding bits beyond ``length``
+            inverted[-1] &= np.uint8((1 << (self.length % 8)) - 1)
+        return RowBitmap(inverted, self.length)
+
+    def __len__(self):
+        return self.length
+
+    def __eq__(self, other):
+        return isinstance(other, RowBitmap) and self.length == other.length and np.array_equal(self.packed, other.packed)
+
+    def __repr__(self):
+        return f"RowBitmap(length={self.length}, set={self.count()})"
+
+    def to_bytes(self):
+        return np.int64(self.length).tobytes() + self.packed.tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload):
+        length = int(np.frombuffer(payload[:8], dtype=np.int64)[0])
+        return cls(np.frombuffer(payload[8:], dtype=np.uint8).copy(), length)
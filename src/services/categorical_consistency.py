@@ -0,0 +1,198 @@
+import difflib
+import numpy as np
+import pandas as pd
+from services.dtypes import STRING_DTYPE, TEXT_DTYPES
+from services.near_duplicates import NearDuplicateDetector
+
+# Blocking: MinHash/LSH over character bigrams of each key without its frequent
+# tokens ("inc", "ltd", a shared brand). Keys within the similarity threshold
+# keep at least about a third of their bigrams in common there
+BLOCKING_JACCARD = 0.35
+BLOCKING_PERMUTATIONS = 128
+# Tokens in more than this share of the keys (and at least FREQUENT_TOKEN_MIN keys) are frequent
+FREQUENT_TOKEN_SHARE = 0.01
+FREQUENT_TOKEN_MIN = 50
+
+
+class _UnionFind:
+    """Minimal disjoint-set over integer ids."""
+
+    def __init__(self, size):
+        self.parent = np.arange(size)
+
+    def find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+    def roots(self):
+        return np.array([self.find(i) for i in range(len(self.parent))], dtype=np.int64)
+
+
+class CategoricalConsistencyEngine:
+    """
+    Finds spelling/casing/whitespace variants of the same category.
+
+    All work happens on the factorized unique values of a column, never on
+    its rows: variants are grouped by a normalization key (case, punctuation,
+    whitespace and token order are ignored) and then by approximate string
+    similarity, comparing only keys whose character bigrams overlap.
+    """
+
+    def __init__(self, similarity_threshold=0.85, blocking_jaccard=BLOCKING_JACCARD):
+        self.similarity_threshold = similarity_threshold
+        self.blocking_jaccard = blocking_jaccard
+
+    @staticmethod
+    def normalization_keys(uniques):
+        """Vectorized fingerprint of each unique value; None for non-string values."""
+        values = pd.Series(uniques, dtype=object)
+        is_text = values.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+
+        keys = pd.Series([None] * len(values), dtype=object)
+        if is_text.any():
+            text = values[is_text].astype(STRING_DTYPE)
+            # RE2 (Arrow) syntax: anything but Unicode letters and digits, like [\W_] in Python
+            text = text.str.lower().str.replace(r"[^\p{L}\p{N}]+", " ", regex=True).str.strip()
+            keys[is_text] = text.str.split().map(lambda tokens: " ".join(sorted(set(tokens)))).to_numpy()
+        return keys
+
+    @staticmethod
+    def blocking_text(keys):
+        """Keys without their frequent tokens; keys made only of frequent tokens stay whole."""
+        tokens = keys.str.split().explode()
+        counts = tokens.value_counts()
+        frequent = set(counts[counts > max(FREQUENT_TOKEN_MIN, FREQUENT_TOKEN_SHARE * len(keys))].index)
+        if not frequent:
+            return keys
+        return keys.map(lambda key: " ".join(token for token in key.split() if token not in frequent) or key)
+
+    def _blocked_pairs(self, keys, text):
+        """
+        Candidate (i, j) pairs of distinct keys. MinHash/LSH (see
+        NearDuplicateDetector) over the bigrams of ``text`` (their
+        ``blocking_text``) proposes
+        pairs, so shared prefixes or suffixes do not make every key a
+        candidate of every other; pairs with an exact bigram Jaccard of at
+        least ``blocking_jaccard`` and the same digit content are kept. Work
+        grows with the number of keys, and IDs or codes that differ only in
+        digits are never compared.
+        """
+        detector = NearDuplicateDetector(threshold=self.blocking_jaccard, num_perm=BLOCKING_PERMUTATIONS, shingle_size=2)
+        values, counts = detector.shingles(np.asarray(text, dtype=object))
+        signatures = detector.signatures(values, counts)
+        pairs = detector.candidate_pairs(signatures, counts > 0)
+        # Signature estimates far below the threshold skip the exact check (as in NearDuplicateDetector.detect)
+        margin = 2 * np.sqrt(self.blocking_jaccard * (1 - self.blocking_jaccard) / detector.num_perm)
+        pairs = pairs[detector.estimate(signatures, pairs) >= self.blocking_jaccard - margin]
+        pairs = pairs[detector.jaccard(values, counts, pairs) >= self.blocking_jaccard]
+        digits = keys.astype(STRING_DTYPE).str.replace(r"\D+", "", regex=True).to_numpy(dtype=object)
+        return pairs[digits[pairs[:, 0]] == digits[pairs[:, 1]]]
+
+    def _similar(self, a, b):
+        matcher = difflib.SequenceMatcher(None, a, b)
+        return (
+            matcher.real_quick_ratio() >= self.similarity_threshold
+            and matcher.quick_ratio() >= self.similarity_threshold
+            and matcher.ratio() >= self.similarity_threshold
+        )
+
+    def analyze_column(self, series):
+        """
+        Returns a dict with the factorized column and a variant mapping:
+
+        - ``codes`` / ``uniques``: the output of ``pd.factorize``
+        - ``mapping``: for each unique, the index of its canonical unique
+        - ``groups``: {canonical value: [variants]} for groups with more than one variant
+        """
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        mapping = np.arange(len(uniques))
+
+        keys = self.normalization_keys(uniques)
+        has_key = keys.notna().to_numpy()
+        if has_key.sum() < 2:
+            return {"codes": codes, "uniques": uniques, "mapping": mapping, "groups": {}}
+
+        # Stage 1: identical normalization keys
+        key_codes, key_uniques = pd.factorize(keys[has_key])
+        key_uniques = pd.Series(key_uniques, dtype=object)
+
+        # Stage 2: approximate similarity between distinct keys, inside blocks only.
+        # Both the whole keys and their distinctive text must be similar, so a
+        # shared "acme ... inc" does not make unrelated names look alike
+        forest = _UnionFind(len(key_uniques))
+        if self.similarity_threshold < 1:
+            text = self.blocking_text(key_uniques)
+            key_text, distinctive = key_uniques.tolist(), text.tolist()
+            for i, j in self._blocked_pairs(key_uniques, text):
+                if (
+                    forest.find(i) != forest.find(j)
+                    and self._similar(key_text[i], key_text[j])
+                    and self._similar(distinctive[i], distinctive[j])
+                ):
+                    forest.union(i, j)
+        group_of_key = forest.roots()
+
+        group = np.full(len(uniques), -1, dtype=np.int64)
+        group[has_key] = group_of_key[key_codes]
+
+        # The most frequent unique of each group becomes its canonical value
+        keyed = np.flatnonzero(has_key)
+        order = keyed[np.lexsort((-counts[keyed], group[keyed]))]
+        group_sorted = group[order]
+        first = np.r_[True, group_sorted[1:] != group_sorted[:-1]]
+        canonical_of_group = np.empty(group_sorted.max() + 1, dtype=np.int64)
+        canonical_of_group[group_sorted[first]] = order[first]
+        mapping[keyed] = canonical_of_group[group[keyed]]
+
+        groups = {}
+        starts = np.flatnonzero(first)
+        ends = np.r_[starts[1:], len(order)]
+        for start, end in zip(starts, ends):
+            if end - start > 1:
+                members = order[start:end]
+                groups[uniques[members[0]]] = [uniques[m] for m in members]
+
+        return {"codes": codes, "uniques": uniques, "mapping": mapping, "groups": groups}
+
+    @staticmethod
+    def apply_mapping(result):
+        """Rebuilds the column with every variant replaced by its canonical value in one take."""
+        # Taking from the uniques' array keeps their dtype (e.g. string[pyarrow])
+        canonical = pd.Index(result["uniques"]).array.take(result["mapping"])
+        return canonical.take(result["codes"], allow_fill=True)
+
+    def normalize_column(self, series, result=None):
+        """
+        Returns ``series`` with its category variants merged; ``result`` (from
+        ``analyze_column`` on the same series) saves analyzing it again.
+        """
+        result = self.analyze_column(series) if result is None else result
+        return pd.Series(self.apply_mapping(result), index=series.index, name=series.name, dtype=series.dtype)
+
+    def analyze_dataframe(self, df, columns=None, progress_callback=None):
+        """Returns {column: analyze_column result} for columns with inconsistent variants."""
+        if columns is None:
+            columns = df.select_dtypes(include=TEXT_DTYPES).columns
+        columns = list(columns)
+        results = {}
+        for i, col in enumerate(columns):
+            if progress_callback is not None:
+                progress_callback(f"Checking '{col}'", i / len(columns))
+            result = self.analyze_column(df[col])
+            if result["groups"]:
+                results[col] = result
+        return results
+
+    def check_dataframe(self, df, columns=None):
+        """Returns {column: {canonical: [variants]}} for columns with inconsistent variants."""
+        return {col: result["groups"] for col, result in self.analyze_dataframe(df, columns).items()}
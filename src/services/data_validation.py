@@ -1,18 +1,125 @@
 import pandas as pd
+from config.settings import ARROW_STRINGS
+from domain.data_file import DataFile
+from domain.validation_rules import RuleSet
+from services.bitmaps import RowBitmap
+from services.dtypes import to_arrow_dtypes
 
 class FileValidation:
     def validate_file_format(self, uploaded_file):
         """Validates and reads the uploaded file format"""
+        return self._read(uploaded_file, DataFile.from_upload(uploaded_file).format)
+
+    def read_file(self, data_file, arrow_strings=ARROW_STRINGS, **read_kwargs):
+        """
+        Reads a DataFile from its path on disk. CSVs are parsed from a
+        memory-mapped file (or by Arrow's reader, which streams the file), so no
+        extra in-memory copy of the raw bytes is made. With ``arrow_strings`` (and no custom read options) CSVs go through the
+        Arrow parser, text columns become ``string[pyarrow]`` and integer/boolean
+        columns with gaps become nullable dtypes.
+        """
+        df = None
+        if arrow_strings and data_file.format == "csv" and not read_kwargs:
+            df = self._read_arrow_csv(data_file.path)
+        if df is None:
+            if data_file.format == "csv":
+                read_kwargs.setdefault("memory_map", True)
+            df = self._read(data_file.path, data_file.format, **read_kwargs)
+        if df is not None and arrow_strings:
+            df = to_arrow_dtypes(df)
+        return df
+
+    @staticmethod
+    def _read_arrow_csv(path):
+        """
+        Parses a CSV with Arrow's multi-threaded reader; text columns stay in
+        Arrow buffers instead of becoming one Python str per cell. Returns
+        None when Arrow rejects the file (e.g. ragged rows), so the caller
+        can fall back to the C parser.
+        """
+        try:
+            with pd.option_context("mode.string_storage", "pyarrow"):
+                return pd.read_csv(path, engine="pyarrow", dtype_backend="numpy_nullable")
+        except Exception:
+            return None
+
+    @staticmethod
+    def _read(source, file_format, **read_kwargs):
         try:
-            if uploaded_file.name.endswith(".csv"):
-                df = pd.read_csv(uploaded_file)
-            elif uploaded_file.name.endswith((".xls", ".xlsx")):
-                df = pd.read_excel(uploaded_file)
-            elif uploaded_file.name.endswith(".json"):
-                df = pd.read_json(uploaded_file)
+            if file_format == "csv":
+                df = pd.read_csv(source, **read_kwargs)
+            elif file_format == "excel":
+                df = pd.read_excel(source, **read_kwargs)
+            elif file_format == "json":
+                df = pd.read_json(source, **read_kwargs)
+            elif file_format == "jsonl":
+                df = pd.read_json(source, lines=True, **read_kwargs)
             else:
                 return None
             
             return df
         except Exception:
             return None
+
+
+class ValidationReport:
+    """Per-rule violation counts and packed row bitmaps for one validated stream."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.bitmaps = {rule.name: RowBitmap() for rule in self.rules}
+        self.total_rows = 0
+
+    def add_chunk(self, chunk_masks, n_rows):
+        for name, mask in chunk_masks.items():
+            self.bitmaps[name].append(mask)
+        self.total_rows += n_rows
+
+    def violation_counts(self):
+        return {name: bitmap.count() for name, bitmap in self.bitmaps.items()}
+
+    def failing_rows(self):
+        """Bitmap of rows violating at least one rule."""
+        combined = RowBitmap.zeros(self.total_rows)
+        for bitmap in self.bitmaps.values():
+            combined = combined | bitmap
+        return combined
+
+    @property
+    def is_valid(self):
+        return not any(bitmap.any() for bitmap in self.bitmaps.values())
+
+    def summary(self):
+        rows = []
+        for rule in self.rules:
+            count = self.bitmaps[rule.name].count()
+            rows.append({
+                "Rule": rule.name,
+                "Type": rule.kind,
+                "Column": rule.column,
+                "Violations": count,
+                "Percentage": (count / self.total_rows) * 100 if self.total_rows else 0.0,
+            })
+        return pd.DataFrame(rows, columns=["Rule", "Type", "Column", "Violations", "Percentage"])
+
+
+class RuleValidator:
+    """Runs a compiled RuleSet chunk by chunk over a DataFrame or a stream of chunks."""
+
+    def __init__(self, rule_set):
+        if isinstance(rule_set, dict):
+            rule_set = RuleSet.from_dict(rule_set)
+        self.rule_set = rule_set
+
+    def validate_chunks(self, chunks):
+        self.rule_set.reset()
+        report = ValidationReport(self.rule_set)
+        for chunk in chunks:
+            masks = {rule.name: rule.violations(chunk) for rule in self.rule_set}
+            report.add_chunk(masks, len(chunk))
+        return report
+
+    def validate(self, df, chunksize=None):
+        if chunksize is None:
+            return self.validate_chunks([df])
+        return self.validate_chunks(df.iloc[start:start + chunksize] for start in range(0, len(df), chunksize))
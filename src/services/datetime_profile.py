@@ -0,0 +1,196 @@
+import re
+import threading
+import warnings
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+from services.dtypes import STRING_DTYPE, TEXT_DTYPES
+
+# A text column is a datetime column when this share of its sampled values parses
+MIN_PARSED_FRACTION = 0.95
+# Steps longer than GAP_FACTOR x the typical step count as gaps
+GAP_FACTOR = 1.5
+# A column has a fixed frequency when this share of its steps equals the typical step
+REGULAR_FRACTION = 0.9
+# strptime directives Arrow parses exactly like pandas; other formats are parsed by pandas
+ARROW_DIRECTIVES = set("YymdHMSbB")
+# Bucket widths for chart resampling, finest first
+BUCKET_FREQUENCIES = ["1s", "5s", "15s", "1min", "5min", "15min", "30min", "1h", "3h", "6h", "12h",
+                      "1D", "7D", "1MS", "3MS", "1YS"]
+
+
+def _candidate_formats(values):
+    """Formats guessed from a few sampled strings, month-first and day-first."""
+    candidates = []
+    for value in values[:20]:
+        for dayfirst in (False, True):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)  # "Parsing dates in ... format when dayfirst=..."
+                fmt = guess_datetime_format(value, dayfirst=dayfirst)
+            # A bare year or a time of day is more likely a number or a duration
+            if fmt and "%Y" in fmt.replace("%y", "%Y") and any(f in fmt for f in ("%m", "%b", "%B", "%d")) \
+                    and fmt not in candidates:
+                candidates.append(fmt)
+    return candidates
+
+
+def parse_datetimes(series, fmt):
+    """
+    Vectorized parse with one ``strftime`` format; non-matching values become NaT.
+    Simple formats go through Arrow's strptime kernel, which is much faster
+    than pandas' for non-ISO formats. Explicit UTC offsets are normalized to UTC.
+    """
+    if set(re.findall(r"%(.)", fmt)) <= ARROW_DIRECTIVES:
+        import pyarrow as pa  # pyarrow is imported on demand
+        import pyarrow.compute as pc
+
+        values = pc.utf8_trim_whitespace(pa.array(series.astype(STRING_DTYPE)))
+        parsed = pc.strptime(values, format=fmt, unit="ns", error_is_null=True)
+        return pd.Series(parsed.to_numpy(zero_copy_only=False), index=series.index, name=series.name)
+    return pd.to_datetime(series.astype(str).str.strip(), format=fmt, errors="coerce", utc="%z" in fmt).where(series.notna())
+
+
+def detect_datetime_formats(df, sample_size=1_000, random_state=0):
+    """
+    {column: format} for text columns whose sampled values parse as dates with
+    one inferred ``strftime`` format, plus native datetime columns (format None).
+    """
+    formats = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            formats[col] = None
+            continue
+        if str(series.dtype) not in TEXT_DTYPES and not isinstance(series.dtype, pd.StringDtype):
+            continue
+
+        values = series.dropna()
+        if values.empty:
+            continue
+        if len(values) > sample_size:
+            values = values.sample(sample_size, random_state=random_state)
+        values = values.astype(str).str.strip()
+        best, best_fraction = None, 0.0
+        for fmt in _candidate_formats(values.tolist()):
+            fraction = parse_datetimes(values, fmt).notna().mean()
+            if fraction > best_fraction:
+                best, best_fraction = fmt, fraction
+        if best is not None and best_fraction >= MIN_PARSED_FRACTION:
+            formats[col] = best
+    return formats
+
+
+class DatetimeColumns:
+    """
+    Detected datetime columns of one dataset. Each column is parsed at most
+    once, in a single vectorized ``to_datetime`` call with its inferred
+    format; values that do not match the format become NaT.
+    """
+
+    def __init__(self, df, formats):
+        self.df = df
+        self.formats = formats
+        self._parsed = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def detect(cls, df, sample_size=1_000):
+        return cls(df, detect_datetime_formats(df, sample_size=sample_size))
+
+    @property
+    def columns(self):
+        return list(self.formats)
+
+    def __contains__(self, column):
+        return column in self.formats
+
+    def parsed(self, column):
+        with self._lock:
+            if column not in self._parsed:
+                series = self.df[column]
+                fmt = self.formats[column]
+                if fmt is not None:
+                    series = parse_datetimes(series, fmt)
+                self._parsed[column] = series
+            return self._parsed[column]
+
+
+def _frequency(unique, steps, typical, tz):
+    """Offset alias of the typical step when most steps equal it; calendar frequencies via ``infer_freq``."""
+    if np.mean(steps == typical) >= REGULAR_FRACTION:
+        return pd.tseries.frequencies.to_offset(pd.Timedelta(int(typical))).freqstr
+    return pd.infer_freq(pd.DatetimeIndex(unique[:1_000], tz=tz)) or f"irregular (~{pd.Timedelta(int(typical))})"
+
+
+def profile_datetimes(datetimes):
+    """Per-column time range, typical frequency and gaps (steps much longer than the typical one)."""
+    rows = []
+    for col in datetimes.columns:
+        series = datetimes.parsed(col)
+        valid = series.notna()
+        index = pd.DatetimeIndex(series[valid]).as_unit("ns")
+        # Sort + dedupe; much faster than np.unique's hashing on millions of timestamps
+        unique = np.sort(index.asi8)
+        unique = unique[np.concatenate([[True], unique[1:] != unique[:-1]])] if len(unique) else unique
+        row = {
+            "Column": col,
+            "Format": datetimes.formats[col] or "native",
+            "Parsed": int(valid.sum()),
+            "Unparsed": int(datetimes.df[col].notna().sum() - valid.sum()),
+            "Start": None, "End": None, "Span": None, "Frequency": None,
+            "Gaps": 0, "Largest Gap": None, "Largest Gap Start": None,
+        }
+        if len(unique):
+            row["Start"], row["End"] = pd.Timestamp(unique[0], tz=index.tz), pd.Timestamp(unique[-1], tz=index.tz)
+            row["Span"] = row["End"] - row["Start"]
+        if len(unique) > 2:
+            steps = np.diff(unique)
+            typical = np.median(steps)
+            row["Frequency"] = _frequency(unique, steps, typical, index.tz)
+            gaps = np.flatnonzero(steps > GAP_FACTOR * typical)
+            row["Gaps"] = int(len(gaps))
+            if len(gaps):
+                largest = gaps[np.argmax(steps[gaps])]
+                row["Largest Gap"] = pd.Timedelta(int(steps[largest]))
+                row["Largest Gap Start"] = pd.Timestamp(unique[largest], tz=index.tz)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def bucket_frequency(start, end, max_points):
+    """Finest standard bucket width that keeps ``[start, end]`` within ``max_points`` buckets."""
+    span = pd.Timestamp(end) - pd.Timestamp(start)
+    for freq in BUCKET_FREQUENCIES:
+        offset = pd.tseries.frequencies.to_offset(freq)
+        if freq.endswith("MS"):
+            width = pd.Timedelta(days=31 * offset.n)
+        elif freq.endswith("YS"):
+            width = pd.Timedelta(days=366 * offset.n)
+        else:
+            width = pd.Timedelta(offset)
+        if span / width < max_points:
+            return freq
+    return BUCKET_FREQUENCIES[-1]
+
+
+def resample_for_chart(times, values=None, max_points=1_000, agg="mean"):
+    """
+    Aggregates ``values`` into time buckets so a line chart gets at most about
+    ``max_points`` points, however many rows there are. Without values the
+    rows per bucket are counted. Returns (frame with "time" and "value", bucket width).
+    """
+    index = pd.DatetimeIndex(times)
+    if values is None:
+        values, agg = np.ones(len(index)), "count"
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~index.isna()
+    index, values = index[valid], values[valid]
+    if len(index) == 0:
+        return pd.DataFrame({"time": index, "value": values}), None
+
+    freq = bucket_frequency(index.min(), index.max(), max_points)
+    resampler = pd.Series(values, index=index).resample(freq)
+    buckets = resampler.agg(agg)
+    # Empty buckets become NaN so the line breaks at gaps instead of bridging them
+    buckets = buckets.where(resampler.size() > 0)
+    return buckets.rename_axis("time").reset_index(name="value"), freq
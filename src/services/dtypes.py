@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+# Arrow-backed strings: one contiguous UTF-8 buffer per column instead of a
+# Python str object per cell, with str methods running in Arrow compute kernels
+STRING_DTYPE = pd.StringDtype("pyarrow")
+
+# select_dtypes() selectors for text-like columns (object, any StringDtype, category)
+TEXT_DTYPES = ["object", "string", "category"]
+
+
+def is_text_dtype(dtype):
+    """True for object columns and StringDtype columns (python or pyarrow storage)."""
+    return dtype == object or isinstance(dtype, pd.StringDtype)
+
+
+def text_columns(df):
+    """Names of the object/string columns of ``df``."""
+    return [col for col in df.columns if is_text_dtype(df[col].dtype)]
+
+
+def arrow_dtype(series):
+    """
+    The dtype ``series`` should be stored as in Arrow mode, or None to keep
+    its current dtype:
+
+    - all-string columns -> ``string[pyarrow]``
+    - all-boolean object columns (booleans plus missing) -> ``boolean``
+    - floats holding only whole numbers plus missing values -> ``Int64``
+    - other nullable floats -> float64, and nullable integers/booleans
+      without missing values -> their NumPy dtype
+
+    NaN already marks missing floats, so floats stay NumPy-backed for the
+    numeric libraries; object columns mixing strings with other types stay object.
+    """
+    dtype = series.dtype
+    if dtype == object:
+        inferred = pd.api.types.infer_dtype(series, skipna=True)
+        if inferred == "string":
+            return STRING_DTYPE
+        if inferred == "boolean":
+            return "boolean"
+        return None
+    if isinstance(dtype, pd.StringDtype):
+        return None if dtype == STRING_DTYPE else STRING_DTYPE
+
+    is_extension = isinstance(dtype, pd.api.extensions.ExtensionDtype)
+    if pd.api.types.is_float_dtype(dtype):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = values[~np.isnan(values)]
+        if 0 < len(valid) < len(values) and np.all(np.abs(valid) < 2 ** 53) and np.all(valid == np.round(valid)):
+            return "Int64"
+        return np.float64 if is_extension else None
+    if is_extension and (pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)) and not series.hasnans:
+        return dtype.numpy_dtype
+    return None
+
+
+def to_arrow_dtypes(df):
+    """
+    Converts ``df`` to Arrow strings and nullable dtypes (see ``arrow_dtype``).
+    Columns are replaced one at a time, in place, so peak memory stays close
+    to the frame plus one column; returns ``df``.
+    """
+    for i in range(df.shape[1]):
+        dtype = arrow_dtype(df.iloc[:, i])
+        if dtype is not None:
+            df.isetitem(i, df.iloc[:, i].astype(dtype))
+    return df
+
+
+def replace_pattern(series, pattern, replacement):
+    """Regex substitution that keeps the column's dtype (Arrow kernels for StringDtype)."""
+    if isinstance(series.dtype, pd.StringDtype):
+        return series.str.replace(pattern, replacement, regex=True)
+    return series.replace(to_replace=pattern, value=replacement, regex=True)
+
+
+def map_strings(series, func):
+    """
+    Applies ``func`` to each distinct string of ``series`` once and rebuilds
+    the column with a take; non-string values and missing values are kept.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    mapped = np.array([func(v) if isinstance(v, str) else v for v in np.asarray(uniques, dtype=object)], dtype=object)
+    result = pd.Series(pd.api.extensions.take(mapped, codes, allow_fill=True), index=series.index, name=series.name)
+    return result.astype(series.dtype) if isinstance(series.dtype, pd.StringDtype) else result
+
+def constant_like(series, value):
+    """A column filled with ``value`` that keeps ``series``' string dtype."""
+    dtype = series.dtype if isinstance(series.dtype, pd.StringDtype) else None
+    return pd.Series(value, index=series.index, name=series.name, dtype=dtype)
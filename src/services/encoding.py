@@ -0,0 +1,227 @@
+import json
+import numpy as np
+import pandas as pd
+from services.dtypes import TEXT_DTYPES
+
+
+class CategoricalEncoder:
+    """
+    Fit-once / apply-many encoding of categorical columns for ML models.
+
+    - ``onehot``: one indicator feature per fitted category, returned as a
+      SciPy CSR matrix (or sparse DataFrame columns) built straight from the
+      factorized codes, so high-cardinality columns never become dense
+    - ``ordinal``: the category's position in the fitted map
+    - ``frequency``: the category's share of the fitted rows
+    - ``hashed``: the hashing trick into ``n_hash_features`` shared buckets;
+      buckets do not depend on the fitted map, so unseen values still land in one
+
+    Category maps are accumulated chunk by chunk and keep first-seen order,
+    so codes never change as more chunks are fitted. Missing values encode as
+    an all-zero one-hot row, ordinal -1 and frequency 0; unseen categories are
+    treated the same way unless ``handle_unknown="error"``.
+    """
+
+    METHODS = ("onehot", "ordinal", "frequency", "hashed")
+    SPARSE_METHODS = ("onehot", "hashed")
+
+    def __init__(self, method="onehot", columns=None, handle_unknown="ignore", n_hash_features=1024):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown encoding method '{method}'. Use one of {self.METHODS}")
+        if handle_unknown not in ("ignore", "error"):
+            raise ValueError("handle_unknown must be 'ignore' or 'error'")
+
+        self.method = method
+        self.columns = list(columns) if columns is not None else None
+        self.handle_unknown = handle_unknown
+        self.n_hash_features = int(n_hash_features)
+        self.categories_ = None
+        self.counts_ = None
+
+    @property
+    def is_fitted(self):
+        return self.categories_ is not None
+
+    def _resolve_columns(self, df):
+        if self.columns is None:
+            self.columns = df.select_dtypes(include=TEXT_DTYPES).columns.tolist()
+        missing = [col for col in self.columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Columns not found in data: {missing}")
+        return self.columns
+
+    def partial_fit(self, chunk):
+        """Adds the categories (and their counts) of one chunk to the fitted maps."""
+        columns = self._resolve_columns(chunk)
+        if not self.is_fitted:
+            self.categories_ = {col: pd.Index([], dtype=object) for col in columns}
+            self.counts_ = {col: np.zeros(0, dtype=np.int64) for col in columns}
+
+        for col in columns:
+            codes, uniques = pd.factorize(chunk[col], use_na_sentinel=True)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            positions = self.categories_[col].get_indexer(uniques)
+            known = positions >= 0
+            self.counts_[col][positions[known]] += counts[known]
+            self.categories_[col] = self.categories_[col].append(pd.Index(uniques[~known], dtype=object))
+            self.counts_[col] = np.concatenate([self.counts_[col], counts[~known]])
+        return self
+
+    def fit(self, df):
+        """Fits the category maps on a single in-memory DataFrame."""
+        self.categories_ = None
+        return self.partial_fit(df)
+
+    def fit_chunks(self, chunks):
+        """Fits the category maps on an iterable of DataFrame chunks."""
+        self.categories_ = None
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        if not self.is_fitted:
+            raise ValueError("Cannot fit encoder on an empty stream")
+        return self
+
+    def _check_fitted(self):
+        if not self.is_fitted:
+            raise ValueError("CategoricalEncoder must be fitted before transform")
+
+    def codes(self, series, col):
+        """Fitted category codes of ``series``; -1 for missing and unseen values."""
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        # Map each distinct value once, then broadcast with the row codes
+        mapped = self.categories_[col].get_indexer(uniques)
+        if self.handle_unknown == "error" and (mapped < 0).any():
+            unseen = list(uniques[mapped < 0][:5])
+            raise ValueError(f"Unseen categories in column '{col}': {unseen}")
+        return np.append(mapped, -1)[codes].astype(np.int64)
+
+    @property
+    def n_features_(self):
+        if self.method == "hashed":
+            return self.n_hash_features
+        if self.method == "onehot":
+            return sum(len(self.categories_[col]) for col in self.columns)
+        return len(self.columns)
+
+    def feature_names(self):
+        if self.method == "hashed":
+            return [f"hash_{i}" for i in range(self.n_hash_features)]
+        if self.method == "onehot":
+            return [f"{col}_{value}" for col in self.columns for value in self.categories_[col]]
+        return [str(col) for col in self.columns]
+
+    def _hashed_buckets(self, series, col):
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        # Salting with the column name keeps equal values in different columns apart
+        salt = pd.util.hash_array(np.array([str(col)], dtype=object))[0]
+        hashes = pd.util.hash_array(np.asarray(uniques, dtype=object).astype(str)) ^ salt
+        buckets = (hashes % np.uint64(self.n_hash_features)).astype(np.int64)
+        return np.append(buckets, -1)[codes]
+
+    def transform_sparse(self, df, dtype=np.float32):
+        """
+        Encodes the fitted columns of ``df`` into a SciPy CSR matrix
+        (rows x ``n_features_``), one stored entry per encoded non-missing value.
+        """
+        if self.method not in self.SPARSE_METHODS:
+            raise ValueError(f"Sparse output is available for {self.SPARSE_METHODS}, not '{self.method}'")
+        from scipy import sparse  # SciPy is imported on demand
+
+        self._check_fitted()
+        columns = self._resolve_columns(df)
+        if not columns:
+            return sparse.csr_matrix((len(df), self.n_features_), dtype=dtype)
+
+        offsets = np.cumsum([0] + [len(self.categories_[col]) for col in columns])
+        feature_columns = np.empty((len(df), len(columns)), dtype=np.int64)
+        for i, col in enumerate(columns):
+            if self.method == "hashed":
+                feature_columns[:, i] = self._hashed_buckets(df[col], col)
+            else:
+                codes = self.codes(df[col], col)
+                feature_columns[:, i] = np.where(codes >= 0, codes + offsets[i], -1)
+
+        # Row-major CSR layout: each row keeps its valid entries in column order
+        valid = feature_columns >= 0
+        indptr = np.concatenate([[0], np.cumsum(valid.sum(axis=1))])
+        matrix = sparse.csr_matrix(
+            (np.ones(int(indptr[-1]), dtype=dtype), feature_columns[valid], indptr),
+            shape=(len(df), self.n_features_),
+        )
+        if self.method == "hashed":
+            matrix.sum_duplicates()  # values from several columns may share a bucket
+        return matrix
+
+    def transform(self, df, inplace=False, dtype=np.float32):
+        """
+        Replaces the fitted columns of ``df`` with their encoding. Ordinal and
+        frequency features take the place of the original columns; one-hot and
+        hashed features are appended as sparse columns, always in a new
+        DataFrame (``inplace`` only applies to ordinal and frequency).
+        """
+        self._check_fitted()
+        columns = self._resolve_columns(df)
+
+        if self.method in self.SPARSE_METHODS:
+            matrix = self.transform_sparse(df, dtype=dtype)
+            encoded = pd.DataFrame.sparse.from_spmatrix(matrix.tocsc(), index=df.index, columns=self.feature_names())
+            # A single concat; inserting thousands of columns one by one is quadratic
+            return pd.concat([df.drop(columns=columns), encoded], axis=1)
+
+        target = df if inplace else df.copy(deep=False)
+        for col in columns:
+            codes = self.codes(df[col], col)
+            if self.method == "ordinal":
+                target[col] = codes
+            else:
+                counts = self.counts_[col]
+                frequencies = np.append(counts / max(counts.sum(), 1), 0.0).astype(dtype)
+                target[col] = frequencies[codes]
+        return target
+
+    def transform_chunks(self, chunks, dtype=np.float32):
+        """Lazily encodes each chunk of a stream with the same fitted maps."""
+        for chunk in chunks:
+            yield self.transform(chunk, dtype=dtype)
+
+    def fit_transform(self, df, inplace=False, dtype=np.float32):
+        return self.fit(df).transform(df, inplace=inplace, dtype=dtype)
+
+    def to_dict(self):
+        """Returns the fitted category maps as a JSON-serializable dict."""
+        if not self.is_fitted:
+            raise ValueError("CategoricalEncoder must be fitted before it can be serialized")
+
+        return {
+            "method": self.method,
+            "columns": [str(col) for col in self.columns],
+            "handle_unknown": self.handle_unknown,
+            "n_hash_features": self.n_hash_features,
+            "categories": [self.categories_[col].tolist() for col in self.columns],
+            "counts": [self.counts_[col].tolist() for col in self.columns],
+        }
+
+    @classmethod
+    def from_dict(cls, params):
+        encoder = cls(method=params["method"], columns=params["columns"],
+                      handle_unknown=params["handle_unknown"], n_hash_features=params["n_hash_features"])
+        encoder.categories_ = {col: pd.Index(values, dtype=object) for col, values in zip(encoder.columns, params["categories"])}
+        encoder.counts_ = {col: np.asarray(counts, dtype=np.int64) for col, counts in zip(encoder.columns, params["counts"])}
+        return encoder
+
+    def to_json(self):
+        # Non-JSON category values (e.g. timestamps) are stored as strings
+        return json.dumps(self.to_dict(), default=str)
+
+    @classmethod
+    def from_json(cls, payload):
+        return cls.from_dict(json.loads(payload))
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, default=str)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
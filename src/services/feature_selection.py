@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import IncrementalPCA
+from sklearn.utils.extmath import randomized_svd
+from services.quality_analysis import DataTypeHandler
+
+
+class PCAFeatureReducer:
+    """
+    PCA-based feature reduction for numerical columns.
+
+    In-memory frames are decomposed with randomized SVD; streams of chunks
+    (e.g. from ChunkedFileLoader) are fitted with incremental PCA.
+    """
+
+    def __init__(self, n_components=None, columns=None, max_components=50, random_state=0):
+        self.n_components = n_components
+        self.columns = list(columns) if columns is not None else None
+        self.max_components = max_components
+        self.random_state = random_state
+        self.solver_ = None
+        self.n_samples_ = 0
+        self.mean_ = None
+        self.components_ = None
+        self.explained_variance_ = None
+        self.explained_variance_ratio_ = None
+
+    def _resolve_columns(self, df):
+        if self.columns is None:
+            numerical_cols, _ = DataTypeHandler.separate_columns(df)
+            self.columns = numerical_cols
+        if len(self.columns) < 2:
+            raise ValueError("PCA needs at least two numerical columns")
+        return self.columns
+
+    def _n_components_for(self, n_samples, n_features):
+        limit = min(n_samples, n_features)
+        if self.n_components is None:
+            return min(limit, self.max_components)
+        return min(self.n_components, limit)
+
+    def _to_block(self, df, fill_values=None):
+        """Copies the selected columns once into a float64 block and fills NaNs in place."""
+        block = df[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        nan_rows, nan_cols = np.nonzero(np.isnan(block))
+        if nan_rows.size:
+            if fill_values is None:
+                with np.errstate(invalid="ignore"):
+                    fill_values = np.nan_to_num(np.nanmean(block, axis=0))
+            block[nan_rows, nan_cols] = fill_values[nan_cols]
+        return block
+
+    def fit(self, df):
+        """Fits PCA on an in-memory DataFrame using randomized SVD."""
+        self._resolve_columns(df)
+        block = self._to_block(df)
+        n_samples, n_features = block.shape
+        if n_samples < 2:
+            raise ValueError("PCA needs at least two rows")
+
+        self.mean_ = block.mean(axis=0)
+        block -= self.mean_  # center in place, no second copy
+
+        k = self._n_components_for(n_samples, n_features)
+        _, singular_values, components = randomized_svd(block, n_components=k, random_state=self.random_state)
+
+        total_variance = np.einsum("ij,ij->j", block, block).sum() / (n_samples - 1)
+        self.components_ = components
+        self.explained_variance_ = singular_values ** 2 / (n_samples - 1)
+        self.explained_variance_ratio_ = self.explained_variance_ / total_variance if total_variance > 0 else np.zeros(k)
+        self.n_samples_ = n_samples
+        self.solver_ = "randomized"
+        return self
+
+    def fit_chunks(self, chunks):
+        """
+        Fits PCA incrementally on an iterable of DataFrame chunks.
+        Chunks smaller than the number of components are buffered together,
+        and the last batch is held back so a short tail is merged into it.
+        """
+        ipca = None
+        ready = None
+        pending = []
+        pending_rows = 0
+
+        for chunk in chunks:
+            if ipca is None:
+                self._resolve_columns(chunk)
+                k = min(self.n_components or self.max_components, len(self.columns))
+                ipca = IncrementalPCA(n_components=k)
+
+            # After the first batch, missing values are filled with the running means
+            fill_values = getattr(ipca, "mean_", None)
+            pending.append(self._to_block(chunk, fill_values))
+            pending_rows += len(chunk)
+
+            if pending_rows >= ipca.n_components:
+                if ready is not None:
+                    ipca.partial_fit(ready)
+                ready = np.vstack(pending) if len(pending) > 1 else pending[0]
+                pending, pending_rows = [], 0
+
+        if ipca is None:
+            raise ValueError("Cannot fit PCA on an empty stream")
+
+        remaining = ([ready] if ready is not None else []) + pending
+        last_batch = np.vstack(remaining) if remaining else np.empty((0, len(self.columns)))
+        if len(last_batch) < ipca.n_components:
+            raise ValueError("Not enough rows in the stream to fit PCA")
+        ipca.partial_fit(last_batch)
+
+        self.mean_ = ipca.mean_
+        self.components_ = ipca.components_
+        self.explained_variance_ = ipca.explained_variance_
+        self.explained_variance_ratio_ = ipca.explained_variance_ratio_
+        self.n_samples_ = int(ipca.n_samples_seen_)
+        self.solver_ = "incremental"
+        return self
+
+    def _check_fitted(self):
+        if self.components_ is None:
+            raise ValueError("PCAFeatureReducer must be fitted first")
+
+    def transform(self, df, n_components=None):
+        """Projects the selected columns of ``df`` onto the principal components."""
+        self._check_fitted()
+        components = self.components_[:n_components] if n_components else self.components_
+        block = self._to_block(df, self.mean_)
+        block -= self.mean_
+        projected = block @ components.T
+        names = [f"PC{i + 1}" for i in range(components.shape[0])]
+        return pd.DataFrame(projected, columns=names, index=df.index)
+
+    def transform_chunks(self, chunks, n_components=None):
+        for chunk in chunks:
+            yield self.transform(chunk, n_components=n_components)
+
+    def components_for_variance(self, threshold=0.95):
+        """Returns the smallest number of components explaining ``threshold`` of the variance."""
+        self._check_fitted()
+        cumulative = np.cumsum(self.explained_variance_ratio_)
+        return int(min(np.searchsorted(cumulative, threshold) + 1, len(cumulative)))
+
+    def explained_variance_report(self):
+        self._check_fitted()
+        return pd.DataFrame({
+            "Component": [f"PC{i + 1}" for i in range(len(self.explained_variance_))],
+            "Explained Variance": self.explained_variance_,
+            "Explained Variance Ratio": self.explained_variance_ratio_,
+            "Cumulative Ratio": np.cumsum(self.explained_variance_ratio_),
+        })
+
+    def loadings(self):
+        """Component loadings (feature x component), scaled by the component standard deviation."""
+        self._check_fitted()
+        values = self.components_.T * np.sqrt(self.explained_variance_)
+        return pd.DataFrame(values, index=self.columns, columns=[f"PC{i + 1}" for i in range(values.shape[1])])
+
+    def reduce_dataframe(self, df, n_components=None):
+        """Replaces the numerical columns of ``df`` with their principal components."""
+        projected = self.transform(df, n_components=n_components)
+        return pd.concat([df.drop(columns=self.columns), projected], axis=1)
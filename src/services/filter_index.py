@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+from services.bitmaps import RowBitmap
+
+# Below this selectivity, filters scatter row positions into the result;
+# above it a vectorized comparison over the whole column is cheaper
+SPARSE_FRACTION = 1 / 16
+# Categories covering at least 1/32 of the rows keep a dense bitmap
+# (1 bit per row beats a 32-bit posting per matching row)
+DENSE_CATEGORY_FRACTION = 1 / 32
+
+
+def _mask_from_positions(positions, n_rows):
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[positions] = True
+    return mask
+
+
+class NumericColumnIndex:
+    """Sorted values with their row positions, for range filters."""
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.values = values
+        self.n_rows = len(values)
+        valid = np.flatnonzero(~np.isnan(values))
+        order = np.argsort(values[valid], kind="stable")
+        self.positions = valid[order]
+        self.sorted_values = values[self.positions]
+
+    @property
+    def min(self):
+        return float(self.sorted_values[0]) if len(self.sorted_values) else None
+
+    @property
+    def max(self):
+        return float(self.sorted_values[-1]) if len(self.sorted_values) else None
+
+    def count(self, low=None, high=None):
+        lo, hi = self._bounds(low, high)
+        return hi - lo
+
+    def _bounds(self, low, high):
+        lo = 0 if low is None else np.searchsorted(self.sorted_values, low, side="left")
+        hi = len(self.sorted_values) if high is None else np.searchsorted(self.sorted_values, high, side="right")
+        return int(lo), int(max(lo, hi))
+
+    def matches(self, rows, low=None, high=None):
+        """Boolean mask over the row positions ``rows``."""
+        values = self.values[rows]
+        mask = ~np.isnan(values)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    def range(self, low=None, high=None):
+        """RowBitmap of rows with ``low <= value <= high`` (missing values never match)."""
+        lo, hi = self._bounds(low, high)
+        if hi - lo < self.n_rows * SPARSE_FRACTION:
+            return RowBitmap.from_mask(_mask_from_positions(self.positions[lo:hi], self.n_rows))
+        return RowBitmap.from_mask(self.matches(slice(None), low, high))
+
+
+class CategoricalColumnIndex:
+    """
+    Inverted index from value to rows: frequent values keep a dense
+    RowBitmap, rare values a sorted list of row positions.
+    """
+
+    def __init__(self, series):
+        self.codes, self.uniques = pd.factorize(series, use_na_sentinel=True)
+        self.n_rows = len(series)
+        self.counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.uniques))
+        self._code_of = {value: code for code, value in enumerate(self.uniques.tolist())}
+
+        # Postings for every value, stored as one array sorted by code (CSR layout)
+        order = np.argsort(self.codes, kind="stable")
+        order = order[self.codes[order] >= 0]
+        self._postings = order
+        self._offsets = np.concatenate([[0], np.cumsum(self.counts)])
+
+        dense = np.flatnonzero(self.counts >= self.n_rows * DENSE_CATEGORY_FRACTION)
+        self.bitmaps = {int(code): RowBitmap.from_mask(self.codes == code) for code in dense}
+
+    def positions(self, value):
+        code = self._code_of.get(value)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return self._postings[self._offsets[code]:self._offsets[code + 1]]
+
+    def _codes(self, values):
+        return [self._code_of[v] for v in values if v in self._code_of]
+
+    def count(self, values):
+        return int(self.counts[self._codes(values)].sum())
+
+    def matches(self, rows, values):
+        """Boolean mask over the row positions ``rows``."""
+        return np.isin(self.codes[rows], self._codes(values))
+
+    def select(self, values):
+        """RowBitmap of rows whose value is one of ``values``."""
+        codes = self._codes(values)
+        result = RowBitmap.zeros(self.n_rows)
+        sparse = []
+        for code in codes:
+            if code in self.bitmaps:
+                result = result | self.bitmaps[code]
+            else:
+                sparse.append(self._postings[self._offsets[code]:self._offsets[code + 1]])
+        if sparse:
+            result = result | RowBitmap.from_mask(_mask_from_positions(np.concatenate(sparse), self.n_rows))
+        return result
+
+    def value_counts(self, rows=None, limit=None):
+        """Row counts per value, optionally restricted to a RowBitmap (for cross-filter widgets)."""
+        if rows is None:
+            counts = self.counts
+        else:
+            codes = self.codes[rows.indices()]
+            counts = np.bincount(codes[codes >= 0], minlength=len(self.uniques))
+        order = np.argsort(-counts, kind="stable")[:limit]
+        return pd.Series(counts[order], index=self.uniques.take(order))
+
+
+class FilterIndex:
+    """
+    Per-column indexes over one version of a dataset. Column indexes are
+    built lazily on first use; filters on several columns are combined by
+    ANDing their row bitmaps, without materializing intermediate frames.
+
+    ``filters`` maps a column to either a ``(low, high)`` tuple (numeric and
+    datetime columns, either bound may be None) or a list of allowed values.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.n_rows = len(df)
+        self._indexes = {}
+
+    @staticmethod
+    def is_numeric(series):
+        return (pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)) \
+            or pd.api.types.is_datetime64_any_dtype(series)
+
+    def column(self, name):
+        if name not in self._indexes:
+            series = self.df[name]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                values = pd.DatetimeIndex(series).as_unit("ns").asi8.astype(np.float64)
+                values[series.isna().to_numpy()] = np.nan
+                self._indexes[name] = NumericColumnIndex(values)
+            elif self.is_numeric(series):
+                self._indexes[name] = NumericColumnIndex(series.to_numpy(dtype=np.float64, na_value=np.nan))
+            else:
+                self._indexes[name] = CategoricalColumnIndex(series)
+        return self._indexes[name]
+
+    def _arguments(self, name, condition):
+        """(index, positional filter arguments) with datetime bounds converted to ns."""
+        index = self.column(name)
+        if not isinstance(index, NumericColumnIndex):
+            return index, (condition,)
+        low, high = condition
+        if pd.api.types.is_datetime64_any_dtype(self.df[name]):
+            low, high = (None if b is None else float(pd.Timestamp(b).as_unit("ns").value) for b in (low, high))
+        return index, (low, high)
+
+    def filter(self, filters):
+        """RowBitmap of rows matching every filter (all rows when ``filters`` is empty)."""
+        if not filters:
+            return ~RowBitmap.zeros(self.n_rows)
+
+        # Most selective filter first (exact counts come cheaply from the indexes)
+        plans = sorted((self._arguments(name, condition) for name, condition in filters.items()),
+                       key=lambda plan: plan[0].count(*plan[1]))
+        index, args = plans[0]
+        result = index.range(*args) if isinstance(index, NumericColumnIndex) else index.select(*args)
+
+        for position, (index, args) in enumerate(plans[1:], start=1):
+            if result.count() < self.n_rows * SPARSE_FRACTION:
+                # Few candidates left: probe just those rows instead of building more bitmaps
+                rows = result.indices()
+                return RowBitmap.from_indices(rows[self._probe(plans[position:], rows)], self.n_rows)
+            bitmap = index.range(*args) if isinstance(index, NumericColumnIndex) else index.select(*args)
+            result = result & bitmap
+        return result
+
+    @staticmethod
+    def _probe(plans, rows):
+        keep = np.ones(len(rows), dtype=bool)
+        for index, args in plans:
+            keep[keep] = index.matches(rows[keep], *args)
+        return keep
+
+    def apply(self, filters):
+        """Filtered frame; only the final selection is materialized."""
+        if not filters:
+            return self.df
+        return self.df.iloc[self.filter(filters).indices()]
@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation has been requested."""
+
+
+class Job:
+    """State of one background job, shared between the worker and the UI."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    FINISHED = (DONE, FAILED, CANCELLED)
+
+    def __init__(self, job_id, name):
+        self.id = job_id
+        self.name = name
+        self.status = Job.PENDING
+        self.stage = None
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def is_finished(self):
+        return self.status in Job.FINISHED
+
+    @property
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Requests cancellation; takes effect at the job's next progress report."""
+        self._cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self.status = Job.CANCELLED
+            self.finished_at = time.time()
+
+    def report_progress(self, stage, fraction=None):
+        """Progress callback handed to service calls. Raises JobCancelled when cancelled."""
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.id)
+        self.stage = stage
+        if fraction is not None:
+            self.progress = max(0.0, min(1.0, float(fraction)))
+
+    def __repr__(self):
+        return f"Job(id={self.id!r}, status={self.status!r}, stage={self.stage!r}, progress={self.progress:.2f})"
+
+
+class JobManager:
+    """
+    Runs service calls as background jobs in a worker pool.
+
+    Jobs are addressed by stable IDs chosen by the caller (e.g. derived from
+    the session and dataset version), so a UI rerun can find and poll a job
+    it started earlier instead of starting it again. The job function
+    receives a ``progress_callback(stage, fraction)`` keyword argument.
+    """
+
+    def __init__(self, max_workers=2, keep_finished=64):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="smartsanitize-job")
+        self.keep_finished = keep_finished
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, job_id=None, name=None, **kwargs):
+        """Starts ``fn`` as a job, or returns the live job already registered under ``job_id``."""
+        job_id = job_id or uuid.uuid4().hex
+        with self._lock:
+            existing = self._jobs.get(job_id)
+            if existing is not None and existing.status not in (Job.FAILED, Job.CANCELLED):
+                return existing
+
+            job = Job(job_id, name or getattr(fn, "__name__", "job"))
+            self._jobs[job_id] = job
+            job.future = self.executor.submit(self._run, job, fn, args, kwargs)
+            self._evict_finished()
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_requested:
+            job.status = Job.CANCELLED
+            job.finished_at = time.time()
+            return None
+
+        job.status = Job.RUNNING
+        try:
+            job.result = fn(*args, progress_callback=job.report_progress, **kwargs)
+            job.progress = 1.0
+            job.status = Job.DONE
+        except JobCancelled:
+            job.status = Job.CANCELLED
+            logger.info("Job %s (%s) cancelled at stage %s", job.id, job.name, job.stage)
+        except Exception as e:
+            job.error = e
+            job.status = Job.FAILED
+            logger.exception("Job %s (%s) failed", job.id, job.name)
+        finally:
+            job.finished_at = time.time()
+        return job.result
+
+    def _evict_finished(self):
+        finished = sorted((j for j in self._jobs.values() if j.is_finished), key=lambda j: j.finished_at)
+        for job in finished[:max(0, len(finished) - self.keep_finished)]:
+            self._jobs.pop(job.id, None)
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def discard(self, job_id):
+        """Cancels (if needed) and forgets a job."""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is not None and not job.is_finished:
+            job.cancel()
+        return job
+
+    def jobs(self):
+        return list(self._jobs.values())
+
+    def shutdown(self, wait=False):
+        for job in self._jobs.values():
+            job.cancel()
+        self.executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,316 @@
+import numpy as np
+import pandas as pd
+from config.settings import KEY_DISCOVERY_SAMPLE_SIZE
+from services.sampling import sample_rows
+
+# Rows of the sample every candidate is first probed on; most non-keys repeat within them
+PROBE_ROWS = 512
+# Candidate combinations checked per lattice level; beyond it the most promising are kept
+MAX_CANDIDATES = 100_000
+# The search stops once this many keys or near keys are found (smallest combinations first)
+MAX_KEYS = 50
+# Share of rows that may violate an approximate functional dependency
+MAX_FD_ERROR = 0.01
+# Dependencies verified on the full data (lowest sample error first)
+MAX_DEPENDENCIES = 100
+KEY_COLUMNS = ["Columns", "Size", "Status", "Duplicate Rows", "Missing Rows"]
+DEPENDENCY_COLUMNS = ["Determinant", "Dependent", "Violating Rows", "Violating %"]
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(codes, salt):
+    """splitmix64 finalizer of integer codes; each salt gives an independent hash function."""
+    z = codes.astype(np.uint64) + np.uint64(((int(salt) + 1) * 0x9E3779B97F4A7C15) & _MASK64)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _duplicated_rows(values):
+    """Positions of every value that occurs more than once in a 1-D array."""
+    order = np.argsort(values)
+    same = values[order[1:]] == values[order[:-1]]
+    repeated = np.zeros(len(values), dtype=bool)
+    repeated[1:] |= same
+    repeated[:-1] |= same
+    return order[repeated]
+
+
+def key_violations(df, columns):
+    """Rows sharing their values in ``columns`` with another row, grouped together."""
+    columns = list(columns)
+    rows = df[df.duplicated(subset=columns, keep=False)]
+    return rows.sort_values(columns, kind="stable")
+
+
+class KeyDiscoveryResult:
+    """Minimal candidate keys (and near keys) plus approximate functional dependencies."""
+
+    def __init__(self, keys, dependencies, rows, sample_rows, max_size, complete):
+        self.keys = keys
+        self.dependencies = dependencies
+        self.rows = rows
+        self.sample_rows = sample_rows
+        self.max_size = max_size
+        self.complete = complete
+
+    def summary(self):
+        return {
+            "Rows": self.rows,
+            "Sample Rows": self.sample_rows,
+            "Max Key Size": self.max_size,
+            "Search": "complete" if self.complete else "stopped early (most promising combinations only)",
+        }
+
+
+class KeyDiscovery:
+    """
+    Finds the minimal column combinations that uniquely identify a row, and
+    single-column functional dependencies ``A -> B`` that hold for all but a
+    small share of rows.
+
+    Every column is factorized once and its codes hashed with a per-column
+    hash function, so the fingerprint of a combination is just the sum of its
+    columns' hashes. The lattice of combinations is searched level by level:
+
+    * a combination ``X + C`` is only generated from a non-unique ``X`` and
+      never contains a known key, so every key found is minimal;
+    * it cannot be unique when ``distinct(X) * distinct(C)`` is below the
+      number of rows, which prunes it without looking at any data;
+    * the rest are probed on ``PROBE_ROWS`` sampled rows, checked on the full
+      sample (only rows where ``X`` itself repeats can collide) and finally
+      verified exactly on the full data.
+
+    Combinations unique on the sample but not on the full data are reported
+    as near keys with the number of rows that break them.
+    """
+
+    def __init__(self, max_size=3, sample_size=KEY_DISCOVERY_SAMPLE_SIZE, max_fd_error=MAX_FD_ERROR,
+                 max_candidates=MAX_CANDIDATES, max_keys=MAX_KEYS, random_state=0):
+        self.max_size = max_size
+        self.max_keys = max_keys
+        self.sample_size = sample_size
+        self.max_fd_error = max_fd_error
+        self.max_candidates = max_candidates
+        self.random_state = random_state
+
+    @staticmethod
+    def candidate_columns(df):
+        """Every column except floating-point measurements, which rarely identify records."""
+        return [col for col in df.columns if not pd.api.types.is_float_dtype(df[col])]
+
+    def discover(self, df, columns=None):
+        columns = self.candidate_columns(df) if columns is None else list(columns)
+        sample = df[columns]
+        if self.sample_size and len(df) > self.sample_size:
+            sample = sample_rows(sample, self.sample_size, random_state=self.random_state)
+        n, m = len(sample), len(columns)
+        self._df, self._columns = df, columns
+        self._full_codes_cache, self._full_hashes, self._near_key_count = {}, {}, 0
+
+        keys, near_keys, complete = [], {}, True
+        dependencies = pd.DataFrame(columns=DEPENDENCY_COLUMNS)
+        if n > 1 and m:
+            codes = np.column_stack([pd.factorize(sample[col], use_na_sentinel=False)[0] for col in columns])
+            distinct = codes.max(axis=0) + 1
+            # One row of hashes per column, so the rows of a combination are contiguous
+            hashes = np.vstack([_mix(codes[:, j], j) for j in range(m)])
+            probe = np.random.default_rng(self.random_state).choice(n, min(n, PROBE_ROWS), replace=False)
+            keys, near_keys, complete = self._search(hashes, distinct, probe)
+            dependencies = self._dependencies(codes, distinct)
+
+        return KeyDiscoveryResult(self._keys_frame(keys, near_keys), dependencies, len(df), n,
+                                  self.max_size, complete)
+
+    # ---- candidate keys ----
+
+    def _search(self, hashes, distinct, probe):
+        m, n = hashes.shape
+        keys, near_keys = [], {}
+
+        # Level 1: single columns
+        frontier = np.arange(m)[:, None]
+        bounds = distinct.astype(np.float64)
+        for j in np.flatnonzero(distinct == n):
+            self._verify((j,), keys, near_keys)
+        # Constant columns never make a combination more unique
+        useful = (distinct > 1) & ~np.isin(np.arange(m), [key[0] for key in keys])
+        frontier, bounds = frontier[useful], bounds[useful]
+
+        complete = True
+        for size in range(2, self.max_size + 1):
+            if not len(frontier) or not complete:
+                break
+            # Extend every non-unique combination with each later column
+            counts = m - 1 - frontier[:, -1]
+            parent = np.repeat(np.arange(len(frontier)), counts)
+            offsets = np.arange(len(parent)) - np.repeat(np.cumsum(counts) - counts, counts)
+            nxt = np.repeat(frontier[:, -1] + 1, counts) + offsets
+            combos = np.column_stack([frontier[parent], nxt])
+            bound = np.minimum(bounds[parent] * distinct[nxt], n)
+
+            # Supersets of a key are not minimal
+            keep = distinct[nxt] > 1
+            for key in keys:
+                keep &= ~np.all([(combos == col).any(axis=1) for col in key], axis=0)
+            if keep.sum() > self.max_candidates:
+                # Keep the combinations with the most possible distinct values
+                complete = False
+                ranked = np.flatnonzero(keep)[np.argsort(-bound[keep], kind="stable")]
+                keep[ranked[self.max_candidates:]] = False
+            parent, nxt, combos, bound = parent[keep], nxt[keep], combos[keep], bound[keep]
+
+            # Too few distinct value combinations to be unique on the sample
+            check = np.flatnonzero(bound >= n)
+            unique, _ = self._unique_on(hashes[:, probe], frontier, parent[check], nxt[check])
+            check = check[unique]
+            unique, exact_distinct = self._unique_on(hashes, frontier, parent[check], nxt[check])
+            bound[check] = exact_distinct
+
+            rest = np.ones(len(combos), dtype=bool)
+            for i in check[unique]:
+                if len(keys) >= self.max_keys or self._near_key_count >= self.max_keys:
+                    complete = False
+                    break
+                if self._verify(tuple(combos[i]), keys, near_keys):
+                    rest[i] = False
+            frontier, bounds = combos[rest], bound[rest]
+        return keys, near_keys, complete
+
+    @staticmethod
+    def _unique_on(hashes, frontier, parent, nxt):
+        """
+        Whether each combination ``frontier[parent] + nxt`` is unique on the
+        rows (columns of ``hashes``), and its number of distinct values there.
+        Candidates sharing a parent are checked together, on the rows where
+        the parent repeats.
+        """
+        unique = np.zeros(len(parent), dtype=bool)
+        distinct = np.zeros(len(parent))
+        if not len(parent):
+            return unique, distinct
+        starts = np.flatnonzero(np.r_[True, parent[1:] != parent[:-1]])
+        for start, stop in zip(starts, np.r_[starts[1:], len(parent)]):
+            fingerprint = hashes[frontier[parent[start]]].sum(axis=0)
+            rows = _duplicated_rows(fingerprint)
+            block = hashes[np.ix_(nxt[start:stop], rows)] + fingerprint[rows]
+            block.sort(axis=1)
+            repeats = (block[:, 1:] == block[:, :-1]).sum(axis=1)
+            unique[start:stop] = repeats == 0
+            distinct[start:stop] = hashes.shape[1] - repeats
+        return unique, distinct
+
+    def _full_hash(self, j):
+        if j not in self._full_hashes:
+            self._full_hashes[j] = _mix(self._full_codes(j), j)
+        return self._full_hashes[j]
+
+    def _full_codes(self, j):
+        if j not in self._full_codes_cache:
+            self._full_codes_cache[j] = pd.factorize(self._df[self._columns[j]], use_na_sentinel=False)[0]
+        return self._full_codes_cache[j]
+
+    def _verify(self, combo, keys, near_keys):
+        """Exact check on the full data; records ``combo`` as a key or a near key."""
+        # Rows breaking a near key are the only rows that can break its supersets
+        rows = None
+        for near_key, near_rows in near_keys.items():
+            if set(near_key) <= set(combo) and (rows is None or len(near_rows) < len(rows)):
+                rows = near_rows
+        minimal = rows is None
+        if minimal:
+            rows = _duplicated_rows(sum(self._full_hash(j) for j in combo))
+        if len(rows):
+            # Equal fingerprints are confirmed on the values themselves
+            positions = self._df.columns.get_indexer([self._columns[j] for j in combo])
+            rows = rows[self._df.iloc[rows, positions].duplicated(keep=False).to_numpy()]
+        if len(rows):
+            near_keys[combo] = rows
+            self._near_key_count += minimal
+            return False
+        keys.append(combo)
+        return True
+
+    def _keys_frame(self, keys, near_keys):
+        # A near key only matters when none of its subsets already breaks the same way
+        minimal = [combo for combo in near_keys
+                   if not any(set(other) < set(combo) for other in near_keys)]
+        minimal = sorted(minimal, key=lambda combo: len(near_keys[combo]))[:self.max_keys]
+        rows = []
+        for combo, duplicates in [(key, 0) for key in keys] + [(k, len(near_keys[k])) for k in minimal]:
+            names = [self._columns[j] for j in combo]
+            rows.append({
+                "Columns": names,
+                "Size": len(names),
+                "Status": "Key" if duplicates == 0 else "Near key",
+                "Duplicate Rows": duplicates,
+                "Missing Rows": int(self._df[names].isna().any(axis=1).sum()),
+            })
+        frame = pd.DataFrame(rows, columns=KEY_COLUMNS)
+        return frame.sort_values(["Duplicate Rows", "Size"], kind="stable").reset_index(drop=True)
+
+    # ---- functional dependencies ----
+
+    def _dependencies(self, codes, distinct):
+        """
+        ``A -> B`` pairs whose g3 error (share of rows to drop for the
+        dependency to hold) is at most ``max_fd_error`` on the sample, then
+        re-measured exactly on the full data.
+        """
+        n, m = codes.shape
+        found = []
+        # With mostly one row per value of A, every dependency holds trivially
+        for a in np.flatnonzero((distinct > 1) & (distinct <= n // 2)):
+            # A -> B needs distinct(B) <= distinct(A) + violations
+            dependents = np.flatnonzero((distinct > 1) & (np.arange(m) != a)
+                                        & (distinct - distinct[a] <= self.max_fd_error * n))
+            if not len(dependents):
+                continue
+            errors = self._fd_errors(codes[:, a], codes[:, dependents])
+            for b, error in zip(dependents, errors):
+                if error <= self.max_fd_error:
+                    found.append((error, a, b))
+
+        rows = []
+        for _, a, b in sorted(found)[:MAX_DEPENDENCIES]:
+            violating = self._full_violations(a, b)
+            if violating <= self.max_fd_error * len(self._df):
+                rows.append({
+                    "Determinant": self._columns[a],
+                    "Dependent": self._columns[b],
+                    "Violating Rows": violating,
+                    "Violating %": round(violating / len(self._df) * 100, 3),
+                })
+        frame = pd.DataFrame(rows, columns=DEPENDENCY_COLUMNS)
+        return frame.sort_values("Violating Rows", kind="stable").reset_index(drop=True)
+
+    @staticmethod
+    def _fd_errors(determinant, dependents):
+        """g3 error of ``determinant -> column`` for every column of ``dependents``, in one sort."""
+        n, c = dependents.shape
+        dtype = np.int32 if n * n < np.iinfo(np.int32).max else np.int64
+        # Pair codes, one sorted row per dependent column
+        cells = np.ascontiguousarray((determinant.astype(dtype)[:, None] * n + dependents.astype(dtype)).T)
+        cells.sort(axis=1)
+        flat = cells.ravel()
+        new_run = np.empty(len(flat), dtype=bool)
+        new_run[0] = True
+        np.not_equal(flat[1:], flat[:-1], out=new_run[1:])
+        new_run[::n] = True
+        run_starts = np.flatnonzero(new_run)
+        run_lengths = np.diff(np.r_[run_starts, len(flat)])
+        # Runs sharing a dependent column and a value of the determinant form one group
+        groups = run_starts // n * n + flat[run_starts] // n
+        group_starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        # Rows agreeing with the most common dependent value of each group satisfy the dependency
+        kept = np.maximum.reduceat(run_lengths, group_starts)
+        return 1 - np.bincount(groups[group_starts] // n, weights=kept, minlength=c) / n
+
+    def _full_violations(self, a, b):
+        """Exact number of rows to drop for ``A -> B`` to hold on the full data."""
+        codes_b = self._full_codes(b)
+        levels = int(codes_b.max()) + 1
+        values, counts = np.unique(self._full_codes(a).astype(np.int64) * levels + codes_b, return_counts=True)
+        groups = values // levels
+        group_starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        return int(len(self._df) - np.maximum.reduceat(counts, group_starts).sum())
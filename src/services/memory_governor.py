@@ -0,0 +1,189 @@
+import logging
+import numpy as np
+import pandas as pd
+from config.settings import MEMORY_BUDGET_BYTES, MEMORY_BUDGET_FRACTION
+from services.sampling import sample_rows
+
+logger = logging.getLogger(__name__)
+
+IN_MEMORY = "in-memory"
+CHUNKED = "chunked"
+SAMPLED = "sampled"
+
+# Rows measured to estimate the deep size of object columns
+SIZE_SAMPLE_ROWS = 1_000
+# Degraded runs never use chunks or samples smaller than this
+MIN_ROWS = 1_000
+
+
+def _meminfo_available():
+    """MemAvailable from /proc/meminfo in bytes, or None off Linux."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _cgroup_available():
+    """Bytes left under the container's cgroup memory limit (v2, then v1), or None without a limit."""
+    for limit_path, usage_path in (("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+                                   ("/sys/fs/cgroup/memory/memory.limit_in_bytes",
+                                    "/sys/fs/cgroup/memory/memory.usage_in_bytes")):
+        try:
+            with open(limit_path) as f:
+                limit = f.read().strip()
+            with open(usage_path) as f:
+                usage = int(f.read().strip())
+        except (OSError, ValueError):
+            continue
+        # v1 reports "no limit" as a huge page-aligned number
+        if limit == "max" or int(limit) >= 1 << 60:
+            return None
+        return max(0, int(limit) - usage)
+    return None
+
+
+def available_memory():
+    """RAM (bytes) new allocations can use: the tighter of the host and container limits; None if unknown."""
+    known = [value for value in (_meminfo_available(), _cgroup_available()) if value is not None]
+    return min(known) if known else None
+
+
+def column_bytes(df, sample_size=SIZE_SAMPLE_ROWS):
+    """
+    Estimated in-memory size of every column. Fixed-width and Arrow columns
+    are exact; object columns are measured on their first ``sample_size``
+    rows and scaled, since a deep measurement of every string is itself slow.
+    """
+    sizes = df.memory_usage(index=False, deep=False)
+    for position, col in enumerate(df.columns):
+        series = df.iloc[:, position]
+        if series.dtype == object and len(series):
+            head = series.iloc[:sample_size]
+            sizes.iloc[position] = head.memory_usage(index=False, deep=True) * len(series) / len(head)
+    return sizes.astype(np.int64)
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class MemoryPlan:
+    """How one operation runs: in memory, in row chunks, or on a row sample."""
+
+    def __init__(self, operation, mode, estimate, budget, rows, chunk_rows=None, sample_size=None):
+        self.operation = operation
+        self.mode = mode
+        self.estimate = estimate
+        self.budget = budget
+        self.rows = rows
+        self.chunk_rows = chunk_rows
+        self.sample_size = sample_size
+
+    @property
+    def in_memory(self):
+        return self.mode == IN_MEMORY
+
+    def chunks(self, df):
+        """Row slices of at most ``chunk_rows`` rows (the whole frame when not chunked)."""
+        step = self.chunk_rows or max(len(df), 1)
+        for start in range(0, len(df), step):
+            yield df.iloc[start:start + step]
+
+    def map(self, series, func):
+        """
+        ``func(series)`` computed chunk by chunk. Each chunk's output goes
+        straight into the result (a chunk of an Arrow column, else a
+        preallocated array) instead of a list concatenated at the end, so
+        peak memory is the result plus one chunk's scratch.
+        """
+        if self.mode != CHUNKED or self.chunk_rows >= len(series):
+            return func(series)
+        if isinstance(series.dtype, pd.StringDtype) and series.dtype.storage == "pyarrow":
+            import pyarrow as pa
+
+            pieces = []
+            for chunk in self.chunks(series):
+                out = func(chunk)
+                pieces.extend(out.array.__arrow_array__().chunks)
+            values = pa.chunked_array(pieces, type=out.array.__arrow_array__().type)
+            return pd.Series(pd.arrays.ArrowStringArray(values), index=series.index, name=series.name, dtype=out.dtype)
+
+        values = None
+        for start, chunk in zip(range(0, len(series), self.chunk_rows), self.chunks(series)):
+            out = func(chunk)
+            if values is None:
+                values, dtype = np.empty(len(series), dtype=out.to_numpy().dtype), out.dtype
+            values[start:start + len(out)] = out.to_numpy()
+        return pd.Series(values, index=series.index, name=series.name, dtype=dtype)
+
+    def sample(self, df, random_state=0):
+        return sample_rows(df, self.sample_size, random_state=random_state) if self.sample_size else df
+
+    def describe(self):
+        budget = format_bytes(self.budget) if self.budget is not None else "unlimited"
+        text = f"{self.operation}: ~{format_bytes(self.estimate)} needed, budget {budget}, {self.mode}"
+        if self.mode == CHUNKED:
+            text += f" in chunks of {self.chunk_rows:,} rows"
+        elif self.mode == SAMPLED:
+            text += f" on {self.sample_size:,} of {self.rows:,} rows"
+        return text
+
+
+class MemoryGovernor:
+    """
+    Checks an operation's estimated footprint against a memory budget before
+    it allocates. The budget is ``fraction`` of the RAM available right now
+    (host or container limit, whichever is tighter), capped at ``budget``
+    bytes when one is configured.
+
+    Operations describe their footprint as ``fixed_bytes`` (needed whatever
+    happens, e.g. the output) plus ``per_row_bytes`` of working memory per row
+    processed at once. Within budget they run in memory; otherwise chunked
+    when they can merge partial results, else on a sample small enough to
+    fit. Degraded decisions are logged as warnings so operators can see why
+    a run was slower or approximate instead of killed.
+    """
+
+    def __init__(self, budget=MEMORY_BUDGET_BYTES, fraction=MEMORY_BUDGET_FRACTION):
+        self.budget = budget
+        self.fraction = fraction
+
+    def budget_bytes(self):
+        """Current budget in bytes; None when neither a budget nor the available RAM is known."""
+        available = available_memory()
+        limits = [limit for limit in (self.budget or None, available * self.fraction if available is not None else None)
+                  if limit is not None]
+        return int(min(limits)) if limits else None
+
+    def plan(self, operation, rows, per_row_bytes, fixed_bytes=0, chunkable=False, sampleable=False):
+        estimate = int(fixed_bytes + rows * per_row_bytes)
+        budget = self.budget_bytes()
+        plan = MemoryPlan(operation, IN_MEMORY, estimate, budget, rows)
+        if budget is None or estimate <= budget or rows <= MIN_ROWS:
+            logger.debug("Memory plan %s", plan.describe())
+            return plan
+
+        fitting = int((budget - fixed_bytes) // max(per_row_bytes, 1)) if fixed_bytes < budget else 0
+        fitting = min(max(fitting, MIN_ROWS), rows)
+        if chunkable:
+            plan.mode, plan.chunk_rows = CHUNKED, fitting
+        elif sampleable:
+            plan.mode, plan.sample_size = SAMPLED, fitting
+        else:
+            logger.warning("Memory plan %s; over budget with no cheaper strategy", plan.describe())
+            return plan
+        logger.warning("Memory plan %s", plan.describe())
+        return plan
+
+    def plan_frame(self, operation, df, copies=1.0, fixed_bytes=0, chunkable=False, sampleable=False):
+        """Plan for an operation needing about ``copies`` x the size of ``df`` as working memory."""
+        per_row = copies * column_bytes(df).sum() / max(len(df), 1)
+        return self.plan(operation, len(df), per_row, fixed_bytes, chunkable=chunkable, sampleable=sampleable)
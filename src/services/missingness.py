@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+from services.bitmaps import popcount_rows
+
+# Upper bound on the temporary boolean block used when transposing bitsets
+PATTERN_BLOCK_BITS = 1 << 24
+# Upper bound on the temporary intersection of one bitset with a tile of others
+CO_MISSING_TILE_BYTES = 1 << 26
+FNV_PRIME = np.uint64(0x100000001B3)
+FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+
+
+def _pack_words(mask, n_words):
+    """Packs a boolean vector into ``n_words`` little-endian uint64 words."""
+    packed = np.zeros(n_words * 8, dtype=np.uint8)
+    bits = np.packbits(mask, bitorder="little")
+    packed[:len(bits)] = bits
+    return packed.view(np.uint64)
+
+
+def _hash_rows(words):
+    """64-bit FNV-1a style hash of each row of a 2-D uint64 array."""
+    hashes = np.full(len(words), FNV_OFFSET, dtype=np.uint64)
+    for j in range(words.shape[1]):
+        hashes ^= words[:, j]
+        hashes *= FNV_PRIME
+    return hashes
+
+
+class MissingnessMatrix:
+    """
+    Null masks of a DataFrame stored as one packed bitset per column
+    (``n_rows / 8`` bytes each). Only columns that actually contain missing
+    values are kept, so a 5,000-column table with a few sparse gaps costs
+    little more than its list of missing counts.
+    """
+
+    def __init__(self, columns, missing_counts, bits, n_rows):
+        self.columns = list(columns)
+        self.missing_counts = missing_counts
+        self.bits = bits
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_dataframe(cls, df):
+        n_rows = len(df)
+        n_words = (n_rows + 63) // 64
+        counts = np.zeros(df.shape[1], dtype=np.int64)
+        missing_columns, rows = [], []
+        for i, col in enumerate(df.columns):
+            mask = df.iloc[:, i].isna().to_numpy()
+            counts[i] = np.count_nonzero(mask)
+            if counts[i]:
+                missing_columns.append(col)
+                rows.append(_pack_words(mask, n_words))
+        bits = np.vstack(rows) if rows else np.zeros((0, n_words), dtype=np.uint64)
+        return cls(missing_columns, pd.Series(counts, index=df.columns), bits, n_rows)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    def co_missing_counts(self):
+        """
+        Rows where both columns are missing, for every pair of columns with
+        missing values (popcount of the bitset intersections). Columns with
+        identical null masks are intersected only once, and each is
+        intersected with a tile of the others at a time, so the temporary
+        stays under ``CO_MISSING_TILE_BYTES`` however many rows there are.
+        """
+        if not self.columns:
+            return pd.DataFrame()
+        unique, inverse = np.unique(self.bits, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        k = len(unique)
+        tile = max(1, CO_MISSING_TILE_BYTES // max(unique[0].nbytes, 1))
+        counts = np.zeros((k, k), dtype=np.int64)
+        for i in range(k):
+            for j in range(i, k, tile):
+                counts[i, j:j + tile] = popcount_rows(unique[i] & unique[j:j + tile])
+            counts[i:, i] = counts[i, i:]
+        return pd.DataFrame(counts[np.ix_(inverse, inverse)], index=self.columns, columns=self.columns)
+
+    def jaccard(self, co_missing=None):
+        """Share of rows missing in both columns among rows missing in either."""
+        co_missing = self.co_missing_counts() if co_missing is None else co_missing
+        if co_missing.empty:
+            return co_missing.astype(float)
+        both = co_missing.to_numpy(dtype=np.float64)
+        single = np.diag(both)
+        union = single[:, None] + single[None, :] - both
+        return pd.DataFrame(np.divide(both, union, out=np.zeros_like(both), where=union > 0),
+                            index=co_missing.index, columns=co_missing.columns)
+
+    def top_pairs(self, top=20, co_missing=None):
+        """Column pairs that are most often missing together."""
+        co_missing = self.co_missing_counts() if co_missing is None else co_missing
+        if len(co_missing) < 2:
+            return pd.DataFrame(columns=["Column A", "Column B", "Both Missing", "Jaccard", "P(B missing | A missing)"])
+        jaccard = self.jaccard(co_missing).to_numpy()
+        both = co_missing.to_numpy()
+        i, j = np.triu_indices(len(both), k=1)
+        order = np.lexsort((-jaccard[i, j], -both[i, j]))[:top]
+        i, j = i[order], j[order]
+        pairs = pd.DataFrame({
+            "Column A": [self.columns[k] for k in i],
+            "Column B": [self.columns[k] for k in j],
+            "Both Missing": both[i, j],
+            "Jaccard": jaccard[i, j],
+            "P(B missing | A missing)": both[i, j] / np.diag(both)[i],
+        })
+        return pairs[pairs["Both Missing"] > 0].reset_index(drop=True)
+
+    def row_patterns(self, top=10):
+        """
+        Most frequent row-level missing patterns. Each row's null mask (over
+        the columns with missing values) is packed and hashed; rows are then
+        counted per hash.
+        """
+        k = len(self.columns)
+        pattern_words = max(1, (k + 63) // 64)
+        block_rows = max(64, (PATTERN_BLOCK_BITS // max(k, 1)) // 64 * 64)
+        counts, examples = {}, {}
+
+        for start in range(0, self.n_rows, block_rows):
+            rows = min(block_rows, self.n_rows - start)
+            if k:
+                block = self.bits[:, start // 64:(start + rows + 63) // 64]
+                mask = np.unpackbits(block.view(np.uint8), axis=1, bitorder="little")[:, :rows]
+                packed = np.zeros((rows, pattern_words * 8), dtype=np.uint8)
+                row_bytes = np.packbits(mask.T, axis=1, bitorder="little")
+                packed[:, :row_bytes.shape[1]] = row_bytes
+                words = packed.view(np.uint64)
+            else:
+                words = np.zeros((rows, pattern_words), dtype=np.uint64)
+
+            hashes, first, block_counts = np.unique(_hash_rows(words), return_index=True, return_counts=True)
+            for h, idx, count in zip(hashes.tolist(), first.tolist(), block_counts.tolist()):
+                counts[h] = counts.get(h, 0) + count
+                if h not in examples:
+                    examples[h] = words[idx].copy()
+
+        records = []
+        for h, count in sorted(counts.items(), key=lambda item: item[1], reverse=True)[:top]:
+            missing = np.flatnonzero(np.unpackbits(examples[h].view(np.uint8), bitorder="little")[:k])
+            names = [str(self.columns[c]) for c in missing]
+            label = ", ".join(names[:8]) + (f" (+{len(names) - 8} more)" if len(names) > 8 else "")
+            records.append({
+                "Missing Columns": label or "(no missing values)",
+                "Columns Missing": len(names),
+                "Rows": count,
+                "Percentage": 100 * count / self.n_rows if self.n_rows else 0.0,
+            })
+        return pd.DataFrame(records, columns=["Missing Columns", "Columns Missing", "Rows", "Percentage"])
+
+    def clustered_jaccard(self, max_columns=40):
+        """
+        Jaccard co-missingness of the ``max_columns`` most-missing columns,
+        reordered by average-linkage clustering so related columns sit
+        next to each other in a heatmap.
+        """
+        if len(self.columns) < 2:
+            return pd.DataFrame()
+        keep = self.missing_counts[self.columns].nlargest(max_columns).index
+        subset = MissingnessMatrix(keep, self.missing_counts, self.bits[[self.columns.index(c) for c in keep]], self.n_rows)
+        jaccard = subset.jaccard()
+
+        from scipy.cluster.hierarchy import leaves_list, linkage
+        from scipy.spatial.distance import squareform
+
+        distance = 1 - jaccard.to_numpy()
+        np.fill_diagonal(distance, 0)
+        order = leaves_list(linkage(squareform(distance, checks=False), method="average"))
+        return jaccard.iloc[order, order]
@@ -0,0 +1,316 @@
+import numpy as np
+import pandas as pd
+from services.dtypes import STRING_DTYPE, text_columns
+from services.sketches import HyperLogLog
+
+# Shingles x hash functions hashed per MinHash batch; bounds the scratch memory
+BATCH_CELLS = 1 << 24
+# Members of an LSH bucket paired with each member (sorted-neighbourhood window)
+BUCKET_NEIGHBORS = 3
+# Text columns compared by default: at least this share of their values distinct
+# (names, e-mails, addresses); low-cardinality categories would match any rows sharing them
+RECORD_MIN_DISTINCT = 0.5
+CLUSTER_COLUMNS = ["Row", "Cluster", "Similarity"]
+PAIR_COLUMNS = ["Row A", "Row B", "Similarity"]
+
+
+def normalize_records(df, columns):
+    """
+    One normalized string per row: the selected columns joined by spaces,
+    lower-cased, with punctuation and repeated whitespace collapsed. Rows with
+    no value in any selected column become empty strings.
+    """
+    records = None
+    for col in columns:
+        text = df[col].astype(STRING_DTYPE).fillna("")
+        records = text if records is None else records + " " + text
+    if records is None:
+        return pd.Series("", index=df.index, dtype=STRING_DTYPE)
+    # RE2 (Arrow) syntax: anything but Unicode letters and digits, like [\W_] in Python
+    return records.str.lower().str.replace(r"[^\p{L}\p{N}]+", " ", regex=True).str.strip()
+
+
+def _mix(values):
+    """splitmix64 finalizer; spreads packed shingles over all 64 bits."""
+    z = values ^ (values >> np.uint64(30))
+    z = z * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+class NearDuplicateResult:
+    """Clusters of near-duplicate rows; the first row of each cluster is the one kept."""
+
+    def __init__(self, clusters, pairs, redundant, rows, threshold, columns=()):
+        self.clusters = clusters
+        self.pairs = pairs
+        self.redundant = redundant
+        self.rows = rows
+        self.threshold = threshold
+        self.columns = list(columns)
+
+    def summary(self):
+        return {
+            "Near Duplicates": int(len(self.redundant)),
+            "Near-Duplicate Clusters": int(self.clusters["Cluster"].nunique()),
+            "Similarity Threshold": self.threshold,
+            "Compared Columns": self.columns,
+        }
+
+    def drop(self, df):
+        """``df`` (the frame the clusters were found in) without the redundant rows."""
+        keep = np.ones(len(df), dtype=bool)
+        keep[self.redundant] = False
+        return df[keep]
+
+
+class NearDuplicateDetector:
+    """
+    Finds rows that are the same record up to casing, whitespace,
+    punctuation or small typos, without comparing every pair of rows.
+
+    The selected columns of each row are normalized into one string, and
+    identical strings are folded together first. Every distinct string is cut
+    into a set of hashed byte shingles (``shingle_size``-grams) and summarized
+    by a MinHash signature of ``num_perm`` hash functions, computed for
+    batches of shingles as one (hash functions x shingles) array operation.
+    Locality-sensitive hashing splits the signatures into bands: strings
+    sharing all values of a band land in the same bucket, and only strings
+    sharing a bucket become candidates. Candidates are verified with the
+    exact Jaccard similarity of their shingle sets; pairs reaching
+    ``threshold`` are linked and the connected components become clusters.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, shingle_size=3, random_state=0):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if not 1 <= shingle_size <= 8:
+            raise ValueError("shingle_size must be between 1 and 8 bytes")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.band_rows = self.lsh_bands(num_perm, threshold)
+
+        # Hash functions h(x) = (a x + b) >> 32 on 32-bit shingle hashes (multiply-add-shift)
+        rng = np.random.default_rng(random_state)
+        limit = np.iinfo(np.uint64).max
+        self.a = rng.integers(0, limit, num_perm, dtype=np.uint64, endpoint=True)
+        self.b = rng.integers(0, limit, num_perm, dtype=np.uint64, endpoint=True)
+        self.band_weights = rng.integers(0, limit, self.band_rows, dtype=np.uint64, endpoint=True) | np.uint64(1)
+
+    @staticmethod
+    def lsh_bands(num_perm, threshold, recall=0.99):
+        """
+        (bands, rows per band) with ``bands * rows = num_perm``: the most rows
+        per band (fewest false candidates) for which a pair exactly at
+        ``threshold`` still shares a bucket with probability ``recall``.
+        """
+        best = (num_perm, 1)
+        for rows in range(1, num_perm + 1):
+            bands = num_perm // rows
+            if num_perm % rows == 0 and 1 - (1 - threshold ** rows) ** bands >= recall:
+                best = (bands, rows)
+        return best
+
+    @staticmethod
+    def default_columns(df, min_distinct=RECORD_MIN_DISTINCT):
+        """
+        Record-like text columns: those whose distinct values (HyperLogLog
+        estimate) are at least ``min_distinct`` of their non-missing values.
+        Empty when the frame only has categorical text.
+        """
+        columns = []
+        for col in text_columns(df):
+            non_null = int(df[col].notna().sum())
+            if non_null and HyperLogLog().update(df[col]).estimate() >= min_distinct * non_null:
+                columns.append(col)
+        return columns
+
+    def shingles(self, records):
+        """
+        (shingle hashes, shingles per record): the set of 32-bit hashes of the
+        ``shingle_size``-byte UTF-8 windows of each string, sorted within each
+        record. Strings shorter than a window are one shingle; empty strings have none.
+        """
+        import pyarrow as pa  # pyarrow is imported on demand
+
+        array = pa.array(records, type=pa.large_string())
+        offsets = np.frombuffer(array.buffers()[1], dtype=np.int64)[array.offset:array.offset + len(array) + 1]
+        data = np.frombuffer(array.buffers()[2], dtype=np.uint8) if array.buffers()[2] is not None else np.zeros(0, np.uint8)
+        k = self.shingle_size
+
+        lengths = np.diff(offsets)
+        counts = np.where(lengths > 0, np.maximum(lengths - k + 1, 1), 0)
+        owner = np.repeat(np.arange(len(counts), dtype=np.uint64), counts)
+        starts = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + offsets[:-1][owner.astype(np.int64)]
+        ends = offsets[1:][owner.astype(np.int64)]
+        padded = np.concatenate([data, np.zeros(k, dtype=np.uint8)])
+        packed = np.zeros(len(starts), dtype=np.uint64)
+        for j in range(k):
+            byte = padded[starts + j].astype(np.uint64)
+            byte[starts + j >= ends] = 0
+            packed |= byte << np.uint64(8 * j)
+
+        # Sort (record, hash) keys once to drop repeated shingles within each record
+        keys = np.sort((owner << np.uint64(32)) | (_mix(packed) >> np.uint64(32)))
+        keys = keys[np.r_[True, keys[1:] != keys[:-1]]] if len(keys) else keys
+        counts = np.bincount((keys >> np.uint64(32)).astype(np.int64), minlength=len(counts))
+        return (keys & np.uint64(0xFFFFFFFF)).astype(np.uint32), counts
+
+    def signatures(self, values, counts, progress_callback=None):
+        """(records x num_perm) uint32 MinHash signatures; records without shingles keep the max value."""
+        signatures = np.full((len(counts), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        per_batch = max(1, BATCH_CELLS // self.num_perm)
+        scratch = np.empty((self.num_perm, per_batch), dtype=np.uint64)
+
+        first = 0
+        while first < len(counts):
+            # Whole records, about ``per_batch`` shingles at a time
+            last = max(first + 1, int(np.searchsorted(ends, starts[first] + per_batch, side="right")))
+            batch = np.arange(first, last)
+            batch = batch[counts[batch] > 0]
+            if len(batch):
+                block = values[starts[batch[0]]:ends[batch[-1]]].astype(np.uint64)
+                hashed = scratch[:, :len(block)] if len(block) <= per_batch else np.empty((self.num_perm, len(block)), np.uint64)
+                np.multiply(self.a[:, None], block[None, :], out=hashed)
+                hashed += self.b[:, None]
+                # The minimum of the 64-bit values keeps the minimum of their top 32 bits
+                minima = np.minimum.reduceat(hashed, starts[batch] - starts[batch[0]], axis=1)
+                signatures[batch] = (minima >> np.uint64(32)).T
+            if progress_callback is not None:
+                progress_callback("MinHash signatures", last / len(counts))
+            first = last
+        return signatures
+
+    def candidate_pairs(self, signatures, valid):
+        """
+        Pairs (i, j), i < j, of signatures sharing an LSH bucket. Buckets can be
+        large (many records share common shingles), so members are ordered by
+        the key of the next band as well and each is paired with its
+        ``BUCKET_NEIGHBORS`` predecessors in the bucket: records agreeing on
+        more bands sit next to each other, and a bucket costs linear work.
+        """
+        rows = np.flatnonzero(valid)
+        keys = np.empty((self.bands, len(rows)), dtype=np.uint64)
+        for band in range(self.bands):
+            block = signatures[rows, band * self.band_rows:(band + 1) * self.band_rows].astype(np.uint64)
+            keys[band] = (block * self.band_weights).sum(axis=1)
+
+        found = []
+        for band in range(self.bands):
+            order = np.lexsort((keys[(band + 1) % self.bands], keys[band]))
+            bucket = keys[band][order]
+            for offset in range(1, BUCKET_NEIGHBORS + 1):
+                same = np.flatnonzero(bucket[offset:] == bucket[:-offset])
+                found.append(np.column_stack([order[same], order[same + offset]]))
+        pairs = rows[np.concatenate(found)] if found else np.zeros((0, 2), dtype=np.int64)
+        low, high = pairs.min(axis=1).astype(np.int64), pairs.max(axis=1).astype(np.int64)
+        # Sort + dedupe; much faster than np.unique's hashing on tens of millions of codes
+        codes = np.sort(low * len(signatures) + high)
+        codes = codes[np.concatenate([[True], codes[1:] != codes[:-1]])] if len(codes) else codes
+        return np.column_stack([codes // len(signatures), codes % len(signatures)])
+
+    def estimate(self, signatures, pairs):
+        """Estimated Jaccard similarity of each pair: the share of equal signature values."""
+        scores = np.empty(len(pairs))
+        step = max(1, BATCH_CELLS // self.num_perm)
+        for start in range(0, len(pairs), step):
+            a, b = pairs[start:start + step, 0], pairs[start:start + step, 1]
+            scores[start:start + step] = (signatures[a] == signatures[b]).mean(axis=1)
+        return scores
+
+    @staticmethod
+    def jaccard(values, counts, pairs):
+        """Exact Jaccard similarity of the shingle sets of each pair, in batches of pairs."""
+        scores = np.empty(len(pairs))
+        starts = np.cumsum(counts) - counts
+        sizes = counts[pairs[:, 0]] + counts[pairs[:, 1]]
+        ends = np.cumsum(sizes)
+        first = 0
+        while first < len(pairs):
+            last = max(first + 1, int(np.searchsorted(ends, ends[first] - sizes[first] + BATCH_CELLS, side="right")))
+            # Both sets of every pair, tagged with the pair, sorted once
+            members = pairs[first:last].T.ravel()
+            lengths = counts[members]
+            pair_of = np.tile(np.arange(last - first, dtype=np.uint64), 2)
+            positions = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) \
+                + np.repeat(starts[members], lengths)
+            keys = np.sort((np.repeat(pair_of, lengths) << np.uint64(32)) | values[positions].astype(np.uint64))
+            shared = np.bincount((keys[1:][keys[1:] == keys[:-1]] >> np.uint64(32)).astype(np.int64),
+                                 minlength=last - first)
+            union = sizes[first:last] - shared
+            scores[first:last] = np.where(union > 0, shared / np.maximum(union, 1), 0.0)
+            first = last
+        return scores
+
+    def detect(self, df, columns=None, progress_callback=None):
+        from scipy.sparse import coo_matrix  # scipy is imported on demand
+        from scipy.sparse.csgraph import connected_components
+
+        columns = self.default_columns(df) if columns is None else list(columns)
+        records = normalize_records(df, columns)
+        codes, uniques = pd.factorize(records)
+        empty = np.asarray(uniques == "", dtype=bool)
+
+        values, counts = self.shingles(np.asarray(uniques, dtype=object))
+        signatures = self.signatures(values, counts, progress_callback)
+        if progress_callback is not None:
+            progress_callback("LSH buckets", 1.0)
+        pairs = self.candidate_pairs(signatures, ~empty)
+        if progress_callback is not None:
+            progress_callback("Verifying candidate pairs", 1.0)
+        # Candidates whose signatures are far below the threshold (beyond two
+        # standard errors of the estimate) are dropped before the exact check
+        margin = 2 * np.sqrt(self.threshold * (1 - self.threshold) / self.num_perm)
+        pairs = pairs[self.estimate(signatures, pairs) >= self.threshold - margin]
+        scores = self.jaccard(values, counts, pairs)
+        linked = scores >= self.threshold
+        pairs, scores = pairs[linked], scores[linked]
+
+        # Clusters of distinct strings, then of rows (identical strings are similarity 1)
+        graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(len(uniques), len(uniques)))
+        _, component = connected_components(graph, directed=False)
+        best = np.zeros(len(uniques))
+        np.maximum.at(best, pairs[:, 0], scores)
+        np.maximum.at(best, pairs[:, 1], scores)
+        copies = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        best[copies > 1] = 1.0
+
+        row_component = np.where(codes >= 0, component[np.maximum(codes, 0)], -1)
+        row_component[(codes < 0) | empty[np.maximum(codes, 0)]] = -1
+        sizes = np.bincount(row_component[row_component >= 0], minlength=len(uniques))
+        in_cluster = np.flatnonzero((row_component >= 0) & (sizes[np.maximum(row_component, 0)] > 1))
+
+        # Number clusters by their first row; that row is kept, the others are redundant
+        order = in_cluster[np.argsort(row_component[in_cluster], kind="stable")]
+        first_of_cluster = np.ones(len(order), dtype=bool)
+        first_of_cluster[1:] = row_component[order[1:]] != row_component[order[:-1]]
+        cluster_ids = np.cumsum(first_of_cluster) - 1
+        by_first_row = np.argsort(order[first_of_cluster], kind="stable")
+        renumber = np.empty_like(by_first_row)
+        renumber[by_first_row] = np.arange(len(by_first_row))
+        cluster_ids = renumber[cluster_ids]
+
+        clusters = pd.DataFrame({
+            "Row": df.index[order],
+            "Cluster": cluster_ids,
+            "Similarity": best[codes[order]].round(3),
+        }, columns=CLUSTER_COLUMNS).sort_values(["Cluster", "Row"], kind="stable").reset_index(drop=True)
+        representative = pd.Series(np.flatnonzero(codes >= 0), dtype=np.int64).groupby(codes[codes >= 0]).first()
+        pair_frame = pd.DataFrame({
+            "Row A": df.index[representative.reindex(pairs[:, 0]).to_numpy()],
+            "Row B": df.index[representative.reindex(pairs[:, 1]).to_numpy()],
+            "Similarity": scores.round(3),
+        }, columns=PAIR_COLUMNS)
+        return NearDuplicateResult(clusters, pair_frame, np.sort(order[~first_of_cluster]), len(df), self.threshold, columns)
+
+
+def drop_near_duplicates(df, columns=None, threshold=0.8):
+    """
+    ``df`` with only the first row of every near-duplicate cluster; without
+    ``columns`` the record-like text columns are compared, and a frame without
+    any is returned unchanged.
+    """
+    return NearDuplicateDetector(threshold=threshold).detect(df, columns).drop(df)
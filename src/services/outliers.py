@@ -0,0 +1,200 @@
+import contextlib
+import warnings
+import numpy as np
+import pandas as pd
+from config.settings import CHUNK_SIZE
+from services.bitmaps import RowBitmap
+
+# Modified z-score of Iglewicz & Hoaglin: 0.6745 * (x - median) / MAD
+MAD_SCALE = 0.6745
+# Mean absolute deviation -> MAD-equivalent scale, used when the MAD is zero
+MEAN_AD_SCALE = 1.253314
+
+
+@contextlib.contextmanager
+def _quiet_nan_warnings():
+    """Silences 'All-NaN slice' / 'Degrees of freedom' warnings for empty columns."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        yield
+
+
+class OutlierResult:
+    """
+    Outcome of an outlier scan: per-column counts and fences, plus a packed
+    bitmap of the rows flagged in any column (or by the multivariate model).
+    """
+
+    def __init__(self, method, columns, counts, min_outlier, max_outlier, lower, upper, rows, integer_columns=()):
+        self.method = method
+        self.columns = list(columns)
+        self.counts = counts
+        self.min_outlier = min_outlier
+        self.max_outlier = max_outlier
+        self.lower = lower
+        self.upper = upper
+        self.rows = rows
+        self.integer_columns = set(integer_columns)
+
+    def _value(self, col, value):
+        return int(value) if col in self.integer_columns else value
+
+    def report(self):
+        """{column: {"Outlier Count", "Min Outlier", "Max Outlier"}} for columns with outliers."""
+        report = {}
+        for i, col in enumerate(self.columns):
+            if self.counts[i]:
+                report[col] = {
+                    "Outlier Count": int(self.counts[i]),
+                    "Min Outlier": self._value(col, self.min_outlier[i]),
+                    "Max Outlier": self._value(col, self.max_outlier[i]),
+                }
+        return report
+
+    def summary(self):
+        return pd.DataFrame({
+            "Outlier Count": self.counts,
+            "Lower Fence": self.lower,
+            "Upper Fence": self.upper,
+            "Min Outlier": np.where(self.counts > 0, self.min_outlier, np.nan),
+            "Max Outlier": np.where(self.counts > 0, self.max_outlier, np.nan),
+        }, index=pd.Index(self.columns, name="Column"))
+
+    @property
+    def row_count(self):
+        """Rows flagged as outliers in at least one column."""
+        return self.rows.count()
+
+
+class OutlierEngine:
+    """
+    Univariate outlier detection for all numeric columns at once.
+
+    Fences are computed with column-wise NumPy reductions over the 2-D value
+    matrix, then rows are compared against them chunk by chunk:
+
+    - ``iqr``: [Q1 - k*IQR, Q3 + k*IQR]
+    - ``zscore``: mean +/- z * std
+    - ``mad``: median +/- t * MAD / 0.6745 (modified z-score)
+    """
+
+    METHODS = ("iqr", "zscore", "mad")
+
+    def __init__(self, method="iqr", iqr_factor=1.5, z_threshold=3.0, mad_threshold=3.5, chunk_size=CHUNK_SIZE):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown outlier method '{method}'. Choose from {', '.join(self.METHODS)}")
+        self.method = method
+        self.iqr_factor = iqr_factor
+        self.z_threshold = z_threshold
+        self.mad_threshold = mad_threshold
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def numeric_matrix(df, columns=None):
+        """(columns, float64 matrix) for the numeric columns of ``df``; missing values become NaN."""
+        columns = list(columns) if columns is not None else df.select_dtypes(include=["number"]).columns.tolist()
+        if not columns:
+            return columns, np.empty((len(df), 0))
+        return columns, df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def fences(self, values):
+        """Per-column (lower, upper) fences for a 2-D array."""
+        with np.errstate(invalid="ignore"), _quiet_nan_warnings():
+            if self.method == "iqr":
+                q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+                spread = self.iqr_factor * (q3 - q1)
+                return q1 - spread, q3 + spread
+            if self.method == "zscore":
+                mean = np.nanmean(values, axis=0)
+                spread = self.z_threshold * np.nanstd(values, axis=0, ddof=1)
+                return mean - spread, mean + spread
+
+            median = np.nanmedian(values, axis=0)
+            deviation = np.abs(values - median)
+            mad = np.nanmedian(deviation, axis=0)
+            scale = np.where(mad > 0, mad / MAD_SCALE, MEAN_AD_SCALE * np.nanmean(deviation, axis=0))
+            spread = self.mad_threshold * scale
+            return median - spread, median + spread
+
+    def detect(self, df, columns=None):
+        columns, values = self.numeric_matrix(df, columns)
+        lower, upper = self.fences(values) if columns else (np.empty(0), np.empty(0))
+
+        counts = np.zeros(len(columns), dtype=np.int64)
+        min_outlier = np.full(len(columns), np.inf)
+        max_outlier = np.full(len(columns), -np.inf)
+        rows = RowBitmap()
+        for start in range(0, len(values), self.chunk_size):
+            block = values[start:start + self.chunk_size]
+            # NaN compares False on both sides, so missing values are never outliers
+            mask = (block < lower) | (block > upper)
+            counts += mask.sum(axis=0)
+            min_outlier = np.minimum(min_outlier, np.where(mask, block, np.inf).min(axis=0, initial=np.inf))
+            max_outlier = np.maximum(max_outlier, np.where(mask, block, -np.inf).max(axis=0, initial=-np.inf))
+            rows.append(mask.any(axis=1))
+
+        integer_columns = [col for col in columns if pd.api.types.is_integer_dtype(df[col])]
+        return OutlierResult(self.method, columns, counts, min_outlier, max_outlier, lower, upper, rows, integer_columns)
+
+
+class IsolationForestDetector:
+    """
+    Multivariate outliers with an Isolation Forest trained on a bounded
+    random subsample and applied to the full dataset chunk by chunk, so
+    training cost does not grow with the number of rows.
+    """
+
+    def __init__(self, max_train_rows=10_000, n_estimators=100, contamination=0.01, random_state=0, chunk_size=CHUNK_SIZE):
+        self.max_train_rows = max_train_rows
+        self.n_estimators = n_estimators
+        self.contamination = contamination
+        self.random_state = random_state
+        self.chunk_size = chunk_size
+        self.model = None
+        self.columns = None
+        self.fill_values = None
+
+    def fit(self, df, columns=None):
+        from sklearn.ensemble import IsolationForest  # scikit-learn is imported on demand
+
+        self.columns, values = OutlierEngine.numeric_matrix(df, columns)
+        if not self.columns:
+            raise ValueError("Isolation Forest needs at least one numeric column")
+        with _quiet_nan_warnings():
+            self.fill_values = np.nan_to_num(np.nanmedian(values, axis=0))
+
+        train = values
+        if len(values) > self.max_train_rows:
+            rng = np.random.default_rng(self.random_state)
+            sample = rng.choice(len(values), self.max_train_rows, replace=False)
+            # Add each column's extreme rows so split ranges span the whole dataset;
+            # otherwise values beyond the sample's range can never be isolated
+            filled = self._fill(values)
+            extremes = np.concatenate([filled.argmin(axis=0), filled.argmax(axis=0)])
+            train = values[np.union1d(sample, extremes)]
+        self.model = IsolationForest(
+            n_estimators=self.n_estimators,
+            max_samples=min(256, len(train)),
+            contamination=self.contamination,
+            random_state=self.random_state,
+        ).fit(self._fill(train))
+        return self
+
+    def _fill(self, values):
+        return np.where(np.isnan(values), self.fill_values, values)
+
+    def score_chunks(self, df):
+        """Yields (anomaly scores, outlier mask) per chunk; lower scores are more anomalous."""
+        for start in range(0, len(df), self.chunk_size):
+            block = self._fill(df[self.columns].iloc[start:start + self.chunk_size].to_numpy(dtype=np.float64, na_value=np.nan))
+            scores = self.model.decision_function(block)
+            yield scores, scores < 0
+
+    def detect(self, df, columns=None):
+        if self.model is None:
+            self.fit(df, columns)
+        rows = RowBitmap()
+        for _, mask in self.score_chunks(df):
+            rows.append(mask)
+        return rows
+
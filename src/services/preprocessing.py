@@ -120,8 +120,24 @@
 
 #         return df
 
+import numpy as np
 import pandas as pd
 import streamlit as st
+from services.dtypes import TEXT_DTYPES, is_text_dtype
+from services.encoding import CategoricalEncoder
+from services.scaling import FeatureScaler
+
+def is_numeric_column(series):
+    """Numeric (NumPy or nullable) and not boolean."""
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def _fill_value(series, value):
+    """Rounds a mean/median fill value for nullable integer columns, which reject fractions."""
+    if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) and pd.api.types.is_integer_dtype(series) and pd.notna(value):
+        return round(value)
+    return value
+
 
 class DataPreprocessing:
     def recommend_null_filling(self, df):
@@ -142,9 +158,9 @@ class DataPreprocessing:
             if null_percentage > 40:
                 recommendations[col] = 'Drop Column'  # Suggest dropping the column
             else:
-                if df[col].dtype == 'object':
+                if is_text_dtype(df[col].dtype):
                     recommendations[col] = 'Mode'  # Most frequent category
-                elif df[col].dtype in ['int64', 'float64']:
+                elif is_numeric_column(df[col]):
                     if df[col].skew() > 1:
                         recommendations[col] = 'Median'  # Best for skewed data
                     else:
@@ -173,7 +189,7 @@ class DataPreprocessing:
             # Default options
             if suggestion == "Drop Column":
                 options = ["Drop Column", "Keep & Fill"]
-            elif df[col].dtype in ['int64', 'float64']:
+            elif is_numeric_column(df[col]):
                 options = ["Mean", "Median", "Mode", "Custom Value", "Drop Column"]
             else:
                 options = ["Mode", "Unknown", "Custom Value", "Drop Column"]
@@ -192,7 +208,7 @@ class DataPreprocessing:
 
             # If "Keep & Fill" is selected, provide additional options
             if selected_method == "Keep & Fill":
-                if df[col].dtype in ['int64', 'float64']:
+                if is_numeric_column(df[col]):
                     fill_options = ["Mean", "Median", "Mode", "Custom Value"]
                 else:
                     fill_options = ["Mode", "Unknown", "Custom Value"]
@@ -236,32 +252,145 @@ class DataPreprocessing:
         
         return df
 
-    def fill_missing_values(self, df, selected_methods):
+    def display_scaling_options(self, df):
         """
-        Applies selected null value handling options to the dataframe safely.
+        Displays UI for selecting a feature scaling method and the columns to scale.
+        Returns (method, columns) or (None, []) when scaling is disabled.
+        """
+        numerical_cols = df.select_dtypes(include=["number"]).columns.tolist()
+
+        if not numerical_cols:
+            st.info("No numerical columns available for scaling.")
+            return None, []
+
+        labels = {"None": None, "Min-Max Scaling": "minmax", "Standardization": "standard"}
+        choice = st.selectbox("Select a scaling method:", list(labels.keys()))
+        if labels[choice] is None:
+            return None, []
+
+        columns = st.multiselect("Columns to scale:", numerical_cols, default=numerical_cols)
+        return labels[choice], columns
+
+    def scale_columns(self, df, method, columns):
+        """
+        Fits a FeatureScaler on the selected columns. Returns (scaled copy, fitted
+        scaler); ``df`` is left untouched, since background jobs may still read it.
+        """
+        scaler = FeatureScaler(method=method, columns=columns)
+        scaler.fit(df)
+        return scaler.transform(df), scaler
+
+    def display_encoding_options(self, df):
+        """
+        Displays UI for selecting a categorical encoding and the columns to encode.
+        Returns (method, columns, n_hash_features) or (None, [], None) when encoding is disabled.
+        """
+        categorical_cols = df.select_dtypes(include=TEXT_DTYPES).columns.tolist()
+
+        if not categorical_cols:
+            st.info("No categorical columns available for encoding.")
+            return None, [], None
+
+        labels = {"None": None, "One-Hot (sparse)": "onehot", "Ordinal": "ordinal",
+                  "Frequency": "frequency", "Hashed": "hashed"}
+        choice = st.selectbox("Select an encoding method:", list(labels.keys()))
+        if labels[choice] is None:
+            return None, [], None
+
+        columns = st.multiselect("Columns to encode:", categorical_cols, default=categorical_cols)
+        n_hash_features = None
+        if labels[choice] == "hashed":
+            n_hash_features = st.number_input("Number of hash features:", min_value=8, max_value=2 ** 20, value=1024, step=256)
+        return labels[choice], columns, n_hash_features
+
+    def encode_columns(self, df, method, columns, n_hash_features=None):
+        """
+        Fits a CategoricalEncoder on the selected columns. Returns (frame, fitted
+        encoder): for ordinal and frequency a copy with the codes replacing the
+        columns, for one-hot and hashed ``df`` itself (see ``encoder.transform_sparse``).
+        """
+        encoder = CategoricalEncoder(method=method, columns=columns, n_hash_features=n_hash_features or 1024)
+        encoder.fit(df)
+        if method in CategoricalEncoder.SPARSE_METHODS:
+            return df, encoder
+        return encoder.transform(df), encoder
+
+    def apply_fill_methods(self, df, selected_methods, progress_callback=None):
+        """
+        Applies selected null value handling options without touching the UI,
+        so it can run as a background job.
+        Returns (df, errors, dropped_columns).
         """
         columns_to_drop = []
+        errors = {}
 
-        for col, method in selected_methods.items():
+        for i, (col, method) in enumerate(selected_methods.items()):
+            if progress_callback is not None:
+                progress_callback(f"Filling '{col}'", i / max(len(selected_methods), 1))
             try:
                 if method == "Mean":
-                    df[col].fillna(df[col].mean(), inplace=True)
+                    df[col] = df[col].fillna(_fill_value(df[col], df[col].mean()))
                 elif method == "Median":
-                    df[col].fillna(df[col].median(), inplace=True)
+                    df[col] = df[col].fillna(_fill_value(df[col], df[col].median()))
                 elif method == "Mode":
-                    df[col].fillna(df[col].mode()[0], inplace=True)
+                    df[col] = df[col].fillna(df[col].mode()[0])
                 elif method == "Unknown":
-                    df[col].fillna("Unknown", inplace=True)
+                    df[col] = df[col].fillna("Unknown")
                 elif method == "Drop Column":
                     columns_to_drop.append(col)
                 else:
-                    df[col].fillna(method, inplace=True)  # Custom value
+                    df[col] = df[col].fillna(method)  # Custom value
             except Exception as e:
-                st.error(f"⚠ Error filling missing values for '{col}': {str(e)}")
+                errors[col] = str(e)
 
         # Drop columns at the end to avoid modifying dataframe while iterating
         if columns_to_drop:
             df.drop(columns=columns_to_drop, inplace=True)
+
+        return df, errors, columns_to_drop
+
+    def fill_missing_values(self, df, selected_methods):
+        """
+        Applies selected null value handling options to the dataframe safely.
+        """
+        df, errors, columns_to_drop = self.apply_fill_methods(df, selected_methods)
+
+        for col, error in errors.items():
+            st.error(f"⚠ Error filling missing values for '{col}': {error}")
+        if columns_to_drop:
             st.success(f"✅ Dropped columns: {', '.join(columns_to_drop)}")
 
         return df
+
+def handle_missing_values(df, method="mean"):
+    """
+    Returns a copy of ``df`` with missing values handled by a single method
+    (mean, median, mode or drop) applied to every column.
+    """
+    if method == "drop":
+        return df.dropna()
+
+    df_filled = df.copy()
+    numerical_cols = df_filled.select_dtypes(include=["number"]).columns
+
+    if method in ("mean", "median"):
+        stats = df_filled[numerical_cols].agg(method)
+        for col in numerical_cols:
+            df_filled[col] = df_filled[col].fillna(_fill_value(df_filled[col], stats[col]))
+    elif method == "mode":
+        modes = df_filled.mode()
+        if not modes.empty:
+            df_filled = df_filled.fillna(modes.iloc[0])
+    else:
+        raise ValueError(f"Unknown missing value method '{method}'")
+
+    return df_filled
+
+
+def scale_features(df, method="minmax", columns=None, inplace=False, dtype=np.float32):
+    """
+    Scales numerical columns with Min-Max scaling ("minmax") or
+    Standardization ("standard") using a freshly fitted FeatureScaler.
+    """
+    scaler = FeatureScaler(method=method, columns=columns)
+    return scaler.fit_transform(df, inplace=inplace, dtype=dtype)
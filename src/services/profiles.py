@@ -0,0 +1,493 @@
+import io
+import json
+import math
+from functools import reduce
+import numpy as np
+import pandas as pd
+from services.sketches import HyperLogLog, MisraGries, hash_values
+
+PROFILE_FORMAT_VERSION = 1
+PROFILE_HLL_PRECISION = 12
+PROFILE_TOP_VALUES = 100
+HISTOGRAM_RELATIVE_ACCURACY = 0.02
+
+# Population Stability Index bands commonly used for drift alerts
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+
+def _plain(value):
+    """Keeps values JSON-serializable so top-value keys survive a round trip."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class LogHistogram:
+    """
+    Mergeable histogram with logarithmic buckets (``relative_accuracy``).
+    Bucket boundaries depend only on the accuracy, so histograms built on
+    different partitions line up and merge by adding counts.
+    """
+
+    def __init__(self, relative_accuracy=HISTOGRAM_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero = 0
+
+    def _add_keys(self, store, magnitudes):
+        keys, counts = np.unique(np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        tiny = np.abs(values) < 1e-12
+        self.zero += int(np.count_nonzero(tiny))
+        values = values[~tiny]
+        if values.size:
+            if (values > 0).any():
+                self._add_keys(self.positive, values[values > 0])
+            if (values < 0).any():
+                self._add_keys(self.negative, -values[values < 0])
+        return self
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge histograms with different relative accuracy")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_store.items():
+                store[key] = store.get(key, 0) + count
+        self.zero += other.zero
+        return self
+
+    def bins(self):
+        """(representative values, counts) in increasing value order."""
+        neg_keys = sorted(self.negative, reverse=True)
+        pos_keys = sorted(self.positive)
+        values = [-self._value(k) for k in neg_keys] + ([0.0] if self.zero else []) + [self._value(k) for k in pos_keys]
+        counts = [self.negative[k] for k in neg_keys] + ([self.zero] if self.zero else []) + [self.positive[k] for k in pos_keys]
+        return np.asarray(values, dtype=np.float64), np.asarray(counts, dtype=np.int64)
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    @property
+    def total(self):
+        return self.zero + sum(self.positive.values()) + sum(self.negative.values())
+
+    def quantile(self, q):
+        values, counts = self.bins()
+        if not len(values):
+            return None
+        position = np.searchsorted(np.cumsum(counts), q * (counts.sum() - 1), side="right")
+        return float(values[min(position, len(values) - 1)])
+
+    def to_arrays(self):
+        return {
+            "pos_keys": np.fromiter(self.positive.keys(), dtype=np.int64, count=len(self.positive)),
+            "pos_counts": np.fromiter(self.positive.values(), dtype=np.int64, count=len(self.positive)),
+            "neg_keys": np.fromiter(self.negative.keys(), dtype=np.int64, count=len(self.negative)),
+            "neg_counts": np.fromiter(self.negative.values(), dtype=np.int64, count=len(self.negative)),
+        }
+
+    def load_arrays(self, arrays, zero):
+        self.positive = dict(zip(arrays["pos_keys"].tolist(), arrays["pos_counts"].tolist()))
+        self.negative = dict(zip(arrays["neg_keys"].tolist(), arrays["neg_counts"].tolist()))
+        self.zero = int(zero)
+        return self
+
+
+class FixedWidthHistogram(LogHistogram):
+    """
+    Mergeable histogram with equal-width buckets aligned at zero. Used for
+    timestamps, where relative accuracy on epoch values would be far too coarse.
+    """
+
+    def __init__(self, width):
+        super().__init__()
+        self.width = float(width)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if values.size:
+            self._add_keys(self.positive, values)
+        return self
+
+    def _add_keys(self, store, values):
+        keys, counts = np.unique(np.floor(values / self.width).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+
+    def merge(self, other):
+        if other.width != self.width:
+            raise ValueError("Cannot merge histograms with different bucket widths")
+        return super().merge(other)
+
+    def _value(self, key):
+        return (key + 0.5) * self.width
+
+
+class ColumnProfile:
+    """
+    Summary of one column: counts, moments (Chan et al. parallel update),
+    a HyperLogLog distinct count, top values and, for numeric columns,
+    a log-bucket histogram. Every part merges associatively.
+    """
+
+    NUMERIC = "numeric"
+    DATETIME = "datetime"
+    CATEGORICAL = "categorical"
+
+    def __init__(self, name, dtype, kind):
+        self.name = name
+        self.dtype = dtype
+        self.kind = kind
+        self.count = 0
+        self.missing = 0
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.distinct = HyperLogLog(PROFILE_HLL_PRECISION)
+        self.top_values = MisraGries(PROFILE_TOP_VALUES)
+        self.histogram = self._histogram_for(kind)
+
+    @staticmethod
+    def _histogram_for(kind):
+        if kind == ColumnProfile.NUMERIC:
+            return LogHistogram()
+        if kind == ColumnProfile.DATETIME:
+            return FixedWidthHistogram(86400)  # one bucket per day
+        return None
+
+    @staticmethod
+    def kind_of(series):
+        if pd.api.types.is_bool_dtype(series):
+            return ColumnProfile.CATEGORICAL
+        if pd.api.types.is_numeric_dtype(series):
+            return ColumnProfile.NUMERIC
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return ColumnProfile.DATETIME
+        return ColumnProfile.CATEGORICAL
+
+    @classmethod
+    def for_series(cls, series):
+        """Profile of ``series``; its kind stays None until a non-missing value is seen."""
+        kind = cls.kind_of(series) if series.notna().any() else None
+        return cls(str(series.name), str(series.dtype), kind)
+
+    def _resolve_kind(self, kind, dtype):
+        """
+        Adopts ``kind`` when none is known yet (all values so far missing);
+        a column seen with two kinds (e.g. numbers, then text) becomes
+        categorical and keeps its counts, not its moments or histogram.
+        """
+        if self.kind is None:
+            self.kind, self.dtype = kind, dtype
+            self.histogram = self._histogram_for(kind)
+        elif kind is not None and kind != self.kind:
+            self.kind, self.dtype = ColumnProfile.CATEGORICAL, "object"
+            self.n, self.mean, self.m2, self.min, self.max = 0, 0.0, 0.0, None, None
+            self.histogram = None
+
+    def update(self, series):
+        values = series.dropna()
+        self.count += len(series)
+        self.missing += len(series) - len(values)
+        if values.empty:
+            return self
+        self._resolve_kind(self.kind_of(values), str(series.dtype))
+
+        if self.kind == ColumnProfile.CATEGORICAL:
+            # Profile as strings so partitions with differently inferred dtypes agree
+            values = values.astype(str)
+            self.distinct.add_hashes(hash_values(values))
+            self.top_values.add_counts(values.value_counts())
+            return self
+
+        if self.kind == ColumnProfile.DATETIME:
+            numbers = pd.DatetimeIndex(values).as_unit("ns").asi8 / 1e9  # epoch seconds
+        else:
+            numbers = values.to_numpy(dtype=np.float64)
+        self.distinct.add_hashes(pd.util.hash_array(numbers))
+        self.histogram.update(numbers)
+        numbers = numbers[np.isfinite(numbers)]
+        if numbers.size:
+            self._merge_moments(numbers.size, float(numbers.mean()), float(((numbers - numbers.mean()) ** 2).sum()),
+                                float(numbers.min()), float(numbers.max()))
+        return self
+
+    def _merge_moments(self, n, mean, m2, low, high):
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.n = total
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def merge(self, other):
+        self._resolve_kind(other.kind, other.dtype)
+        self.count += other.count
+        self.missing += other.missing
+        if other.kind == self.kind:
+            if other.n:
+                self._merge_moments(other.n, other.mean, other.m2, other.min, other.max)
+            if self.histogram is not None:
+                self.histogram.merge(other.histogram)
+        self.distinct.merge(other.distinct)
+        self.top_values.merge(other.top_values)
+        return self
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else None
+
+    def summary(self):
+        row = {
+            "Column": self.name,
+            "Type": self.dtype,
+            "Rows": self.count,
+            "Missing %": 100 * self.missing / self.count if self.count else 0.0,
+            "Distinct (approx.)": self.distinct.estimate(),
+            "Mean": None, "Std": None, "Min": None, "Median (approx.)": None, "Max": None,
+            "Top Value": None,
+        }
+        if self.kind == ColumnProfile.CATEGORICAL:
+            top = self.top_values.top_k(1)
+            row["Top Value"] = top[0][0] if top else None
+        elif self.n:
+            stats = {"Mean": self.mean, "Std": self.std, "Min": self.min,
+                     "Median (approx.)": self.histogram.quantile(0.5), "Max": self.max}
+            if self.kind == ColumnProfile.DATETIME:
+                stats = {k: pd.to_datetime(v, unit="s") if v is not None and k != "Std" else v for k, v in stats.items()}
+            row.update(stats)
+        return row
+
+    def _header(self):
+        return {
+            "name": self.name, "dtype": self.dtype, "kind": self.kind,
+            "count": self.count, "missing": self.missing,
+            "n": self.n, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max,
+            "top_values": [[_plain(k), v] for k, v in self.top_values.counters.items()],
+            "top_total": self.top_values.total, "top_error": self.top_values.error_bound,
+            "histogram_zero": self.histogram.zero if self.histogram is not None else None,
+        }
+
+    @classmethod
+    def _from_header(cls, header, arrays):
+        profile = cls(header["name"], header["dtype"], header["kind"])
+        for key in ("count", "missing", "n", "mean", "m2", "min", "max"):
+            setattr(profile, key, header[key])
+        profile.top_values.counters = {k: v for k, v in header["top_values"]}
+        profile.top_values.total = header["top_total"]
+        profile.top_values.error_bound = header["top_error"]
+        profile.distinct = HyperLogLog.from_bytes(arrays["hll"].tobytes())
+        if profile.histogram is not None:
+            profile.histogram.load_arrays(arrays, header["histogram_zero"])
+        return profile
+
+
+class DatasetProfile:
+    """
+    Compact, mergeable profile of a dataset. Profiles of partitions (chunks,
+    files, days) can be built independently and reduced with ``merge``; the
+    result is the same as profiling the concatenated data, up to sketch error.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.columns = {}
+
+    @classmethod
+    def from_dataframe(cls, df):
+        return cls().update(df)
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        profile = cls()
+        for chunk in chunks:
+            profile.update(chunk)
+        return profile
+
+    def update(self, df):
+        present = set()
+        for col in df.columns:
+            key = str(col)
+            if key not in self.columns:
+                self.columns[key] = ColumnProfile.for_series(df[col])
+                self.columns[key].count = self.columns[key].missing = self.rows  # absent so far
+            self.columns[key].update(df[col])
+            present.add(key)
+        for key, column in self.columns.items():
+            if key not in present:
+                column.count += len(df)
+                column.missing += len(df)
+        self.rows += len(df)
+        return self
+
+    def merge(self, other):
+        for key, column in other.columns.items():
+            if key in self.columns:
+                self.columns[key].merge(column)
+            else:
+                added = ColumnProfile(column.name, column.dtype, column.kind)
+                added.count = added.missing = self.rows
+                self.columns[key] = added.merge(column)
+        for key, column in self.columns.items():
+            if key not in other.columns:
+                column.count += other.rows
+                column.missing += other.rows
+        self.rows += other.rows
+        return self
+
+    @staticmethod
+    def merge_all(profiles):
+        """Reduces an iterable of profiles into a new one (inputs are left untouched)."""
+        return reduce(lambda acc, p: acc.merge(p), profiles, DatasetProfile())
+
+    def summary(self):
+        return pd.DataFrame([column.summary() for column in self.columns.values()])
+
+    def to_bytes(self):
+        """Serializes to an ``.npz`` container: a JSON header plus raw sketch arrays."""
+        header = {"version": PROFILE_FORMAT_VERSION, "rows": self.rows, "columns": []}
+        arrays = {}
+        for i, column in enumerate(self.columns.values()):
+            header["columns"].append(column._header())
+            arrays[f"c{i}_hll"] = column.distinct.to_bytes()
+            if column.histogram is not None:
+                for key, array in column.histogram.to_arrays().items():
+                    arrays[f"c{i}_{key}"] = array
+        arrays = {k: np.frombuffer(v, dtype=np.uint8) if isinstance(v, bytes) else v for k, v in arrays.items()}
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, header=np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8), **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, payload):
+        with np.load(io.BytesIO(payload), allow_pickle=False) as data:
+            header = json.loads(data["header"].tobytes().decode("utf-8"))
+            if header.get("version") != PROFILE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported profile format version: {header.get('version')}")
+            profile = cls()
+            profile.rows = header["rows"]
+            for i, column_header in enumerate(header["columns"]):
+                prefix = f"c{i}_"
+                arrays = {k[len(prefix):]: data[k] for k in data.files if k.startswith(prefix)}
+                column = ColumnProfile._from_header(column_header, arrays)
+                profile.columns[column.name] = column
+        return profile
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def _psi(expected, actual, eps=1e-4):
+    expected = np.clip(np.asarray(expected, dtype=np.float64), eps, None)
+    actual = np.clip(np.asarray(actual, dtype=np.float64), eps, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def _numeric_shares(histogram, edges):
+    values, counts = histogram.bins()
+    bins = np.bincount(np.searchsorted(edges, values, side="right"), weights=counts, minlength=len(edges) + 1)
+    return bins / max(bins.sum(), 1)
+
+
+def _categorical_shares(column, categories):
+    counts = np.array([column.top_values.counters.get(c, 0) for c in categories], dtype=np.float64)
+    present = max(column.count - column.missing, 1)
+    return np.append(counts, max(present - counts.sum(), 0)) / present  # last bucket: everything else
+
+
+def population_stability_index(baseline, current, bins=10, top_k=20):
+    """PSI between two ColumnProfiles of the same kind (quantile bins of the baseline)."""
+    if baseline.kind == ColumnProfile.CATEGORICAL:
+        categories = [value for value, _ in baseline.top_values.top_k(top_k)]
+        return _psi(_categorical_shares(baseline, categories), _categorical_shares(current, categories))
+
+    if not baseline.histogram.total or not current.histogram.total:
+        return None
+    edges = np.unique([baseline.histogram.quantile(q) for q in np.linspace(0, 1, bins + 1)[1:-1]])
+    return _psi(_numeric_shares(baseline.histogram, edges), _numeric_shares(current.histogram, edges))
+
+
+def compare_profiles(baseline, current, bins=10):
+    """
+    Compares two DatasetProfiles without touching the raw data.
+    Returns {"Schema Changes": DataFrame, "Distribution Drift": DataFrame}.
+    """
+    schema = []
+    for name in baseline.columns.keys() - current.columns.keys():
+        schema.append({"Column": name, "Change": "removed", "Baseline": baseline.columns[name].dtype, "Current": None})
+    for name in current.columns.keys() - baseline.columns.keys():
+        schema.append({"Column": name, "Change": "added", "Baseline": None, "Current": current.columns[name].dtype})
+
+    drift = []
+    for name in baseline.columns.keys() & current.columns.keys():
+        old, new = baseline.columns[name], current.columns[name]
+        if old.dtype != new.dtype:
+            schema.append({"Column": name, "Change": "type changed", "Baseline": old.dtype, "Current": new.dtype})
+        if old.kind != new.kind or old.kind is None:
+            continue
+
+        psi = population_stability_index(old, new, bins=bins)
+        if psi is None:
+            level = "n/a"
+        else:
+            level = "significant" if psi >= PSI_SIGNIFICANT else "moderate" if psi >= PSI_MODERATE else "stable"
+        old_summary, new_summary = old.summary(), new.summary()
+        drift.append({
+            "Column": name,
+            "PSI": psi,
+            "Drift": level,
+            "Missing % (baseline)": old_summary["Missing %"],
+            "Missing % (current)": new_summary["Missing %"],
+            "Distinct (baseline)": old_summary["Distinct (approx.)"],
+            "Distinct (current)": new_summary["Distinct (approx.)"],
+            "Mean (baseline)": old.mean if old.kind == ColumnProfile.NUMERIC and old.n else None,
+            "Mean (current)": new.mean if new.kind == ColumnProfile.NUMERIC and new.n else None,
+        })
+
+    schema_df = pd.DataFrame(schema, columns=["Column", "Change", "Baseline", "Current"])
+    drift_df = pd.DataFrame(drift)
+    if not drift_df.empty:
+        drift_df = drift_df.sort_values("PSI", ascending=False, na_position="last").reset_index(drop=True)
+    return {"Schema Changes": schema_df.sort_values("Column").reset_index(drop=True), "Distribution Drift": drift_df}
+
+
+def _profile_file(path, chunksize):
+    """Worker: profiles one file chunk by chunk and returns the serialized profile."""
+    from infrastructure.file_loader import ChunkedFileLoader
+
+    return DatasetProfile.from_chunks(ChunkedFileLoader(path, chunksize=chunksize)).to_bytes()
+
+
+def profile_files(paths, max_workers=None, chunksize=100_000):
+    """Profiles files (e.g. partitions of one dataset) in parallel processes and merges the results."""
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+
+    paths = [str(p) for p in paths]
+    if max_workers == 0 or len(paths) <= 1:
+        return DatasetProfile.merge_all(DatasetProfile.from_bytes(_profile_file(p, chunksize)) for p in paths)
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context("spawn")) as pool:
+        payloads = pool.map(_profile_file, paths, [chunksize] * len(paths))
+        return DatasetProfile.merge_all(DatasetProfile.from_bytes(p) for p in payloads)
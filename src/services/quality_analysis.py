@@ -1,7 +1,20 @@
 import pandas as pd
 import numpy as np
 import re
-from statsmodels.stats.outliers_influence import variance_inflation_factor
+from services.association import CategoricalAssociation
+from services.categorical_consistency import CategoricalConsistencyEngine
+from services.datetime_profile import DatetimeColumns, profile_datetimes
+from services.dtypes import TEXT_DTYPES, text_columns, replace_pattern, constant_like
+from services.key_discovery import KeyDiscovery
+from services.memory_governor import MemoryGovernor, column_bytes
+from services.sketches import HyperLogLog, MisraGries
+from services.missingness import MissingnessMatrix
+from services.near_duplicates import NearDuplicateDetector
+from services.outliers import OutlierEngine
+from services.sampling import (
+    sample_rows, scale_missing_report, scale_pattern_report, scale_co_missing_report, scale_duplicate_report,
+    scale_outlier_report,
+)
 
 class MissingValueAnalyzer:
     """Handles missing value analysis."""
@@ -12,6 +25,19 @@ class MissingValueAnalyzer:
         missing_percent = (missing_values / len(df)) * 100
         return pd.DataFrame({'Missing Values': missing_values, 'Percentage': missing_percent})
 
+    @staticmethod
+    def analyze_missing_patterns(df, top_patterns=10, top_pairs=20):
+        """
+        Which columns go missing together: the most frequent row-level
+        missing patterns and the column pairs most often missing together,
+        computed on packed null bitsets.
+        """
+        matrix = MissingnessMatrix.from_dataframe(df)
+        return {
+            "Row Patterns": matrix.row_patterns(top=top_patterns),
+            "Column Pairs": matrix.top_pairs(top=top_pairs),
+        }
+
 
 class DuplicateAnalyzer:
     """Handles duplicate row detection."""
@@ -21,37 +47,87 @@ class DuplicateAnalyzer:
         duplicate_count = df.duplicated().sum()
         return {"Total Duplicates": duplicate_count}
 
+    @staticmethod
+    def analyze_keys(df):
+        """Minimal column combinations that identify a row, near keys and functional dependencies."""
+        return KeyDiscovery().discover(df)
+
+    @staticmethod
+    def analyze_near_duplicates(df, columns=None, threshold=0.8):
+        """Rows that match another row up to casing, punctuation or small typos in the record-like text columns."""
+        return NearDuplicateDetector(threshold=threshold).detect(df, columns)
+
 
 class ClassImbalanceAnalyzer:
     """Handles class imbalance detection for categorical target columns."""
 
     @staticmethod
-    def analyze_class_imbalance(df, target_column):
+    def analyze_class_imbalance(df, target_column, max_classes=1000):
         if target_column not in df.columns:
             raise ValueError(f"Target column '{target_column}' not found in dataset")
 
-        class_counts = df[target_column].value_counts()
+        # Misra-Gries summary: exact up to ``max_classes`` classes, bounded memory beyond that
+        summary = MisraGries(capacity=max_classes).update(df[target_column])
+        classes, counts = zip(*summary.top_k()) if summary.counters else ((), ())
+        classes, counts = list(classes), list(counts)
+
+        if not summary.is_exact:
+            classes.append("Other (approx.)")
+            counts.append(summary.total - sum(counts))
+
         total_samples = len(df)
-        class_percentage = (class_counts / total_samples) * 100
+        class_percentage = (np.asarray(counts, dtype=np.float64) / total_samples) * 100
+
+        return pd.DataFrame({'Class': classes, 'Count': counts, 'Percentage': class_percentage})
+
 
-        return pd.DataFrame({'Class': class_counts.index, 'Count': class_counts.values, 'Percentage': class_percentage.values})
+class CardinalityAnalyzer:
+    """Estimates distinct counts and top values per column with mergeable sketches."""
+
+    @staticmethod
+    def analyze_cardinality(df, top_k=5):
+        rows = []
+        for col in df.columns:
+            distinct = HyperLogLog().update(df[col]).estimate()
+            top_values = MisraGries(capacity=max(50, top_k * 10)).update(df[col]).top_k(top_k)
+            non_null = int(df[col].notna().sum())
+            rows.append({
+                "Column": col,
+                "Distinct (approx.)": min(distinct, non_null),
+                "Distinct %": (min(distinct, non_null) / non_null) * 100 if non_null else 0.0,
+                "Top Values": ", ".join(f"{value} ({count})" for value, count in top_values),
+            })
+        return pd.DataFrame(rows, columns=["Column", "Distinct (approx.)", "Distinct %", "Top Values"])
 
 
 class DataAnonymizer:
     """Handles anonymization of sensitive data."""
 
     @staticmethod
-    def anonymize_data(df):
-        df_copy = df.copy()
-
-        # Anonymize Email
+    def anonymize_data(df, governor=None):
+        """
+        Masks e-mail addresses in text columns and replaces name columns. Only
+        the rewritten columns are allocated; the others are shared with ``df``,
+        which is left unchanged. The e-mail pass runs in row chunks when its
+        scratch memory would not fit the memory budget.
+        """
+        email_columns = text_columns(df)
+        name_columns = [col for col in df.columns if "name" in col.lower()]
+        sizes = column_bytes(df)
+        per_row = sizes[email_columns].sum() / max(len(df), 1)
+        plan = (governor or MemoryGovernor()).plan(
+            "Anonymization", len(df), per_row, fixed_bytes=sizes[email_columns + name_columns].sum(), chunkable=True
+        )
+        df_copy = df.copy(deep=False)
+
+        # Anonymize Email (text columns only; Arrow string columns stay string[pyarrow])
         email_pattern = r"[\w\.-]+@[\w\.-]+\.\w+"
-        df_copy = df_copy.replace(to_replace=email_pattern, value="*****@*****.com", regex=True)
+        for col in email_columns:
+            df_copy[col] = plan.map(df_copy[col], lambda chunk: replace_pattern(chunk, email_pattern, "*****@*****.com"))
 
         # Anonymize Names (Columns containing "Name")
-        name_columns = [col for col in df_copy.columns if "name" in col.lower()]
         for col in name_columns:
-            df_copy[col] = "Anonymous"
+            df_copy[col] = constant_like(df_copy[col], "Anonymous")
 
         return df_copy
 
@@ -70,26 +146,44 @@ class CategoricalValueChecker:
     """Ensures categorical values follow expected formats."""
 
     @staticmethod
-    def check_categorical_values(df):
-        inconsistent_values = {}
-        for col in df.select_dtypes(exclude=['number']).columns:
-            unique_values = df[col].unique()
-            cleaned_values = set(value.lower().strip() for value in unique_values if isinstance(value, str))
-
-            if len(cleaned_values) > 10:  # Ignore high cardinality categorical variables
+    def analyze_categorical_values(df, similarity_threshold=0.85, id_like_min_rows=1000, progress_callback=None):
+        """
+        Returns {column: CategoricalConsistencyEngine.analyze_column result} for
+        categorical columns whose values differ only by casing, whitespace,
+        punctuation or small typos; pass a result to ``normalize_column`` to merge them.
+        """
+        engine = CategoricalConsistencyEngine(similarity_threshold=similarity_threshold)
+        columns = []
+        for col in df.select_dtypes(include=TEXT_DTYPES).columns:
+            # Skip ID-like columns (nearly every value distinct) before factorizing them
+            non_null = int(df[col].notna().sum())
+            if non_null > id_like_min_rows and HyperLogLog().update(df[col]).estimate() > 0.95 * non_null:
                 continue
-            
-            inconsistent_values[col] = list(cleaned_values)
-        return type(inconsistent_values)
+            columns.append(col)
+        return engine.analyze_dataframe(df, columns=columns, progress_callback=progress_callback)
+
+    @staticmethod
+    def check_categorical_values(df, similarity_threshold=0.85, id_like_min_rows=1000):
+        """Returns {column: {canonical value: [variants]}} (see ``analyze_categorical_values``)."""
+        results = CategoricalValueChecker.analyze_categorical_values(df, similarity_threshold, id_like_min_rows)
+        return {col: result["groups"] for col, result in results.items()}
 
 
 class MulticollinearityChecker:
     """Detects multicollinearity using Variance Inflation Factor (VIF)."""
 
     @staticmethod
-    def calculate_vif(df):
+    def calculate_vif(df, progress_callback=None, governor=None):
+        # statsmodels is slow to import; load it only when VIF is requested
+        from statsmodels.stats.outliers_influence import variance_inflation_factor
+
         # Select only numerical columns
-        numerical_cols = df.select_dtypes(include=['number']).copy()
+        numerical_cols = df.select_dtypes(include=['number'])
+        # Each regression copies the float64 matrix and factorizes it; over budget, VIF is estimated on a row sample
+        plan = (governor or MemoryGovernor()).plan(
+            "VIF", len(numerical_cols), per_row_bytes=4 * 8 * numerical_cols.shape[1], sampleable=True
+        )
+        numerical_cols = plan.sample(numerical_cols).copy()
 
         if numerical_cols.shape[1] < 2:
             return {"Error": "Not enough numerical columns to check VIF"}
@@ -110,7 +204,13 @@ class MulticollinearityChecker:
         # Compute VIF
         vif_data = pd.DataFrame()
         vif_data["Feature"] = numerical_cols.columns
-        vif_data["VIF"] = [variance_inflation_factor(numerical_cols.values, i) for i in range(len(numerical_cols.columns))]
+        values = numerical_cols.to_numpy(dtype=np.float64)
+        vif_values = []
+        for i in range(len(numerical_cols.columns)):
+            if progress_callback is not None:
+                progress_callback(f"VIF {i + 1}/{len(numerical_cols.columns)}", i / len(numerical_cols.columns))
+            vif_values.append(variance_inflation_factor(values, i))
+        vif_data["VIF"] = vif_values
         
         # Return only features with high VIF
         return vif_data[vif_data["VIF"] > 5]  # Features with VIF > 5 indicate multicollinearity
@@ -121,22 +221,15 @@ class CorrelationHandler:
     """Handles feature correlation and removes highly correlated features."""
 
     @staticmethod
-    def remove_highly_correlated_features(df, threshold=0.9):
-        # Select numerical columns
-        numerical_df = df.select_dtypes(include=['number']).copy()
-
-        # Convert numeric-looking strings to actual numbers
-        for col in numerical_df.columns:
-            numerical_df[col] = pd.to_numeric(numerical_df[col], errors='coerce')
+    def remove_highly_correlated_features(df, threshold=0.9, governor=None):
+        # Select numerical columns (all-missing columns have no correlation)
+        numerical_cols = [col for col in df.select_dtypes(include=['number']).columns if df[col].notna().any()]
 
-        # Drop columns that are completely non-numeric (all NaN after conversion)
-        numerical_df = numerical_df.dropna(axis=1, how='all')
-
-        if numerical_df.shape[1] < 2:
+        if len(numerical_cols) < 2:
             return {"Error": "No valid numerical columns for correlation analysis"}
 
         # Compute correlation matrix
-        correlation_matrix = numerical_df.corr().abs()
+        correlation_matrix = CorrelationHandler.correlation_matrix(df, numerical_cols, governor).abs()
 
         # Find highly correlated features
         upper_triangle = correlation_matrix.where(np.triu(np.ones(correlation_matrix.shape), k=1).astype(bool))
@@ -144,58 +237,175 @@ class CorrelationHandler:
 
         return to_drop
 
+    @staticmethod
+    def correlation_matrix(df, columns, governor=None):
+        """``df[columns].corr()``, accumulated in row chunks when it would not fit the memory budget."""
+        # float64 copy of the columns plus its mask, and a few k x k matrices
+        k = len(columns)
+        plan = (governor or MemoryGovernor()).plan(
+            "Correlation", len(df), per_row_bytes=3 * 8 * k, fixed_bytes=6 * 8 * k * k, chunkable=True
+        )
+        if plan.in_memory:
+            return df[columns].corr()
+        return CorrelationHandler.chunked_correlation(df, columns, plan)
 
+    @staticmethod
+    def chunked_correlation(df, columns, plan):
+        """
+        Pearson correlation with pairwise-complete observations, like
+        ``DataFrame.corr()``, accumulated over the row chunks of ``plan`` so
+        only one chunk is converted to float64 at a time. Values are centered
+        on the column means first, which keeps the one-pass sums accurate.
+        """
+        means = np.array([df[col].astype(np.float64).mean() for col in columns])
+        k = len(columns)
+        count, sums, squares, products = (np.zeros((k, k)) for _ in range(4))
+        for chunk in plan.chunks(df):  # select per chunk: df[columns] would copy every row at once
+            values = chunk[columns].to_numpy(dtype=np.float64, na_value=np.nan) - means
+            valid = (~np.isnan(values)).astype(np.float64)
+            values = np.nan_to_num(values, nan=0.0)
+            count += valid.T @ valid
+            sums += values.T @ valid          # sums[i, j]: sum of column i where j is present too
+            squares += (values ** 2).T @ valid
+            products += values.T @ values
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = count * products - sums * sums.T
+            variance = (count * squares - sums ** 2) * (count * squares - sums ** 2).T
+            correlation = np.clip(covariance / np.sqrt(variance), -1.0, 1.0)
+        correlation[(count < 2) | ~(variance > 0)] = np.nan
+        np.fill_diagonal(correlation, np.where(np.diag(variance) > 0, 1.0, np.nan))
+        return pd.DataFrame(correlation, index=columns, columns=columns)
 
-class OutlierDetector:
-    """Detects extreme values in numerical columns using IQR method."""
 
-    @staticmethod
-    def detect_extreme_values(df):
-        outlier_report = {}
-        for col in df.select_dtypes(include=['number']).columns:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)][col]
 
-            if not outliers.empty:
-                outlier_report[col] = {"Outlier Count": outliers.count(), "Min Outlier": outliers.min(), "Max Outlier": outliers.max()}
+class OutlierDetector:
+    """Detects extreme values in numerical columns (IQR fences by default)."""
 
-        return outlier_report
+    @staticmethod
+    def detect_extreme_values(df, method="iqr"):
+        return OutlierEngine(method=method).detect(df).report()
 
 
 class DataSummary:
     """High-level class that integrates all analysis steps."""
 
-    def __init__(self, df, target_column=None):
+    def __init__(self, df, target_column=None, sample_size=None, stratify_by=None, random_state=0, datetimes=None):
         self.df = df
+        self.datetimes = datetimes
         self.target_column = target_column
-
-    def generate_report(self):
+        self.sample_size = sample_size
+        self.stratify_by = stratify_by
+        self.random_state = random_state
+
+    def generate_report(self, progress_callback=None, approximate=False):
+        """
+        Runs every analysis step. ``progress_callback(stage, fraction)`` is
+        called before each step, which lets background jobs report progress
+        and cancel between steps.
+
+        With ``approximate=True`` every section is computed on a uniform (or
+        stratified) sample of ``sample_size`` rows; count-based sections are
+        scaled to the full dataset with 95% confidence intervals.
+        """
+        if approximate and self.sample_size and self.sample_size < len(self.df):
+            return self._generate_approximate_report(progress_callback)
+
+        def progress(stage, fraction):
+            if progress_callback is not None:
+                progress_callback(stage, fraction)
+
+        progress("Missing values", 0.0)
         missing_report = MissingValueAnalyzer.analyze_missing_values(self.df)
+        progress("Missing value patterns", 0.05)
+        missing_patterns = MissingValueAnalyzer.analyze_missing_patterns(self.df)
+        progress("Duplicates", 0.1)
         duplicate_report = DuplicateAnalyzer.analyze_duplicates(self.df)
-
-        anonymized_data = DataAnonymizer.anonymize_data(self.df)
+        progress("Near duplicates", 0.12)
+        near_duplicates = DuplicateAnalyzer.analyze_near_duplicates(self.df)
+        duplicate_report.update(near_duplicates.summary())
+        progress("Candidate keys", 0.15)
+        keys = DuplicateAnalyzer.analyze_keys(self.df)
+
+        progress("Anonymization", 0.2)
+        # Only the first rows are reported; masking is row by row, so they are all that is needed
+        anonymized_data = DataAnonymizer.anonymize_data(self.df.head())
         numerical_cols, categorical_cols = DataTypeHandler.separate_columns(self.df)
 
+        progress("Cardinality", 0.3)
+        cardinality_report = CardinalityAnalyzer.analyze_cardinality(self.df)
+        progress("Datetime columns", 0.35)
+        datetime_profile = self.datetime_profile()
+
+        progress("Categorical values", 0.4)
         categorical_value_issues = CategoricalValueChecker.check_categorical_values(self.df)
-        vif_report = MulticollinearityChecker.calculate_vif(self.df)
+        progress("Multicollinearity (VIF)", 0.5)
+        vif_report = MulticollinearityChecker.calculate_vif(
+            self.df, progress_callback=lambda stage, fraction: progress(stage, 0.5 + 0.25 * fraction)
+        )
+        progress("Correlation", 0.75)
         highly_correlated_features = CorrelationHandler.remove_highly_correlated_features(self.df)
+        progress("Categorical association", 0.8)
+        association = CategoricalAssociation().compute(self.df)
+        progress("Outliers", 0.9)
         extreme_value_report = OutlierDetector.detect_extreme_values(self.df)
+        progress("Done", 1.0)
 
         return {
             "Missing Values Report": missing_report,
+            "Missing Value Patterns": missing_patterns["Row Patterns"],
+            "Co-Missing Columns": missing_patterns["Column Pairs"],
             "Duplicate Report": duplicate_report,
+            "Near-Duplicate Rows": near_duplicates.clusters,
+            "Candidate Keys": keys.keys,
+            "Functional Dependencies": keys.dependencies,
+            "Key Search": keys.summary(),
             "Anonymized Data Sample": anonymized_data.head(),
             "Numerical Columns": numerical_cols,
             "Categorical Columns": categorical_cols,
+            "Cardinality Report": cardinality_report,
+            "Datetime Profile": datetime_profile,
             "Categorical Value Issues": categorical_value_issues,
             "Multicollinearity (High VIF Features)": vif_report,
             "Highly Correlated Features": highly_correlated_features,
-            "Extreme Value Report": extreme_value_report
+            "Categorical Associations": association.pairs(),
+            "Redundant Categorical Features": association.redundant_features(),
+            "Extreme Value Report": extreme_value_report,
+            "Profile Mode": {"Mode": "Exact", "Rows Analyzed": len(self.df), "Total Rows": len(self.df)},
+        }
+
+    def datetime_profile(self):
+        """Time range, frequency and gaps of every date/time column (detected on a sample if not given)."""
+        if self.datetimes is None:
+            self.datetimes = DatetimeColumns.detect(self.df)
+        return profile_datetimes(self.datetimes)
+
+    def _generate_approximate_report(self, progress_callback=None):
+        sample = sample_rows(self.df, self.sample_size, stratify_by=self.stratify_by, random_state=self.random_state)
+        report = DataSummary(sample, target_column=self.target_column).generate_report(progress_callback)
+
+        n, total = len(sample), len(self.df)
+        report["Missing Values Report"] = scale_missing_report(report["Missing Values Report"], n, total)
+        report["Missing Value Patterns"] = scale_pattern_report(report["Missing Value Patterns"], n, total)
+        report["Co-Missing Columns"] = scale_co_missing_report(report["Co-Missing Columns"], n, total)
+        report["Duplicate Report"] = scale_duplicate_report(report["Duplicate Report"], n, total)
+        report["Extreme Value Report"] = scale_outlier_report(report["Extreme Value Report"], n, total)
+        # Distinct counts do not scale from a sample; the sketches take one pass over every row
+        report["Cardinality Report"] = CardinalityAnalyzer.analyze_cardinality(self.df)
+        # Sampling would open artificial gaps; time ranges come from the full (cached) parse
+        report["Datetime Profile"] = self.datetime_profile()
+        # A key of the sample need not be a key of the full data; verify on every row
+        keys = DuplicateAnalyzer.analyze_keys(self.df)
+        report["Candidate Keys"], report["Functional Dependencies"] = keys.keys, keys.dependencies
+        report["Key Search"] = keys.summary()
+        report["Profile Mode"] = {
+            "Mode": "Approximate",
+            "Rows Analyzed": n,
+            "Total Rows": total,
+            "Sampling": f"stratified on '{self.stratify_by}'" if self.stratify_by else "uniform",
+            "Confidence": "95%",
         }
+        return report
 
 
     
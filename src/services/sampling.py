@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+Z_95 = 1.959963984540054
+
+
+def sample_rows(df, size, stratify_by=None, random_state=0):
+    """
+    Draws ``size`` rows from an in-memory frame, either uniformly or
+    stratified on a column (proportional allocation, at least one row per
+    stratum). Row order of the original frame is preserved.
+    """
+    if size >= len(df):
+        return df
+
+    rng = np.random.default_rng(random_state)
+    if stratify_by is None:
+        return df.iloc[np.sort(rng.choice(len(df), size=size, replace=False))]
+
+    codes, _ = pd.factorize(df[stratify_by], use_na_sentinel=False)
+    counts = np.bincount(codes)
+    allocation = np.maximum(1, np.floor(counts / len(df) * size)).astype(np.int64)
+    allocation = np.minimum(allocation, counts)
+
+    # Random rank within each stratum; keep the first ``allocation`` of each
+    order = np.lexsort((rng.random(len(df)), codes))
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    rank = np.arange(len(df)) - np.repeat(starts, counts)
+    chosen = order[rank < allocation[codes[order]]]
+    return df.iloc[np.sort(chosen)]
+
+
+def proportion_interval(successes, sample_size, population_size, z=Z_95):
+    """
+    Wilson score interval for a proportion estimated from a sample without
+    replacement (finite population correction). Works element-wise on arrays.
+    Returns (estimate, low, high) as proportions.
+    """
+    successes = np.asarray(successes, dtype=np.float64)
+    n = float(sample_size)
+    if n == 0:
+        zeros = np.zeros_like(successes)
+        return zeros, zeros, np.ones_like(successes)
+
+    p = successes / n
+    fpc = np.sqrt(max(population_size - n, 0.0) / max(population_size - 1, 1.0))
+    z = z * fpc
+    denom = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denom
+    half = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denom
+    return p, np.clip(center - half, 0, 1), np.clip(center + half, 0, 1)
+
+
+def scale_missing_report(report, sample_size, population_size):
+    """Turns a missing-values report computed on a sample into population estimates with CIs."""
+    p, low, high = proportion_interval(report["Missing Values"].to_numpy(), sample_size, population_size)
+    return pd.DataFrame({
+        "Missing Values": np.rint(p * population_size).astype(np.int64),
+        "Percentage": p * 100,
+        "CI Low %": low * 100,
+        "CI High %": high * 100,
+    }, index=report.index)
+
+
+def scale_pattern_report(report, sample_size, population_size):
+    """Turns row-pattern counts from a sample (``MissingnessMatrix.row_patterns``) into population estimates with CIs."""
+    p, low, high = proportion_interval(report["Rows"].to_numpy(), sample_size, population_size)
+    scaled = report.copy()
+    scaled["Rows"] = np.rint(p * population_size).astype(np.int64)
+    scaled["Percentage"] = p * 100
+    scaled["CI Low %"], scaled["CI High %"] = low * 100, high * 100
+    return scaled
+
+
+def scale_co_missing_report(report, sample_size, population_size):
+    """
+    Scales "Both Missing" counts of column pairs (``MissingnessMatrix.top_pairs``)
+    from a sample, with CIs as a percentage of rows. Jaccard and conditional
+    shares are ratios of sample counts and estimate the population ones directly.
+    """
+    p, low, high = proportion_interval(report["Both Missing"].to_numpy(), sample_size, population_size)
+    scaled = report.copy()
+    scaled["Both Missing"] = np.rint(p * population_size).astype(np.int64)
+    scaled["CI Low %"], scaled["CI High %"] = low * 100, high * 100
+    return scaled
+
+
+def scale_pair_count(in_sample, sample_size, population_size):
+    """
+    (estimate, lower bound) of the population count of rows repeating another
+    row, from their count in a uniform sample. A repeat is only seen when both
+    rows are sampled, with probability about (n/N)^2, so the count is divided
+    by that survival rate: unbiased when every repeated row has one match, an
+    overestimate for rows repeated many times. Scaling by N/n instead gives a
+    lower bound.
+    """
+    n, total = float(sample_size), float(population_size)
+    if n < 2 or n >= total:
+        return int(in_sample), int(in_sample)
+    cap = max(total - 1, 0)
+    estimate = min(in_sample * total * (total - 1) / (n * (n - 1)), cap)
+    return int(round(estimate)), int(round(min(in_sample * total / n, cap)))
+
+
+def scale_duplicate_report(report, sample_size, population_size):
+    """
+    Duplicate count estimated from the sample, corrected for pairs split by
+    sampling (see ``scale_pair_count``), with the linearly scaled lower bound.
+    """
+    in_sample = int(report["Total Duplicates"])
+    estimate, lower = scale_pair_count(in_sample, sample_size, population_size)
+    scaled = {
+        "Total Duplicates": estimate,
+        "Duplicates In Sample": in_sample,
+        "Lower Bound": lower,
+        "Note": "Estimated from a sample; exact in expectation when each duplicate has one match",
+    }
+    if "Near Duplicates" in report:
+        # Near duplicates are pairs too: both rows must be sampled
+        near = int(report["Near Duplicates"])
+        estimate, lower = scale_pair_count(near, sample_size, population_size)
+        scaled["Near Duplicates"] = estimate
+        scaled["Near Duplicates In Sample"] = near
+        scaled["Near Duplicates Lower Bound"] = lower
+        scaled["Similarity Threshold"] = report.get("Similarity Threshold")
+    if "Compared Columns" in report:
+        scaled["Compared Columns"] = report["Compared Columns"]
+    return scaled
+
+
+def scale_outlier_report(report, sample_size, population_size):
+    """Scales per-column outlier counts found in a sample to the full dataset, with CIs."""
+    scaled = {}
+    for col, stats in report.items():
+        p, low, high = proportion_interval(stats["Outlier Count"], sample_size, population_size)
+        scaled[col] = dict(stats)
+        scaled[col]["Outlier Count"] = int(round(float(p) * population_size))
+        scaled[col]["CI (95%)"] = (int(round(float(low) * population_size)), int(round(float(high) * population_size)))
+    return scaled
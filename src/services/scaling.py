@@ -0,0 +1,172 @@
+import json
+import numpy as np
+
+
+class FeatureScaler:
+    """
+    Fit-once / apply-many feature scaling (Min-Max or Standardization).
+
+    Statistics are accumulated chunk by chunk, so a scaler can be fitted on a
+    file streamed from disk and later applied to another stream with the same
+    parameters.
+    """
+
+    METHODS = ("minmax", "standard")
+
+    def __init__(self, method="minmax", columns=None):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown scaling method '{method}'. Use one of {self.METHODS}")
+
+        self.method = method
+        self.columns = list(columns) if columns is not None else None
+        self.count_ = None
+        self.min_ = None
+        self.max_ = None
+        self.mean_ = None
+        self.m2_ = None
+
+    @property
+    def is_fitted(self):
+        return self.count_ is not None
+
+    def _resolve_columns(self, df):
+        if self.columns is None:
+            self.columns = df.select_dtypes(include=["number"]).columns.tolist()
+        missing = [col for col in self.columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Columns not found in data: {missing}")
+        return self.columns
+
+    def partial_fit(self, chunk):
+        """Updates min/max/mean/variance with one chunk of rows."""
+        columns = self._resolve_columns(chunk)
+        block = chunk[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(block)
+
+        n_b = valid.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            min_b = np.where(valid, block, np.inf).min(axis=0, initial=np.inf)
+            max_b = np.where(valid, block, -np.inf).max(axis=0, initial=-np.inf)
+            mean_b = np.where(n_b > 0, np.where(valid, block, 0.0).sum(axis=0) / n_b, 0.0)
+            m2_b = np.where(valid, (block - mean_b) ** 2, 0.0).sum(axis=0)
+
+        if not self.is_fitted:
+            self.count_, self.min_, self.max_, self.mean_, self.m2_ = n_b, min_b, max_b, mean_b, m2_b
+            return self
+
+        # Chan et al. parallel update of mean and sum of squared deviations
+        n_a = self.count_
+        total = n_a + n_b
+        delta = mean_b - self.mean_
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = np.where(total > 0, n_b / total, 0.0)
+            self.m2_ = self.m2_ + m2_b + np.where(total > 0, delta ** 2 * n_a * n_b / total, 0.0)
+        self.mean_ = self.mean_ + delta * ratio
+        self.count_ = total
+        self.min_ = np.minimum(self.min_, min_b)
+        self.max_ = np.maximum(self.max_, max_b)
+        return self
+
+    def fit(self, df):
+        """Fits the scaler on a single in-memory DataFrame."""
+        self.count_ = None
+        return self.partial_fit(df)
+
+    def fit_chunks(self, chunks):
+        """Fits the scaler on an iterable of DataFrame chunks."""
+        self.count_ = None
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        if not self.is_fitted:
+            raise ValueError("Cannot fit scaler on an empty stream")
+        return self
+
+    @property
+    def variance_(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count_ > 0, self.m2_ / self.count_, 0.0)
+
+    def _offset_and_scale(self):
+        if not self.is_fitted:
+            raise ValueError("FeatureScaler must be fitted before transform")
+
+        if self.method == "minmax":
+            offset = self.min_
+            scale = self.max_ - self.min_
+        else:
+            offset = self.mean_
+            scale = np.sqrt(self.variance_)
+
+        # Constant or empty columns map to 0 instead of dividing by zero
+        scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+        offset = np.where(np.isfinite(offset), offset, 0.0)
+        return offset, scale
+
+    def transform(self, df, inplace=False, dtype=np.float32):
+        """
+        Applies the fitted scaling to the fitted columns of ``df``.
+
+        Each column is converted to ``dtype`` at most once and then scaled in
+        place on that buffer. With ``inplace=True`` the scaled columns are
+        written back into ``df``; otherwise a new DataFrame is returned.
+        """
+        offset, scale = self._offset_and_scale()
+        columns = self._resolve_columns(df)
+        target = df if inplace else df.copy(deep=False)
+
+        for i, col in enumerate(columns):
+            values = df[col].to_numpy(dtype=dtype, na_value=np.nan, copy=True)
+            np.subtract(values, offset[i], out=values, casting="unsafe")
+            np.divide(values, scale[i], out=values, casting="unsafe")
+            target[col] = values
+
+        return target
+
+    def transform_chunks(self, chunks, dtype=np.float32):
+        """Lazily scales each chunk of a stream (shallow copies, no data duplication)."""
+        for chunk in chunks:
+            yield self.transform(chunk, dtype=dtype)
+
+    def fit_transform(self, df, inplace=False, dtype=np.float32):
+        return self.fit(df).transform(df, inplace=inplace, dtype=dtype)
+
+    def to_dict(self):
+        """Returns the fitted parameters as a JSON-serializable dict."""
+        if not self.is_fitted:
+            raise ValueError("FeatureScaler must be fitted before it can be serialized")
+
+        return {
+            "method": self.method,
+            "columns": [str(col) for col in self.columns],
+            "count": self.count_.tolist(),
+            "min": self.min_.tolist(),
+            "max": self.max_.tolist(),
+            "mean": self.mean_.tolist(),
+            "m2": self.m2_.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, params):
+        scaler = cls(method=params["method"], columns=params["columns"])
+        scaler.count_ = np.asarray(params["count"], dtype=np.float64)
+        scaler.min_ = np.asarray(params["min"], dtype=np.float64)
+        scaler.max_ = np.asarray(params["max"], dtype=np.float64)
+        scaler.mean_ = np.asarray(params["mean"], dtype=np.float64)
+        scaler.m2_ = np.asarray(params["m2"], dtype=np.float64)
+        return scaler
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, payload):
+        return cls.from_dict(json.loads(payload))
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,153 @@
+import heapq
+import numpy as np
+import pandas as pd
+
+SKETCH_CHUNK_SIZE = 100_000
+
+
+def hash_values(values):
+    """Deterministic 64-bit hashes of non-missing values (stable across processes)."""
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    series = series.dropna()
+    if series.empty:
+        return np.empty(0, dtype=np.uint64)
+    if isinstance(series.dtype, pd.StringDtype):
+        # Hash each distinct string once; factorizing Arrow strings creates no per-row str objects
+        codes, uniques = pd.factorize(series)
+        return pd.util.hash_array(np.asarray(uniques, dtype=object))[codes]
+    return pd.util.hash_array(series.to_numpy(dtype=object) if series.dtype == object else series.to_numpy())
+
+
+def _bit_length(values):
+    """Exact bit length of uint64 values, computed on two 32-bit halves."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1]).astype(np.int64)
+
+
+def _chunks(series, chunksize):
+    for start in range(0, len(series), chunksize):
+        yield series.iloc[start:start + chunksize]
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter with 2**p one-byte registers (16 KB at p=14,
+    ~0.8% standard error). Sketches with the same precision merge by taking
+    the register-wise maximum, so partitions can be counted independently.
+    """
+
+    def __init__(self, p=14):
+        if not 4 <= p <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if hashes.size == 0:
+            return self
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        suffix = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - _bit_length(suffix) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+        return self
+
+    def update(self, values, chunksize=SKETCH_CHUNK_SIZE):
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        for chunk in _chunks(series, chunksize):
+            self.add_hashes(hash_values(chunk))
+        return self
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = float(self.m)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * np.log(m / zeros)))  # linear counting for small cardinalities
+        return int(round(raw))
+
+    def __len__(self):
+        return self.estimate()
+
+    def to_bytes(self):
+        return bytes([self.p]) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload):
+        sketch = cls(payload[0])
+        sketch.registers = np.frombuffer(payload[1:], dtype=np.uint8).copy()
+        return sketch
+
+
+class MisraGries:
+    """
+    Mergeable heavy-hitter summary keeping at most ``capacity`` counters.
+
+    Reported counts are lower bounds that undercount by at most
+    ``error_bound`` (<= N / (capacity + 1)); when a column has no more than
+    ``capacity`` distinct values the counts are exact.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = int(capacity)
+        self.counters = {}
+        self.total = 0
+        self.error_bound = 0
+
+    def _prune(self):
+        if len(self.counters) <= self.capacity:
+            return
+        # Subtract the (capacity+1)-th largest count from every counter (mergeable MG)
+        threshold = heapq.nlargest(self.capacity + 1, self.counters.values())[-1]
+        self.counters = {key: count - threshold for key, count in self.counters.items() if count > threshold}
+        self.error_bound += threshold
+
+    def add_counts(self, counts):
+        """Adds a {value: count} mapping (e.g. one chunk's value_counts)."""
+        for key, count in counts.items():
+            self.counters[key] = self.counters.get(key, 0) + int(count)
+            self.total += int(count)
+        self._prune()
+        return self
+
+    def update(self, values, chunksize=SKETCH_CHUNK_SIZE):
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        for chunk in _chunks(series, chunksize):
+            counts = chunk.value_counts(dropna=True)
+            self.total += int(counts.sum())
+            if len(counts) > self.capacity:
+                # Reduce the chunk to a MG summary before merging it in
+                threshold = int(counts.iloc[self.capacity])
+                counts = counts.iloc[:self.capacity] - threshold
+                counts = counts[counts > 0]
+                self.error_bound += threshold
+            for key, count in counts.items():
+                self.counters[key] = self.counters.get(key, 0) + int(count)
+            self._prune()
+        return self
+
+    def merge(self, other):
+        for key, count in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + count
+        self.total += other.total
+        self.error_bound += other.error_bound
+        self._prune()
+        return self
+
+    @property
+    def is_exact(self):
+        return self.error_bound == 0
+
+    def top_k(self, k=None):
+        """[(value, count)] sorted by decreasing count."""
+        items = sorted(self.counters.items(), key=lambda item: item[1], reverse=True)
+        return items[:k] if k is not None else items
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The app modules import each other as top-level packages (``from services...``),
+# so make ``src`` importable when the tests are run from the repository root.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats.contingency import association
+from sklearn.metrics import normalized_mutual_info_score
+import src.services.association as association_module
+from src.services.association import CategoricalAssociation, pairs_to_matrix
+from src.services.quality_analysis import DataSummary
+
+
+@pytest.fixture
+def sample_df():
+    """Creates categorical columns with one redundant pair, missing values and a numeric column."""
+    rng = np.random.default_rng(0)
+    n = 4_000
+    city = rng.choice(["Pune", "Delhi", "Mumbai", "Chennai"], n)
+    df = pd.DataFrame({
+        "city": city,
+        "region": np.where(np.isin(city, ["Pune", "Mumbai"]), "West", np.where(city == "Delhi", "North", "South")),
+        "channel": np.where(rng.random(n) < 0.6, city, rng.choice(["web", "app"], n)),
+        "tier": rng.choice(["gold", "silver"], n),
+        "amount": rng.normal(100, 15, n),
+    })
+    df.loc[::17, "tier"] = None
+    return df
+
+
+# ✅ Test both measures match scipy / scikit-learn on every pair
+def test_matches_reference(sample_df, monkeypatch):
+    # Force several bincount batches per column
+    monkeypatch.setattr(association_module, "BATCH_CELLS", len(sample_df) * 2)
+    result = CategoricalAssociation().compute(sample_df)
+
+    assert result.columns == ["city", "region", "channel", "tier"]
+    for a in result.columns:
+        for b in result.columns:
+            if a == b:
+                continue
+            x, y = sample_df[a].fillna("<NA>"), sample_df[b].fillna("<NA>")
+            assert result.matrix().at[a, b] == pytest.approx(association(pd.crosstab(x, y).to_numpy()))
+            assert result.matrix("nmi").at[a, b] == pytest.approx(normalized_mutual_info_score(x, y))
+
+
+# ✅ Test redundant features and the pairs table round trip
+def test_redundant_features(sample_df):
+    result = CategoricalAssociation().compute(sample_df)
+    # region is a function of city, so it is fully explained by it
+    assert result.cramers_v[0, 1] == pytest.approx(1.0)
+    assert result.redundant_features() == ["region"]
+
+    pairs = result.pairs()
+    assert len(pairs) == 6
+    assert tuple(pairs.iloc[0][["Column A", "Column B"]]) == ("city", "region")
+    matrix = pairs_to_matrix(pairs, "nmi")
+    np.testing.assert_allclose(matrix.loc[result.columns, result.columns], result.nmi, atol=1e-4)
+
+
+# ✅ Test rare levels are pooled, constant columns dropped and sampling applied
+def test_levels_and_sampling(sample_df):
+    engine = CategoricalAssociation(max_levels=3)
+    codes = engine.encode(pd.Series(["a"] * 5 + ["b"] * 4 + ["c", "d", None]))
+    assert codes.max() == 3  # a, b, pooled (c, d) and missing
+
+    df = sample_df.assign(constant="x")
+    result = CategoricalAssociation(sample_size=1_000).compute(df)
+    assert "constant" not in result.columns
+    assert result.rows == 1_000
+    assert CategoricalAssociation().compute(df[["city", "amount"]]).pairs().empty
+
+
+# ✅ Test the association section of the data quality report
+def test_data_summary_report(sample_df):
+    report = DataSummary(sample_df).generate_report()
+    assert report["Redundant Categorical Features"] == ["region"]
+    assert list(report["Categorical Associations"].columns) == ["Column A", "Column B", "Cramér's V", "NMI"]
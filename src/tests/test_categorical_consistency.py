@@ -0,0 +1,79 @@
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.categorical_consistency import CategoricalConsistencyEngine
+from src.services.quality_analysis import CategoricalValueChecker
+
+
+@pytest.fixture
+def messy_data():
+    return pd.DataFrame({
+        "City": ["New York", "new york ", "NEW-YORK", "New York", "Boston", "boston", "Chicago", None, "Chicgo"],
+        "Amount": [1, 2, 3, 4, 5, 6, 7, 8, 9],
+    })
+
+
+# ✅ Variants are grouped under the most frequent spelling
+def test_groups_variants(messy_data):
+    result = CategoricalConsistencyEngine().analyze_column(messy_data["City"])
+
+    assert sorted(result["groups"]["New York"]) == sorted(["New York", "new york ", "NEW-YORK"])
+    assert sorted(result["groups"]["Boston"]) == ["Boston", "boston"]
+    assert set(result["groups"]["Chicago"]) == {"Chicago", "Chicgo"}
+
+
+# ✅ The mapping is applied back in a single take, keeping missing values
+def test_normalize_column(messy_data):
+    normalized = CategoricalConsistencyEngine().normalize_column(messy_data["City"])
+
+    assert normalized.isnull().sum() == 1
+    assert set(normalized.dropna()) == {"New York", "Boston", "Chicago"}
+    assert normalized.index.equals(messy_data.index)
+
+
+# ✅ Exact-key mode does not merge typos
+def test_threshold_one_only_uses_keys(messy_data):
+    result = CategoricalConsistencyEngine(similarity_threshold=1.0).analyze_column(messy_data["City"])
+    assert "Chicago" not in result["groups"]
+
+
+# ✅ The summary checker now returns the issues themselves
+def test_check_categorical_values(messy_data):
+    issues = CategoricalValueChecker.check_categorical_values(messy_data)
+
+    assert isinstance(issues, dict)
+    assert list(issues) == ["City"]
+
+
+# ✅ High-cardinality ID columns are handled through blocking
+def test_high_cardinality_scales():
+    ids = pd.Series([f"customer-{i:06d}" for i in range(100_000)] + ["CUSTOMER-000001"])
+    start = time.perf_counter()
+    result = CategoricalConsistencyEngine().analyze_column(ids)
+    elapsed = time.perf_counter() - start
+
+    assert result["groups"] == {"customer-000001": ["customer-000001", "CUSTOMER-000001"]}
+    assert elapsed < 30
+
+
+# ✅ Company-style values sharing a prefix and suffix are not all compared, nor merged
+def test_shared_prefix_scales():
+    rng = np.random.default_rng(0)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    words = list(dict.fromkeys("".join(w) for w in rng.choice(letters, size=(100_000, 12))))
+    typos = {}
+    for word in words[:100]:
+        typo = list(word)
+        typo[4] = "z" if typo[4] != "z" else "y"
+        typos[f"Acme {word} Inc"] = f"ACME {''.join(typo)} inc."
+    values = pd.Series([f"Acme {word} Inc" for word in words] + list(typos.values()))
+
+    start = time.perf_counter()
+    result = CategoricalConsistencyEngine().analyze_column(values)
+    elapsed = time.perf_counter() - start
+
+    assert {canonical: sorted(variants) for canonical, variants in result["groups"].items()} == {
+        original: sorted([original, typo]) for original, typo in typos.items()
+    }
+    assert elapsed < 60
@@ -0,0 +1,84 @@
+import gzip
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from src.infrastructure.data_export import DataExporter, export_path
+
+
+@pytest.fixture
+def sample_df():
+    """Creates a mixed-type dataset with missing values."""
+    rng = np.random.default_rng(0)
+    n = 5_000
+    df = pd.DataFrame({
+        "amount": rng.normal(100, 15, n),
+        "city": rng.choice(["Pune", "Delhi", "Mumbai"], n),
+        "visits": rng.integers(0, 50, n),
+        "signup": pd.date_range("2024-01-01", periods=n, freq="h"),
+        "mixed": [1, "a"] * (n // 2),
+    })
+    df.loc[::10, "amount"] = np.nan
+    df.loc[::7, "city"] = None
+    return df
+
+
+# ✅ Test every format round-trips the data, written concurrently in chunks
+@pytest.mark.parametrize("compression", [None, "zstd"])
+def test_export_round_trip(sample_df, tmp_path, compression):
+    progress = []
+    paths = DataExporter(chunk_rows=1_200).export(
+        sample_df, str(tmp_path / "clean"), ["csv", "ndjson", "parquet", "feather"], compression,
+        progress_callback=lambda stage, fraction: progress.append(fraction),
+    )
+    assert paths["csv"] == export_path(str(tmp_path / "clean"), "csv", compression)
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(p.split("/")[-1] for p in paths.values())
+
+    # Columns mixing strings and numbers are written as strings
+    expected = sample_df.assign(mixed=sample_df["mixed"].astype(str))
+    csv = pd.read_csv(pa.input_stream(paths["csv"]), parse_dates=["signup"])  # decompression detected from the extension
+    pd.testing.assert_frame_equal(csv, expected.assign(city=expected["city"].fillna(np.nan)), check_dtype=False)
+    ndjson = pd.read_json(pa.input_stream(paths["ndjson"]), lines=True)
+    pd.testing.assert_frame_equal(ndjson[["amount", "visits"]], expected[["amount", "visits"]], check_dtype=False)
+
+    parquet = pq.ParquetFile(paths["parquet"])
+    assert parquet.metadata.num_row_groups == 5
+    pd.testing.assert_frame_equal(pd.read_parquet(paths["parquet"]), expected, check_dtype=False)
+    pd.testing.assert_frame_equal(pd.read_feather(paths["feather"]), expected, check_dtype=False)
+
+    assert progress[-1] == pytest.approx(1.0)
+    assert progress == sorted(progress)
+
+
+# ✅ Test gzip stream compression of text formats
+def test_gzip_text(sample_df, tmp_path):
+    paths = DataExporter(chunk_rows=2_000).export(sample_df, str(tmp_path / "clean"), ["csv", "ndjson"], "gzip")
+    assert paths["csv"].endswith(".csv.gz")
+    with gzip.open(paths["csv"], "rt") as f:
+        assert f.readline().strip() == '"amount","city","visits","signup","mixed"'
+    assert len(pd.read_json(paths["ndjson"], lines=True, compression="gzip")) == len(sample_df)
+
+
+# ✅ Test chunk size derived from the target chunk size in bytes
+def test_rows_per_chunk(sample_df):
+    assert DataExporter(chunk_rows=123).rows_per_chunk(sample_df) == 123
+    rows = DataExporter(chunk_bytes=1 << 20).rows_per_chunk(pd.concat([sample_df] * 100))
+    assert 1_000 <= rows <= 100_000
+
+
+# ✅ Test that a failing format leaves no partial files behind
+def test_failed_export_cleans_up(sample_df, tmp_path):
+    with pytest.raises(ValueError):
+        DataExporter().export(sample_df, str(tmp_path / "clean"), ["csv", "feather"], "gzip")
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".part")]
+    with pytest.raises(ValueError):
+        DataExporter().export(sample_df, str(tmp_path / "clean"), ["xlsx"])
+
+
+# ✅ Test sparse (one-hot encoded) columns are written densely
+def test_sparse_columns(tmp_path):
+    df = pd.DataFrame({"id": range(6), "city_Pune": pd.arrays.SparseArray([1.0, 0, 0, 1.0, 0, 0], fill_value=0.0)})
+    paths = DataExporter(chunk_rows=4).export(df, str(tmp_path / "sparse"), ["csv", "parquet"])
+    pd.testing.assert_frame_equal(pd.read_parquet(paths["parquet"]), df.astype({"city_Pune": float}))
+    assert pd.read_csv(paths["csv"])["city_Pune"].tolist() == [1, 0, 0, 1, 0, 0]
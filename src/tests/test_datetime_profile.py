@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.datetime_profile import (
+    DatetimeColumns, bucket_frequency, detect_datetime_formats, parse_datetimes, profile_datetimes, resample_for_chart,
+)
+
+
+@pytest.fixture
+def sample_df():
+    """Creates day-first, ISO and offset-aware date strings, a native datetime column and look-alike text."""
+    n = 5_000
+    times = pd.Series(pd.date_range("2024-01-01", periods=n, freq="h"))
+    times = times.drop(times.index[100:200]).reset_index(drop=True)  # a 100-hour gap
+    df = pd.DataFrame({
+        "day_first": times.dt.strftime("%d/%m/%Y %H:%M").astype("string[pyarrow]"),
+        "iso": times.dt.strftime("%Y-%m-%d").astype(object),
+        "with_offset": times.dt.tz_localize("Asia/Kolkata").dt.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "native": times,
+        "code": np.arange(len(times)).astype(str),
+        "year": "2024",
+        "amount": np.arange(len(times), dtype=float),
+    })
+    df.loc[::50, "day_first"] = None
+    df.loc[7, "day_first"] = "not a date"
+    return df
+
+
+# ✅ Test formats are inferred from a sample, including day-first dates
+def test_detect_formats(sample_df):
+    formats = detect_datetime_formats(sample_df, sample_size=500)
+    assert formats == {
+        "day_first": "%d/%m/%Y %H:%M",
+        "iso": "%Y-%m-%d",
+        "with_offset": "%Y-%m-%dT%H:%M:%S%z",
+        "native": None,
+    }
+
+
+# ✅ Test the vectorized parse matches pandas and runs once per column
+def test_parse_once(sample_df):
+    datetimes = DatetimeColumns.detect(sample_df)
+    parsed = datetimes.parsed("day_first")
+    expected = pd.to_datetime(sample_df["day_first"].astype(object), format="%d/%m/%Y %H:%M", errors="coerce")
+    pd.testing.assert_series_equal(parsed, expected, check_names=False)
+    assert datetimes.parsed("day_first") is parsed
+
+    offsets = datetimes.parsed("with_offset")
+    assert str(offsets.dt.tz) == "UTC"
+    assert offsets.iloc[0] == pd.Timestamp("2023-12-31 18:30", tz="UTC")
+    # Unsupported-by-Arrow directives fall back to pandas with the same result
+    micro = pd.Series(["2024-01-01 10:00:00.250000", None, "x"])
+    assert parse_datetimes(micro, "%Y-%m-%d %H:%M:%S.%f").isna().tolist() == [False, True, True]
+
+
+# ✅ Test ranges, frequency and gaps in the profile
+def test_profile(sample_df):
+    profile = profile_datetimes(DatetimeColumns.detect(sample_df)).set_index("Column")
+    row = profile.loc["day_first"]
+    assert row["Unparsed"] == 1
+    assert row["Start"] == pd.Timestamp("2024-01-01 01:00")  # the first value is missing
+    assert row["Gaps"] > 0
+
+    native = profile.loc["native"]
+    assert native["Format"] == "native"
+    assert native["Frequency"] == "h"
+    assert native["Gaps"] == 1
+    assert native["Largest Gap"] == pd.Timedelta(hours=101)
+    assert native["Largest Gap Start"] == pd.Timestamp("2024-01-05 03:00")
+    assert profile.loc["iso", "Frequency"] == "D"
+
+
+# ✅ Test server-side resampling keeps charts within the point budget
+def test_resample_for_chart(sample_df):
+    assert bucket_frequency("2024-01-01", "2024-01-02", 100) == "15min"
+    assert bucket_frequency("2000-01-01", "2024-01-01", 100) == "3MS"
+
+    points, freq = resample_for_chart(sample_df["native"], sample_df["amount"], max_points=300, agg="sum")
+    assert freq == "1D" and len(points) <= 300
+    assert points["value"].sum() == sample_df["amount"].sum()
+    # Buckets inside the gap are empty and stay NaN so the line breaks there
+    assert points["value"].isna().sum() == 3
+
+    counts, freq = resample_for_chart(sample_df["native"], max_points=200)
+    assert freq == "7D"
+    assert counts["value"].sum() == len(sample_df)
+    assert resample_for_chart(pd.Series([pd.NaT, pd.NaT]))[1] is None
@@ -0,0 +1,93 @@
+import hashlib
+import numpy as np
+import pandas as pd
+import pytest
+from src.domain.data_file import DataFile
+from src.services.anonymization import Anonymization
+from src.services.categorical_consistency import CategoricalConsistencyEngine
+from src.services.data_validation import FileValidation
+from src.services.dtypes import STRING_DTYPE, to_arrow_dtypes, text_columns
+from src.services.preprocessing import handle_missing_values
+from src.services.quality_analysis import DataAnonymizer
+from src.services.sketches import hash_values
+
+
+@pytest.fixture
+def sample_df():
+    """Creates text, numeric-with-gaps, boolean and mixed columns."""
+    return pd.DataFrame({
+        "Name": ["Alice", "Bob", None, "Dana"],
+        "Email": ["alice@example.com", None, "carol@example.com", "dana@example.com"],
+        "City": ["New York", "new york", "Boston", None],
+        "Visits": [1.0, np.nan, 3.0, 4.0],
+        "Amount": [1.5, 2.5, np.nan, 4.0],
+        "Active": [True, None, False, True],
+        "Mixed": ["a", 1, None, "b"],
+    })
+
+
+# ✅ Test conversion to Arrow strings and nullable dtypes
+def test_to_arrow_dtypes(sample_df):
+    df = to_arrow_dtypes(sample_df.copy())
+    assert df["Name"].dtype == STRING_DTYPE
+    assert df["Visits"].dtype == "Int64"
+    assert df["Amount"].dtype == np.float64
+    assert df["Active"].dtype == "boolean"
+    assert df["Mixed"].dtype == object
+    assert text_columns(df) == ["Name", "Email", "City", "Mixed"]
+    assert df["Visits"].isna().sum() == 1
+
+
+# ✅ Test that Arrow and legacy loading agree on values
+def test_read_file_arrow_strings(sample_df, tmp_path):
+    path = tmp_path / "data.csv"
+    sample_df.drop(columns="Mixed").to_csv(path, index=False)
+    data_file = DataFile.from_path(path)
+
+    arrow = FileValidation().read_file(data_file, arrow_strings=True)
+    legacy = FileValidation().read_file(data_file, arrow_strings=False)
+    assert arrow["Email"].dtype == STRING_DTYPE
+    assert arrow["Visits"].dtype == "Int64"
+    pd.testing.assert_frame_equal(arrow.astype(object).where(arrow.notna(), None),
+                                  legacy.astype(object).where(legacy.notna(), None), check_dtype=False)
+
+    # Files Arrow rejects fall back to the C parser
+    ragged = tmp_path / "ragged.csv"
+    ragged.write_text("a,b\n1,x\n2\n")
+    df = FileValidation().read_file(DataFile.from_path(ragged), arrow_strings=True)
+    assert df["b"].dtype == STRING_DTYPE
+    assert df["b"].isna().sum() == 1
+
+
+# ✅ Test that anonymizers keep Arrow string columns
+def test_anonymizers_keep_dtype(sample_df):
+    df = to_arrow_dtypes(sample_df.copy())
+    anonymized = DataAnonymizer.anonymize_data(df)
+    assert anonymized["Email"].dtype == STRING_DTYPE
+    assert anonymized["Name"].dtype == STRING_DTYPE
+    assert anonymized["Email"].dropna().eq("*****@*****.com").all()
+    assert (anonymized["Name"] == "Anonymous").all()
+    assert anonymized["Mixed"].tolist()[:2] == ["a", 1]
+
+    hashed = Anonymization().anonymize_dataframe(df.copy())
+    assert hashed["Email"].dtype == STRING_DTYPE
+    assert hashed["Email"][0] == hashlib.sha256(b"alice@example.com").hexdigest()
+    assert hashed["Email"].isna().sum() == 1
+
+
+# ✅ Test string services give the same results on object and Arrow columns
+def test_object_and_arrow_agree(sample_df):
+    arrow = sample_df["City"].astype(STRING_DTYPE)
+    np.testing.assert_array_equal(hash_values(arrow), hash_values(sample_df["City"]))
+
+    normalized = CategoricalConsistencyEngine().normalize_column(arrow)
+    assert normalized.dtype == STRING_DTYPE
+    assert normalized.tolist()[:2] == ["New York", "New York"]
+
+
+# ✅ Test mean filling keeps nullable integer columns integral
+def test_fill_nullable_integers(sample_df):
+    df = to_arrow_dtypes(sample_df.copy())
+    filled = handle_missing_values(df, method="mean")
+    assert filled["Visits"].dtype == "Int64"
+    assert filled["Visits"].tolist() == [1, 3, 3, 4]
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.encoding import CategoricalEncoder
+
+
+@pytest.fixture
+def sample_df():
+    """Creates a high-cardinality column, a low-cardinality column with gaps and a numeric column."""
+    rng = np.random.default_rng(0)
+    n = 10_000
+    df = pd.DataFrame({
+        "sku": pd.Series(np.char.add("sku", rng.integers(0, 2_000, n).astype(str))).astype("string[pyarrow]"),
+        "city": rng.choice(["Pune", "Delhi", "Mumbai"], n),
+        "amount": rng.normal(100, 15, n),
+    })
+    df.loc[::10, "city"] = None
+    return df
+
+
+# ✅ Test one-hot output is a sparse matrix matching pandas' dummies
+def test_onehot_matches_get_dummies(sample_df):
+    encoder = CategoricalEncoder("onehot").fit(sample_df)
+    matrix = encoder.transform_sparse(sample_df)
+
+    assert encoder.columns == ["sku", "city"]
+    assert matrix.shape == (len(sample_df), sample_df["sku"].nunique() + 3)
+    assert matrix.nnz == len(sample_df) + sample_df["city"].notna().sum()
+
+    expected = pd.get_dummies(sample_df[["sku", "city"]].astype(object), dtype=float)
+    dense = pd.DataFrame(matrix.toarray(), columns=encoder.feature_names())
+    pd.testing.assert_frame_equal(dense[expected.columns], expected, check_dtype=False)
+
+    encoded = encoder.transform(sample_df)
+    assert "sku" not in encoded and isinstance(encoded["city_Pune"].dtype, pd.SparseDtype)
+    np.testing.assert_array_equal(encoded["amount"], sample_df["amount"])
+
+
+# ✅ Test maps fitted on chunks encode new data, with unseen values handled
+def test_partial_fit_and_unseen(sample_df):
+    encoder = CategoricalEncoder("ordinal", columns=["city"])
+    encoder.fit_chunks(sample_df.iloc[i:i + 1_000] for i in range(0, 5_000, 1_000))
+    codes_before = encoder.categories_["city"].tolist()
+    encoder.partial_fit(pd.DataFrame({"city": ["Pune", "Chennai"]}))
+    # Earlier categories keep their codes, new ones are appended
+    assert encoder.categories_["city"].tolist() == codes_before + ["Chennai"]
+    assert encoder.counts_["city"].sum() == sample_df["city"].iloc[:5_000].notna().sum() + 2
+
+    new = pd.DataFrame({"city": ["Delhi", "Kolkata", None]})
+    codes = encoder.transform(new)["city"].tolist()
+    assert codes == [codes_before.index("Delhi"), -1, -1]
+
+    strict = CategoricalEncoder("onehot", columns=["city"], handle_unknown="error").fit(sample_df)
+    with pytest.raises(ValueError, match="Kolkata"):
+        strict.transform_sparse(new)
+    lenient = CategoricalEncoder("onehot", columns=["city"]).fit(sample_df)
+    assert lenient.transform_sparse(new).getnnz(axis=1).tolist() == [1, 0, 0]
+
+
+# ✅ Test frequency and hashed encodings
+def test_frequency_and_hashed(sample_df):
+    frequency = CategoricalEncoder("frequency", columns=["city"]).fit_transform(sample_df)["city"]
+    expected = sample_df["city"].map(sample_df["city"].value_counts() / sample_df["city"].notna().sum()).fillna(0)
+    np.testing.assert_allclose(frequency, expected, rtol=1e-6)
+
+    encoder = CategoricalEncoder("hashed", n_hash_features=64).fit(sample_df.iloc[:10])
+    matrix = encoder.transform_sparse(sample_df)
+    assert matrix.shape == (len(sample_df), 64)
+    # Every non-missing value adds 1 to some bucket, including values never fitted
+    np.testing.assert_array_equal(matrix.sum(axis=1).A1, 1 + sample_df["city"].notna().to_numpy())
+    assert (encoder.transform_sparse(sample_df.iloc[:50]) != matrix[:50]).nnz == 0
+
+
+# ✅ Test JSON round trip of the fitted maps
+def test_round_trip(sample_df, tmp_path):
+    encoder = CategoricalEncoder("onehot").fit(sample_df)
+    path = tmp_path / "encoder.json"
+    encoder.save(path)
+    restored = CategoricalEncoder.load(path)
+
+    assert restored.feature_names() == encoder.feature_names()
+    assert (restored.transform_sparse(sample_df) != encoder.transform_sparse(sample_df)).nnz == 0
+    assert CategoricalEncoder.from_json(encoder.to_json()).n_features_ == encoder.n_features_
+
+
+# ✅ Test that invalid settings are rejected
+def test_invalid_settings(sample_df):
+    with pytest.raises(ValueError):
+        CategoricalEncoder(method="target")
+    with pytest.raises(ValueError):
+        CategoricalEncoder("ordinal").fit(sample_df).transform_sparse(sample_df)
+    with pytest.raises(ValueError):
+        CategoricalEncoder("onehot").transform(sample_df)
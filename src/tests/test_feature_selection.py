@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.feature_selection import PCAFeatureReducer
+
+
+@pytest.fixture
+def correlated_data():
+    rng = np.random.default_rng(42)
+    latent = rng.normal(size=(2000, 2))
+    mixing = rng.normal(size=(2, 6))
+    values = latent @ mixing + 0.01 * rng.normal(size=(2000, 6))
+    df = pd.DataFrame(values, columns=[f"f{i}" for i in range(6)])
+    df["Category"] = "a"
+    return df
+
+
+def _chunks(df, size):
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size]
+
+
+# ✅ Randomized solver recovers the low-rank structure
+def test_randomized_pca(correlated_data):
+    reducer = PCAFeatureReducer(n_components=4).fit(correlated_data)
+
+    assert reducer.solver_ == "randomized"
+    assert reducer.columns == [f"f{i}" for i in range(6)]
+    assert reducer.explained_variance_ratio_[:2].sum() > 0.99
+    assert reducer.components_for_variance(0.99) == 2
+
+
+# ✅ Incremental solver agrees with the in-memory solver
+def test_incremental_matches_randomized(correlated_data):
+    full = PCAFeatureReducer(n_components=3).fit(correlated_data)
+    streamed = PCAFeatureReducer(n_components=3).fit_chunks(_chunks(correlated_data, 333))
+
+    assert streamed.solver_ == "incremental"
+    assert streamed.n_samples_ == len(correlated_data)
+    np.testing.assert_allclose(streamed.explained_variance_[:2], full.explained_variance_[:2], rtol=1e-3)
+    # Components are defined up to sign
+    overlap = np.abs(np.sum(streamed.components_[:2] * full.components_[:2], axis=1))
+    np.testing.assert_allclose(overlap, 1.0, atol=1e-3)
+
+
+# ✅ Tiny trailing chunks are merged instead of dropped
+def test_incremental_small_tail(correlated_data):
+    reducer = PCAFeatureReducer(n_components=3).fit_chunks(_chunks(correlated_data.iloc[:101], 50))
+    assert reducer.n_samples_ == 101
+
+
+# ✅ Reports and transform
+def test_reports_and_transform(correlated_data):
+    correlated_data.loc[0, "f0"] = np.nan
+    reducer = PCAFeatureReducer(n_components=2).fit(correlated_data)
+
+    report = reducer.explained_variance_report()
+    assert list(report["Component"]) == ["PC1", "PC2"]
+    assert reducer.loadings().shape == (6, 2)
+
+    reduced = reducer.reduce_dataframe(correlated_data)
+    assert list(reduced.columns) == ["Category", "PC1", "PC2"]
+    assert not reduced[["PC1", "PC2"]].isnull().any().any()
+
+
+def test_requires_two_numeric_columns():
+    with pytest.raises(ValueError):
+        PCAFeatureReducer().fit(pd.DataFrame({"A": [1, 2, 3], "B": ["x", "y", "z"]}))
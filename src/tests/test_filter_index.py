@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.filter_index import FilterIndex, CategoricalColumnIndex, NumericColumnIndex
+
+
+@pytest.fixture
+def sample_df():
+    """Creates numeric, categorical and datetime columns with gaps."""
+    rng = np.random.default_rng(0)
+    n = 20_000
+    df = pd.DataFrame({
+        "amount": rng.normal(100, 20, n),
+        "qty": rng.integers(0, 50, n),
+        "city": rng.choice(["Pune", "Delhi", "Mumbai"], n),
+        "code": rng.integers(0, 5_000, n).astype(str),
+        "when": pd.date_range("2024-01-01", periods=n, freq="min"),
+    })
+    df.loc[::17, "amount"] = np.nan
+    df.loc[::23, "city"] = None
+    return df
+
+
+def reference(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for col, condition in filters.items():
+        if isinstance(condition, tuple):
+            low, high = condition
+            mask &= df[col].between(low, high).to_numpy()
+        else:
+            mask &= df[col].isin(condition).to_numpy()
+    return mask
+
+
+# ✅ Test single and combined filters against pandas boolean indexing
+@pytest.mark.parametrize("filters", [
+    {"amount": (90.0, 110.0)},
+    {"city": ["Pune", "Mumbai"]},
+    {"code": ["7", "42", "999"]},
+    {"amount": (90.0, 200.0), "qty": (10, 20), "city": ["Delhi"]},
+    {"code": ["7", "42", "999", "1234"], "amount": (0.0, 1_000.0), "city": ["Pune", "Delhi"]},
+    {"when": (pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03 12:00"))},
+    {"amount": (500.0, 600.0), "city": ["Pune"]},
+])
+def test_filters_match_pandas(sample_df, filters):
+    index = FilterIndex(sample_df)
+    rows = index.filter(filters)
+    np.testing.assert_array_equal(rows.to_mask(), reference(sample_df, filters))
+    pd.testing.assert_frame_equal(index.apply(filters), sample_df[reference(sample_df, filters)])
+
+
+# ✅ Test that indexes are built lazily and by column type
+def test_lazy_typed_indexes(sample_df):
+    index = FilterIndex(sample_df)
+    assert index.filter({}).count() == len(sample_df)
+    assert index.apply({}) is sample_df
+    assert not index._indexes
+
+    assert isinstance(index.column("amount"), NumericColumnIndex)
+    assert isinstance(index.column("when"), NumericColumnIndex)
+    assert isinstance(index.column("city"), CategoricalColumnIndex)
+    assert set(index._indexes) == {"amount", "when", "city"}
+
+
+# ✅ Test numeric index bounds and missing values
+def test_numeric_index(sample_df):
+    column = FilterIndex(sample_df).column("amount")
+    assert column.min == pytest.approx(sample_df["amount"].min())
+    assert column.count() == sample_df["amount"].notna().sum()
+    assert column.range(None, None).count() == sample_df["amount"].notna().sum()
+
+
+# ✅ Test categorical postings, dense bitmaps and cross-filter counts
+def test_categorical_index(sample_df):
+    index = FilterIndex(sample_df)
+    city = index.column("city")
+    code = index.column("code")
+    assert len(city.bitmaps) == 3
+    assert not code.bitmaps
+    np.testing.assert_array_equal(code.positions("42"), np.flatnonzero(sample_df["code"] == "42"))
+    assert city.select(["Nowhere"]).count() == 0
+
+    rows = index.filter({"qty": (0, 9)})
+    counts = city.value_counts(rows)
+    expected = sample_df.loc[sample_df["qty"] <= 9, "city"].value_counts()
+    assert counts.to_dict() == expected.to_dict()
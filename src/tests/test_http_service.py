@@ -0,0 +1,145 @@
+import io
+import json
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+import pandas as pd
+import pytest
+import uvicorn
+from src.infrastructure.http_service import create_app, DatasetCache, ProfilingService
+
+CSV = b"name,email,age,score\nAnn,ann@example.com,31,1.5\nBob,bob@example.com,,2.5\nBob,bob@example.com,,2.5\nCid,cid@example.com,45,\n"
+
+
+@pytest.fixture(scope="module")
+def server():
+    """Runs the service with uvicorn on a free localhost port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    service = ProfilingService(max_workers=1, max_pending=2)
+    config = uvicorn.Config(create_app(service), host="127.0.0.1", port=port, log_level="warning")
+    uv_server = uvicorn.Server(config)
+    thread = threading.Thread(target=uv_server.run, daemon=True)
+    thread.start()
+    while not uv_server.started:
+        time.sleep(0.05)
+
+    yield f"http://127.0.0.1:{port}", service
+
+    uv_server.should_exit = True
+    thread.join(timeout=10)
+
+
+def post(url, data=b""):
+    """Returns (status, headers, body) without raising on HTTP errors."""
+    request = urllib.request.Request(url, data=data, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+# ✅ Test that repeated uploads of the same content hit the parsed-data cache
+def test_upload_is_cached_by_content(server):
+    url, service = server
+    status, _, body = post(f"{url}/upload?filename=people.csv", CSV)
+    first = json.loads(body)
+    assert status == 200
+    assert first["rows"] == 4
+    assert set(first["columns"]) == {"name", "email", "age", "score"}
+
+    status, _, body = post(f"{url}/upload?filename=people.csv", CSV)
+    second = json.loads(body)
+    assert second["dataset_id"] == first["dataset_id"]
+    assert second["cached"] is True
+    # Workers get the dataset as a spilled Arrow file, not a pickled DataFrame
+    assert os.path.exists(os.path.join(service.cache.directory_for(first["dataset_id"]), "data.arrow"))
+
+
+# ✅ Test that profiling returns the DataSummary report as JSON
+def test_profile_returns_report(server):
+    url, _ = server
+    status, headers, body = post(f"{url}/profile?filename=people.csv", CSV)
+    report = json.loads(body)
+    assert status == 200
+    assert headers["Content-Type"] == "application/json"
+    missing = {row["index"]: row["Missing Values"] for row in report["Missing Values Report"]}
+    assert missing["age"] == 2 and missing["score"] == 1 and missing["name"] == 0
+    assert report["Duplicate Report"]["Total Duplicates"] == 1
+
+
+# ✅ Test anonymize and clean on a dataset referenced by ID
+def test_anonymize_and_clean_by_dataset_id(server):
+    url, _ = server
+    dataset_id = json.loads(post(f"{url}/upload?filename=people.csv", CSV)[2])["dataset_id"]
+
+    status, _, body = post(f"{url}/anonymize?dataset_id={dataset_id}")
+    anonymized = pd.read_csv(io.BytesIO(body))
+    assert status == 200
+    assert (anonymized["name"] == "Anonymous").all()
+    assert not anonymized["email"].str.contains("example").any()
+
+    status, _, body = post(f"{url}/clean?dataset_id={dataset_id}&method=median&drop_duplicates=true&output=json")
+    cleaned = pd.DataFrame(json.loads(body))
+    assert status == 200
+    assert len(cleaned) == 3
+    assert cleaned["age"].notnull().all()
+
+
+# ✅ Test client errors
+def test_client_errors(server):
+    url, _ = server
+    assert post(f"{url}/profile?dataset_id=missing")[0] == 404
+    assert post(f"{url}/upload?filename=data.parquet", b"PAR1")[0] == 415
+    assert post(f"{url}/clean?filename=people.csv&method=bogus", CSV)[0] == 400
+    assert post(f"{url}/profile")[0] == 400
+
+
+# ✅ Test backpressure: a saturated pool answers 503 instead of queueing
+def test_saturated_pool_returns_503(server):
+    url, service = server
+    held = [service._slots.acquire(blocking=False) for _ in range(service.max_pending)]
+    assert all(held)
+    try:
+        status, headers, _ = post(f"{url}/profile?filename=other.csv", b"a,b\n1,2\n")
+        assert status == 503
+        assert headers["Retry-After"] == "1"
+    finally:
+        for _ in held:
+            service._slots.release()
+
+    assert post(f"{url}/profile?filename=other.csv", b"a,b\n1,2\n")[0] == 200
+
+
+# ✅ Test oversized bodies are rejected before they are read in full
+def test_body_size_limit(server, monkeypatch):
+    url, service = server
+    monkeypatch.setattr(service, "max_body_bytes", 64)
+    status, _, body = post(f"{url}/upload?filename=big.csv", CSV)
+    assert status == 413
+    assert "64" in json.loads(body)["error"]
+
+
+# ✅ Test the cache is bounded by spilled bytes and keeps datasets in use
+def test_cache_evicts_by_bytes(tmp_path):
+    cache = DatasetCache(max_bytes=250, directory=str(tmp_path))
+    for name in "abc":
+        os.makedirs(cache.directory_for(name))
+        cache.put(name, {"directory": cache.directory_for(name), "bytes": 100})
+    assert len(cache) == 3  # all three are still acquired by their uploads
+
+    cache.release("b")
+    assert "b" not in cache and not os.path.exists(cache.directory_for("b"))
+    assert cache.nbytes == 200
+    cache.release("a")
+    cache.release("c")
+    assert "a" in cache and "c" in cache
+
+    cache.clear()
+    assert len(cache) == 0 and not os.path.exists(cache.directory)
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ["statsmodels", "sklearn", "plotly.express", "seaborn", "matplotlib.pyplot"]
+
+
+def loaded_modules(module):
+    """Imports ``module`` in a fresh interpreter and returns which heavy modules got loaded."""
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True, text=True, check=True)
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+# ✅ Test that the pages defer heavy imports until they are used
+@pytest.mark.parametrize("module", [
+    "presentation.ui",
+    "presentation.summary_page",
+    "presentation.visualization_page",
+    "services.quality_analysis",
+])
+def test_pages_do_not_import_heavy_libraries(module):
+    assert loaded_modules(module) == []
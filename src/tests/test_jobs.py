@@ -0,0 +1,79 @@
+import threading
+import time
+import pandas as pd
+import pytest
+from src.services.jobs import Job, JobManager
+from src.services.quality_analysis import DataSummary
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(max_workers=2)
+    yield manager
+    manager.shutdown()
+
+
+def _wait(job, timeout=10):
+    deadline = time.time() + timeout
+    while not job.is_finished and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def _staged_work(stages, release, progress_callback=None):
+    for i in range(stages):
+        progress_callback(f"stage {i}", i / stages)
+        release.wait(5)
+    return "finished"
+
+
+# ✅ Jobs run in the background and report per-stage progress
+def test_job_progress_and_result(manager):
+    df = pd.DataFrame({"A": [1, 2, 3, 4], "B": [2, 4, 6, 9], "C": ["x", "y", "x", "z"]})
+    job = manager.submit(DataSummary(df).generate_report, job_id="summary")
+
+    _wait(job)
+    assert job.status == Job.DONE
+    assert job.progress == 1.0
+    assert job.stage == "Done"
+    assert "Missing Values Report" in job.result
+
+
+# ✅ Resubmitting under the same ID returns the live job
+def test_stable_job_ids(manager):
+    release = threading.Event()
+    first = manager.submit(_staged_work, 3, release, job_id="stable")
+    second = manager.submit(_staged_work, 3, release, job_id="stable")
+
+    assert first is second
+    release.set()
+    assert _wait(first).result == "finished"
+    assert manager.get("stable") is first
+
+
+# ✅ Cancellation takes effect at the next progress report
+def test_cancel(manager):
+    release = threading.Event()
+    job = manager.submit(_staged_work, 5, release, job_id="cancel-me")
+    while job.stage is None:
+        time.sleep(0.01)
+
+    manager.cancel("cancel-me")
+    release.set()
+    assert _wait(job).status == Job.CANCELLED
+    assert job.result is None
+
+    # A cancelled job can be restarted under the same ID
+    restarted = manager.submit(_staged_work, 1, release, job_id="cancel-me")
+    assert restarted is not job
+    assert _wait(restarted).status == Job.DONE
+
+
+# ✅ Failures are captured on the job
+def test_failed_job(manager):
+    def boom(progress_callback=None):
+        raise RuntimeError("bad data")
+
+    job = _wait(manager.submit(boom))
+    assert job.status == Job.FAILED
+    assert "bad data" in str(job.error)
@@ -0,0 +1,91 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.key_discovery import KeyDiscovery, key_violations
+from src.services.quality_analysis import DataSummary
+
+
+@pytest.fixture
+def sample_df():
+    """Creates order lines keyed by (order_id, line), a derived column, a near-unique email and noise."""
+    rng = np.random.default_rng(0)
+    orders = 3_000
+    lines = rng.integers(1, 4, orders)
+    n = int(lines.sum())
+    order_id = np.repeat(np.arange(orders), lines)
+    df = pd.DataFrame({
+        "order_id": order_id,
+        "line": np.arange(n) - np.repeat(np.cumsum(lines) - lines, lines),
+        "city": rng.choice(["Pune", "Delhi", "Mumbai", "Chennai"], n),
+        "channel": rng.choice(["web", "app", "store"], n),
+        "email": pd.Series([f"user{i}@example.com" for i in range(n)], dtype="string[pyarrow]"),
+        "amount": rng.normal(100, 15, n),
+    })
+    df["region"] = df["city"].map({"Pune": "West", "Mumbai": "West", "Delhi": "North", "Chennai": "South"})
+    df.loc[[10, 20], "region"] = "Central"  # two rows break city -> region
+    df.loc[500, "email"] = df.loc[400, "email"]
+    return df
+
+
+def brute_force_keys(df, columns, max_size):
+    """Every minimal unique combination, found with one duplicated() per combination."""
+    keys = []
+    for size in range(1, max_size + 1):
+        for combo in itertools.combinations(columns, size):
+            if any(set(key) <= set(combo) for key in keys):
+                continue
+            if not df.duplicated(subset=list(combo)).any():
+                keys.append(combo)
+    return sorted(keys)
+
+
+# ✅ Test minimal keys match a brute-force search, with sampling and exact verification
+def test_matches_brute_force(sample_df):
+    columns = KeyDiscovery.candidate_columns(sample_df)
+    assert "amount" not in columns
+
+    for sample_size in (0, 1_000):
+        result = KeyDiscovery(sample_size=sample_size).discover(sample_df)
+        found = result.keys[result.keys["Status"] == "Key"]["Columns"].map(tuple).tolist()
+        assert sorted(found) == brute_force_keys(sample_df, columns, 3)
+        assert result.complete
+
+
+# ✅ Test near keys report how many rows break them, and which
+def test_near_keys(sample_df):
+    # The duplicate email is unlikely to be sampled, so email passes the sample and fails verification
+    keys = KeyDiscovery(sample_size=1_000).discover(sample_df).keys
+    near = keys[keys["Status"] == "Near key"]
+    assert near[near["Columns"].map(tuple) == ("email",)]["Duplicate Rows"].tolist() == [2]
+    assert key_violations(sample_df, ["email"]).index.tolist() == [400, 500]
+
+    with_missing = sample_df.assign(order_id=sample_df["order_id"].astype("Int64"))
+    with_missing.loc[0, "order_id"] = pd.NA
+    keys = KeyDiscovery().discover(with_missing).keys
+    assert keys[keys["Columns"].map(tuple) == ("order_id", "line")]["Missing Rows"].tolist() == [1]
+
+
+# ✅ Test approximate functional dependencies and their exact violation counts
+def test_functional_dependencies(sample_df):
+    dependencies = KeyDiscovery().discover(sample_df).dependencies
+    pairs = dict(zip(zip(dependencies["Determinant"], dependencies["Dependent"]), dependencies["Violating Rows"]))
+    assert pairs[("city", "region")] == 2
+    assert ("region", "city") not in pairs
+    assert ("city", "channel") not in pairs
+
+    strict = KeyDiscovery(max_fd_error=0).discover(sample_df).dependencies
+    assert ("city", "region") not in set(zip(strict["Determinant"], strict["Dependent"]))
+
+
+# ✅ Test search limits and the report section
+def test_limits_and_report(sample_df):
+    result = KeyDiscovery(max_candidates=2).discover(sample_df)
+    assert not result.complete
+    assert result.summary()["Search"].startswith("stopped early")
+    assert KeyDiscovery(max_keys=1).discover(sample_df).keys["Status"].eq("Key").sum() == 1
+
+    report = DataSummary(sample_df).generate_report()
+    assert report["Candidate Keys"]["Columns"].iloc[0] == ["order_id", "line"]
+    assert report["Key Search"]["Rows"] == len(sample_df)
+    assert "Functional Dependencies" in report
@@ -0,0 +1,106 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from src.services import memory_governor
+from src.services.memory_governor import CHUNKED, IN_MEMORY, SAMPLED, MemoryGovernor, column_bytes
+from src.services.quality_analysis import CorrelationHandler, DataAnonymizer
+
+
+@pytest.fixture
+def sample_df():
+    """Creates numeric columns with gaps and a correlated pair, e-mails and a name column."""
+    rng = np.random.default_rng(0)
+    n = 20_000
+    df = pd.DataFrame(rng.normal(size=(n, 4)), columns=["a", "b", "c", "d"])
+    df["b"] = 2 * df["a"] + rng.normal(scale=0.1, size=n)
+    df["d"] = df["d"] * 1e6 + 1e9  # large offset: one-pass sums need centering
+    df.loc[::5, "a"] = np.nan
+    df.loc[::7, "c"] = np.nan
+    df["count"] = pd.array(rng.integers(0, 5, n), dtype="Int64")
+    df.loc[::3, "count"] = pd.NA
+    df["email"] = [f"user{i}@example.com" if i % 4 else None for i in range(n)]
+    df["Customer Name"] = pd.Series([f"Person {i}" for i in range(n)], dtype="string[pyarrow]")
+    return df
+
+
+@pytest.fixture
+def fixed_ram(monkeypatch):
+    """Pretends 100 MB of RAM are available, whatever the host has."""
+    monkeypatch.setattr(memory_governor, "available_memory", lambda: 100 * (1 << 20))
+
+
+# ✅ Test the budget and the in-memory / chunked / sampled decisions
+def test_plan_modes(fixed_ram, caplog):
+    governor = MemoryGovernor(budget=0, fraction=0.5)
+    assert governor.budget_bytes() == 50 * (1 << 20)
+    assert MemoryGovernor(budget=1 << 20).budget_bytes() == 1 << 20
+
+    governor = MemoryGovernor(budget=1_000_000)
+    assert governor.plan("Small", 10_000, 10).mode == IN_MEMORY
+    with caplog.at_level(logging.WARNING, logger="src.services.memory_governor"):
+        chunked = governor.plan("Wide", 1_000_000, 100, fixed_bytes=200_000, chunkable=True)
+    assert chunked.mode == CHUNKED and chunked.chunk_rows == 8_000
+    assert "Wide" in caplog.text and "chunked" in caplog.text
+
+    sampled = governor.plan("Sort", 1_000_000, 100, sampleable=True)
+    assert sampled.mode == SAMPLED and sampled.sample_size == 10_000
+    assert len(sampled.sample(pd.DataFrame({"x": np.arange(1_000_000)}))) == 10_000
+    # Nothing cheaper available: runs in memory, with a warning
+    assert governor.plan("Merge", 1_000_000, 100).mode == IN_MEMORY
+
+
+# ✅ Test footprint estimates from shape and dtypes
+def test_column_bytes(sample_df):
+    sizes = column_bytes(sample_df)
+    assert sizes["a"] == 8 * len(sample_df)
+    exact = sample_df["email"].memory_usage(index=False, deep=True)
+    assert abs(sizes["email"] - exact) < 0.05 * exact
+    assert sizes["Customer Name"] == sample_df["Customer Name"].memory_usage(index=False, deep=False)
+
+
+# ✅ Test chunked correlation matches the in-memory result
+def test_chunked_correlation(sample_df, fixed_ram):
+    numerical = ["a", "b", "c", "d", "count"]
+    tight = MemoryGovernor(budget=100_000)
+    chunked = CorrelationHandler.correlation_matrix(sample_df, numerical, governor=tight)
+    expected = sample_df[numerical].corr()
+    pd.testing.assert_frame_equal(chunked, expected, atol=1e-10)
+
+    assert CorrelationHandler.remove_highly_correlated_features(sample_df, governor=tight) == ["b"]
+    assert CorrelationHandler.remove_highly_correlated_features(sample_df) == ["b"]
+
+
+# ✅ Test anonymization only rewrites masked columns, chunked or not
+def test_anonymize_chunked(sample_df, fixed_ram):
+    original = sample_df.copy()
+    chunked = DataAnonymizer.anonymize_data(sample_df, governor=MemoryGovernor(budget=200_000))
+    pd.testing.assert_frame_equal(chunked, DataAnonymizer.anonymize_data(sample_df))
+    pd.testing.assert_frame_equal(sample_df, original)
+
+    assert chunked["email"].dropna().eq("*****@*****.com").all()
+    assert chunked["email"].isna().sum() == original["email"].isna().sum()
+    assert chunked["Customer Name"].eq("Anonymous").all()
+    assert str(chunked["Customer Name"].dtype) == "string"
+
+
+# ✅ Test chunked maps write Arrow chunks straight into the result
+def test_plan_map_arrow(sample_df, fixed_ram):
+    emails = sample_df["email"].astype("string[pyarrow]")
+    plan = MemoryGovernor(budget=200_000).plan("Mask", len(emails), 100, chunkable=True)
+    masked = plan.map(emails, lambda chunk: chunk.str.replace("@", "#", regex=False))
+
+    assert plan.mode == CHUNKED
+    pd.testing.assert_series_equal(masked, emails.str.replace("@", "#", regex=False))
+    assert masked.array.__arrow_array__().num_chunks == -(-len(emails) // plan.chunk_rows)
+
+
+# ✅ Test VIF runs on a row sample when it would not fit the budget
+def test_vif_sampled(sample_df, fixed_ram):
+    from src.services.quality_analysis import MulticollinearityChecker
+
+    numeric = sample_df[["a", "b", "c"]].dropna()
+    sampled = MulticollinearityChecker.calculate_vif(numeric, governor=MemoryGovernor(budget=200_000))
+    exact = MulticollinearityChecker.calculate_vif(numeric)
+
+    assert list(sampled["Feature"]) == list(exact["Feature"]) == ["a", "b"]
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.missingness import MissingnessMatrix
+from src.services.quality_analysis import MissingValueAnalyzer
+
+
+@pytest.fixture
+def sample_df():
+    """Creates a table where groups of columns go missing together."""
+    rng = np.random.default_rng(0)
+    n = 3_000
+    df = pd.DataFrame(rng.normal(size=(n, 12)), columns=[f"c{i}" for i in range(12)])
+    df["label"] = rng.choice(["a", "b", None], n)
+    block = rng.random(n) < 0.2
+    df.loc[block, ["c1", "c2", "c3"]] = np.nan
+    df.loc[rng.random(n) < 0.05, "c7"] = np.nan
+    return df
+
+
+# ✅ Test that only columns with gaps are stored, as packed bits
+def test_packed_storage(sample_df):
+    matrix = MissingnessMatrix.from_dataframe(sample_df)
+    assert matrix.columns == ["c1", "c2", "c3", "c7", "label"]
+    assert matrix.bits.shape == (5, (len(sample_df) + 63) // 64)
+    assert matrix.nbytes < sample_df.isna().to_numpy().nbytes / 8 + 64
+    pd.testing.assert_series_equal(matrix.missing_counts, sample_df.isna().sum(), check_names=False)
+
+
+# ✅ Test popcount co-missingness against a boolean matrix product
+def test_co_missing_counts(sample_df):
+    matrix = MissingnessMatrix.from_dataframe(sample_df)
+    mask = sample_df[matrix.columns].isna().to_numpy().astype(np.int64)
+    np.testing.assert_array_equal(matrix.co_missing_counts().to_numpy(), mask.T @ mask)
+
+    jaccard = matrix.jaccard()
+    assert jaccard.loc["c1", "c2"] == pytest.approx(1.0)
+    assert jaccard.loc["c1", "c7"] < 0.2
+
+    pairs = matrix.top_pairs(top=3)
+    assert {tuple(sorted(p)) for p in pairs[["Column A", "Column B"]].to_numpy().tolist()} == {("c1", "c2"), ("c1", "c3"), ("c2", "c3")}
+    assert (pairs["P(B missing | A missing)"] == 1.0).all()
+
+
+# ✅ Test co-missingness tiled one bitset at a time gives the same counts
+def test_co_missing_tiles(sample_df, monkeypatch):
+    expected = MissingnessMatrix.from_dataframe(sample_df).co_missing_counts()
+    monkeypatch.setattr("src.services.missingness.CO_MISSING_TILE_BYTES", 1)
+    pd.testing.assert_frame_equal(MissingnessMatrix.from_dataframe(sample_df).co_missing_counts(), expected)
+
+
+# ✅ Test row patterns match a direct count of row masks
+def test_row_patterns(sample_df, monkeypatch):
+    # Small blocks so the hash counts are merged across several blocks
+    monkeypatch.setattr("src.services.missingness.PATTERN_BLOCK_BITS", 1 << 9)
+    matrix = MissingnessMatrix.from_dataframe(sample_df)
+    patterns = matrix.row_patterns(top=20)
+
+    mask = sample_df[matrix.columns].isna()
+    expected = mask.apply(lambda row: ", ".join(row.index[row]) or "(no missing values)", axis=1).value_counts()
+    got = patterns.set_index("Missing Columns")["Rows"]
+    assert got.sum() == len(sample_df)
+    assert got.to_dict() == expected.to_dict()
+    assert patterns["Rows"].is_monotonic_decreasing
+
+
+# ✅ Test clustered heatmap ordering keeps co-missing columns adjacent
+def test_clustered_jaccard(sample_df):
+    heatmap = MissingnessMatrix.from_dataframe(sample_df).clustered_jaccard(max_columns=4)
+    assert heatmap.shape == (4, 4)
+    order = list(heatmap.index)
+    positions = sorted(order.index(c) for c in ["c1", "c2", "c3"])
+    assert positions[-1] - positions[0] == 2
+    assert list(heatmap.columns) == order
+
+
+# ✅ Test the analyzer on a table without missing values
+def test_no_missing_values():
+    result = MissingValueAnalyzer.analyze_missing_patterns(pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}))
+    assert result["Row Patterns"].to_dict("records") == [
+        {"Missing Columns": "(no missing values)", "Columns Missing": 0, "Rows": 2, "Percentage": 100.0}
+    ]
+    assert result["Column Pairs"].empty
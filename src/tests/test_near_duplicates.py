@@ -0,0 +1,112 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.near_duplicates import NearDuplicateDetector, drop_near_duplicates, normalize_records
+from src.services.quality_analysis import DataSummary
+from src.services.sampling import scale_duplicate_report
+
+
+@pytest.fixture
+def sample_df():
+    """Creates customer records, a few re-typed copies with small edits and an unrelated numeric column."""
+    rng = np.random.default_rng(0)
+    first = ["Asha", "Ravi", "Meera", "Vikram", "Priya", "Arjun", "Kavya", "Rohan", "Sneha", "Karan"]
+    last = ["Sharma", "Patel", "Iyer", "Reddy", "Gupta", "Nair", "Singh", "Khan", "Das", "Joshi"]
+    cities = ["Pune", "Delhi", "Mumbai", "Chennai", "Kolkata"]
+    n = 100
+    names = [f"{first[i % 10]} {last[i // 10]}" for i in range(n)]
+    df = pd.DataFrame({
+        "name": names,
+        "email": [f"{name.lower().replace(' ', '.')}{code}@example.com" for name, code in zip(names, rng.integers(1_000, 10_000, n))],
+        "city": rng.choice(cities, n),
+        "amount": rng.normal(100, 15, n),
+    })
+    copies = df.iloc[[3, 50, 72, 95]].copy()
+    copies["name"] = copies["name"].str.upper() + "  "               # casing and whitespace
+    copies.loc[50, "email"] = copies.loc[50, "email"].replace("@", " @")  # punctuation spacing
+    copies.loc[72, "email"] = copies.loc[72, "email"].replace("example", "exmple")  # a typo
+    copies["amount"] = 0.0
+    return pd.concat([df, copies, df.iloc[[7]]], ignore_index=True)
+
+
+def brute_force_pairs(detector, records):
+    """Every pair of distinct non-empty records whose exact shingle Jaccard reaches the threshold."""
+    values, counts = detector.shingles(records)
+    starts = np.cumsum(counts) - counts
+    sets = [set(values[s:s + c].tolist()) for s, c in zip(starts, counts)]
+    return {(i, j) for i, j in itertools.combinations(range(len(sets)), 2)
+            if sets[i] and sets[j] and len(sets[i] & sets[j]) / len(sets[i] | sets[j]) >= detector.threshold}
+
+
+# ✅ Test normalization folds casing, whitespace and punctuation
+def test_normalize_records():
+    df = pd.DataFrame({"a": ["  Hello,  World ", None, None], "b": ["X-1", "y", None]})
+    assert normalize_records(df, ["a", "b"]).tolist() == ["hello world x 1", "y", ""]
+
+
+# ✅ Test the retyped copies are found, the originals kept and unrelated rows left alone
+def test_detect_clusters(sample_df):
+    result = NearDuplicateDetector().detect(sample_df, ["name", "email", "city"])
+    clusters = result.clusters.groupby("Cluster")["Row"].apply(list).tolist()
+    assert sorted(clusters) == [[3, 100], [7, 104], [50, 101], [72, 102], [95, 103]]
+    assert result.redundant.tolist() == [100, 101, 102, 103, 104]
+    assert result.clusters.set_index("Row").at[104, "Similarity"] == 1.0
+    assert (result.pairs["Similarity"] >= 0.8).all()
+
+    summary = result.summary()
+    assert summary["Near Duplicates"] == 5 and summary["Near-Duplicate Clusters"] == 5
+    dropped = result.drop(sample_df)
+    assert len(dropped) == 100 and dropped.index.max() == 99
+    pd.testing.assert_frame_equal(drop_near_duplicates(sample_df, ["name", "email", "city"]), dropped)
+
+
+# ✅ Test LSH candidates cover every pair above the threshold (compared with all pairs)
+def test_matches_brute_force(sample_df):
+    detector = NearDuplicateDetector(threshold=0.6)
+    records = np.asarray(normalize_records(sample_df, ["name", "city"]).unique(), dtype=object)
+    values, counts = detector.shingles(records)
+    pairs = detector.candidate_pairs(detector.signatures(values, counts), counts > 0)
+    found = {tuple(p) for p, score in zip(pairs.tolist(), detector.jaccard(values, counts, pairs)) if score >= 0.6}
+    expected = brute_force_pairs(detector, records)
+    assert expected and found == expected
+
+    assert NearDuplicateDetector.lsh_bands(64, 0.8) == (16, 4)
+    with pytest.raises(ValueError):
+        NearDuplicateDetector(threshold=0)
+
+
+# ✅ Test the duplicate report counts near duplicates and scales them for samples
+def test_report(sample_df):
+    report = DataSummary(sample_df).generate_report()
+    assert report["Duplicate Report"]["Near Duplicates"] == 5
+    assert report["Near-Duplicate Rows"]["Row"].tolist()[:2] == [3, 100]
+
+    scaled = scale_duplicate_report(report["Duplicate Report"], len(sample_df), 10 * len(sample_df))
+    assert scaled["Near Duplicates In Sample"] == 5
+    assert scaled["Near Duplicates Lower Bound"] == 50
+    assert scaled["Near Duplicates"] == round(5 * 1050 * 1049 / (105 * 104))  # pair survival (n/N)^2
+    assert "Near Duplicates CI (95%)" not in scaled
+
+    empty = NearDuplicateDetector().detect(sample_df[["amount"]])
+    assert empty.clusters.empty and empty.summary()["Near Duplicates"] == 0
+
+
+# ✅ Test rows sharing only categorical text are not near duplicates
+def test_categorical_only():
+    rng = np.random.default_rng(1)
+    n = 5_000
+    df = pd.DataFrame({
+        "customer_id": np.arange(n),
+        "city": rng.choice(["Pune", "Delhi", "Mumbai"], n),
+        "gender": rng.choice(["F", "M"], n),
+    })
+    assert NearDuplicateDetector.default_columns(df) == []
+    report = DataSummary(df).generate_report()
+    assert report["Duplicate Report"]["Near Duplicates"] == 0
+    assert report["Duplicate Report"]["Compared Columns"] == []
+    assert len(drop_near_duplicates(df)) == n
+
+    df["customer_id"] = [f"C{i:05d}" for i in range(n)]
+    assert NearDuplicateDetector.default_columns(df) == ["customer_id"]
+    assert NearDuplicateDetector().detect(df).summary()["Near Duplicates"] == 0
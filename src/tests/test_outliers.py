@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.outliers import OutlierEngine, IsolationForestDetector
+from src.services.quality_analysis import OutlierDetector
+
+
+@pytest.fixture
+def sample_df():
+    """Creates numeric columns with planted outliers and missing values."""
+    rng = np.random.default_rng(0)
+    n = 5_000
+    df = pd.DataFrame({
+        "normal": rng.normal(0, 1, n),
+        "counts": rng.integers(10, 20, n),
+        "label": rng.choice(["a", "b"], n),
+    })
+    df.loc[[5, 51, 501], "normal"] = [12.0, -15.0, 20.0]
+    df.loc[[7, 70], "counts"] = [500, 900]
+    df.loc[::100, "normal"] = np.nan
+    return df
+
+
+def iqr_reference(df):
+    """Column-by-column IQR report computed the straightforward way."""
+    report = {}
+    for col in df.select_dtypes(include=["number"]).columns:
+        q1, q3 = df[col].quantile(0.25), df[col].quantile(0.75)
+        outliers = df[col][(df[col] < q1 - 1.5 * (q3 - q1)) | (df[col] > q3 + 1.5 * (q3 - q1))]
+        if not outliers.empty:
+            report[col] = {"Outlier Count": outliers.count(), "Min Outlier": outliers.min(), "Max Outlier": outliers.max()}
+    return report
+
+
+# ✅ Test that the vectorized IQR report matches the per-column computation
+def test_iqr_matches_reference(sample_df):
+    assert OutlierDetector.detect_extreme_values(sample_df) == iqr_reference(sample_df)
+    report = OutlierEngine(chunk_size=333).detect(sample_df).report()
+    assert report["counts"] == {"Outlier Count": 2, "Min Outlier": 500, "Max Outlier": 900}
+    assert isinstance(report["counts"]["Max Outlier"], int)
+
+
+# ✅ Test the row bitmap agrees with the per-column masks
+@pytest.mark.parametrize("method", ["iqr", "zscore", "mad"])
+def test_row_bitmap(sample_df, method):
+    engine = OutlierEngine(method=method, chunk_size=1_000)
+    result = engine.detect(sample_df)
+    lower, upper = result.lower, result.upper
+    values = sample_df[result.columns].to_numpy(dtype=float)
+    expected = ((values < lower) | (values > upper)).any(axis=1)
+
+    np.testing.assert_array_equal(result.rows.to_mask(), expected)
+    assert result.rows.length == len(sample_df)
+    # Planted outliers are found by every method; missing values never are
+    assert {5, 51, 501, 7, 70} <= set(result.rows.indices())
+    assert result.summary().loc["normal", "Outlier Count"] == result.counts[0]
+
+
+# ✅ Test z-score and MAD fences
+def test_zscore_and_mad_fences():
+    values = np.array([[1.0, 5.0], [2.0, 5.0], [3.0, 5.0], [4.0, 5.0], [100.0, 6.0]])
+    lower, upper = OutlierEngine(method="zscore", z_threshold=1.0).fences(values)
+    np.testing.assert_allclose(upper, values.mean(axis=0) + values.std(axis=0, ddof=1))
+
+    lower, upper = OutlierEngine(method="mad").fences(values)
+    # Column 0: median 3, MAD 1 -> fences 3 -/+ 3.5 / 0.6745
+    assert lower[0] == pytest.approx(3 - 3.5 / 0.6745)
+    # Column 1 has MAD 0 and falls back to the mean absolute deviation
+    assert upper[1] > 5.0
+
+
+# ✅ Test that invalid methods are rejected
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        OutlierEngine(method="dbscan")
+
+
+# ✅ Test Isolation Forest trained on a subsample flags planted multivariate outliers
+def test_isolation_forest(sample_df):
+    detector = IsolationForestDetector(max_train_rows=1_000, chunk_size=700)
+    rows = detector.detect(sample_df)
+    assert rows.length == len(sample_df)
+    assert {5, 51, 501} <= set(rows.indices())
+    assert rows.count() < len(sample_df) * 0.05
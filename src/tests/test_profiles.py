@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.profiles import DatasetProfile, compare_profiles, profile_files
+
+
+@pytest.fixture
+def sample_df():
+    """Creates a mixed-type dataset with missing values."""
+    rng = np.random.default_rng(0)
+    n = 20_000
+    df = pd.DataFrame({
+        "amount": rng.normal(100, 15, n),
+        "city": rng.choice(["Pune", "Delhi", "Mumbai", "Chennai"], n, p=[0.4, 0.3, 0.2, 0.1]),
+        "signup": pd.date_range("2024-01-01", periods=n, freq="h"),
+        "visits": rng.integers(0, 50, n),
+    })
+    df.loc[::10, "amount"] = np.nan
+    return df
+
+
+# ✅ Test that merged partition profiles match the profile of the whole dataset
+def test_merge_matches_full_profile(sample_df):
+    full = DatasetProfile.from_dataframe(sample_df)
+    parts = [DatasetProfile.from_dataframe(sample_df.iloc[i:i + 3_000]) for i in range(0, len(sample_df), 3_000)]
+    merged = DatasetProfile.merge_all(parts)
+
+    assert merged.rows == full.rows == len(sample_df)
+    for name, column in full.columns.items():
+        other = merged.columns[name]
+        assert other.missing == column.missing
+        assert other.mean == pytest.approx(column.mean)
+        assert other.m2 == pytest.approx(column.m2)
+        np.testing.assert_array_equal(other.distinct.registers, column.distinct.registers)
+
+    amount = merged.columns["amount"]
+    assert amount.missing == 2_000
+    assert amount.std == pytest.approx(sample_df["amount"].std())
+    assert merged.columns["city"].top_values.top_k(1)[0][0] == "Pune"
+
+
+# ✅ Test that a column missing from one partition counts as missing there
+def test_merge_with_schema_difference(sample_df):
+    left = DatasetProfile.from_dataframe(sample_df.iloc[:100])
+    right = DatasetProfile.from_dataframe(sample_df.iloc[100:150].drop(columns="visits"))
+    merged = left.merge(right)
+    assert merged.columns["visits"].count == 150
+    assert merged.columns["visits"].missing == 50
+
+
+# ✅ Test binary round trip
+def test_round_trip(sample_df):
+    profile = DatasetProfile.from_dataframe(sample_df)
+    payload = profile.to_bytes()
+    restored = DatasetProfile.from_bytes(payload)
+
+    assert len(payload) < 100_000
+    pd.testing.assert_frame_equal(restored.summary(), profile.summary())
+    # A restored profile keeps merging like the original
+    merged = restored.merge(DatasetProfile.from_dataframe(sample_df))
+    assert merged.columns["city"].top_values.top_k(1)[0] == ("Pune", 2 * (sample_df["city"] == "Pune").sum())
+
+
+# ✅ Test schema and distribution drift detection
+def test_compare_profiles(sample_df):
+    baseline = DatasetProfile.from_dataframe(sample_df)
+    current_df = sample_df.drop(columns="visits").assign(amount=sample_df["amount"] * 1.5, channel="web")
+    current = DatasetProfile.from_dataframe(current_df)
+
+    comparison = compare_profiles(baseline, current)
+    schema = comparison["Schema Changes"].set_index("Column")["Change"].to_dict()
+    assert schema == {"channel": "added", "visits": "removed"}
+
+    drift = comparison["Distribution Drift"].set_index("Column")
+    assert drift.loc["amount", "Drift"] == "significant"
+    assert drift.loc["city", "Drift"] == "stable"
+    assert drift.loc["signup", "PSI"] == pytest.approx(0.0)
+
+
+# ✅ Test profiling file partitions in parallel
+def test_profile_files(sample_df, tmp_path):
+    paths = []
+    for i, start in enumerate(range(0, len(sample_df), 10_000)):
+        path = tmp_path / f"part_{i}.csv"
+        sample_df.iloc[start:start + 10_000].to_csv(path, index=False)
+        paths.append(path)
+
+    profile = profile_files(paths, max_workers=2, chunksize=4_000)
+    assert profile.rows == len(sample_df)
+    assert profile.columns["amount"].mean == pytest.approx(sample_df["amount"].mean())
+    assert abs(profile.columns["visits"].distinct.estimate() - 50) <= 1
+
+
+# ✅ Test a column's kind comes from its first non-missing values, not from an all-missing chunk
+def test_kind_after_missing_chunk():
+    profile = DatasetProfile.from_chunks([pd.DataFrame({"x": [np.nan] * 3, "y": [None] * 3}),
+                                          pd.DataFrame({"x": ["a", "b", "c"], "y": [1.0, 2.0, 3.0]})])
+    x, y = profile.columns["x"], profile.columns["y"]
+    assert x.kind == "categorical" and x.missing == 3 and x.top_values.top_k(1)[0][1] == 1
+    assert y.kind == "numeric" and y.mean == 2.0 and y.count == 6
+
+    sparse = DatasetProfile.from_dataframe(pd.DataFrame({"x": [np.nan] * 3}))
+    assert sparse.columns["x"].kind is None
+    restored = DatasetProfile.from_bytes(sparse.to_bytes())
+    merged = DatasetProfile.merge_all([restored, DatasetProfile.from_dataframe(pd.DataFrame({"x": ["a", "b"]}))])
+    assert merged.columns["x"].kind == "categorical" and merged.columns["x"].count == 5
+    assert compare_profiles(sparse, restored)["Distribution Drift"].empty
+
+    # Numbers, then text: the column becomes categorical instead of failing
+    mixed = DatasetProfile.from_chunks([pd.DataFrame({"x": [1.0, 2.0]}), pd.DataFrame({"x": ["a", "b"]})])
+    assert mixed.columns["x"].kind == "categorical" and mixed.columns["x"].n == 0
+    assert DatasetProfile.merge_all([DatasetProfile.from_dataframe(pd.DataFrame({"x": [1.0]})),
+                                     DatasetProfile.from_dataframe(pd.DataFrame({"x": ["a"]}))]).columns["x"].count == 2
@@ -0,0 +1,71 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.infrastructure.report_export import ChartRenderer, ReportExporter, ReportJSONWriter
+from src.services.quality_analysis import DataSummary
+
+
+@pytest.fixture
+def sample_data():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "Name": ["Alice", "Bob", "Charlie", "Alice", "Eve"] * 40,
+        "Age": rng.normal(35, 10, 200),
+        "Salary": rng.normal(60000, 5000, 200),
+        "City": ["NY", "ny", "Boston", "LA", None] * 40,
+    })
+    df.loc[::7, "Age"] = np.nan
+    return df
+
+
+@pytest.fixture
+def report(sample_data):
+    return DataSummary(sample_data).generate_report()
+
+
+# ✅ JSON is written incrementally and parses back
+def test_json_export(report, tmp_path):
+    path = ReportExporter(ChartRenderer(cache_dir=tmp_path / "charts", max_workers=0)).export_json(report, tmp_path / "report.json")
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert list(data) == list(report)
+    missing = {row["index"]: row["Missing Values"] for row in data["Missing Values Report"]}
+    assert missing["Age"] == report["Missing Values Report"].loc["Age", "Missing Values"]
+    assert data["Duplicate Report"]["Total Duplicates"] == report["Duplicate Report"]["Total Duplicates"]
+
+
+# ✅ Large frames are streamed in blocks
+def test_json_frame_blocks():
+    import io
+    buffer = io.StringIO()
+    frame = pd.DataFrame({"a": range(25), "b": [None] * 25})
+    ReportJSONWriter(rows_per_write=10).write({"Rows": frame}, buffer)
+
+    rows = json.loads(buffer.getvalue())["Rows"]
+    assert [row["a"] for row in rows] == list(range(25))
+    assert rows[0]["b"] is None
+
+
+# ✅ Charts are cached by fingerprint
+def test_chart_cache(sample_data, tmp_path):
+    renderer = ChartRenderer(cache_dir=tmp_path, max_workers=0)
+    specs = [ChartRenderer.histogram_spec(sample_data["Age"]), ChartRenderer.histogram_spec(sample_data["Salary"])]
+
+    paths = renderer.render(specs)
+    assert all(os.path.exists(p) for p in paths)
+    mtimes = [os.path.getmtime(p) for p in paths]
+    assert renderer.render(specs) == paths
+    assert [os.path.getmtime(p) for p in paths] == mtimes
+
+
+# ✅ PDF export with charts rendered in a process pool
+def test_pdf_export(report, sample_data, tmp_path):
+    exporter = ReportExporter(ChartRenderer(cache_dir=tmp_path / "charts", max_workers=2))
+    path = exporter.export_pdf(report, tmp_path / "report.pdf", df=sample_data)
+
+    with open(path, "rb") as f:
+        assert f.read(5) == b"%PDF-"
+    assert len(os.listdir(tmp_path / "charts")) == 3  # missing values + 2 histograms
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.sampling import proportion_interval, sample_rows, scale_duplicate_report
+from src.services.quality_analysis import DataSummary
+
+
+@pytest.fixture
+def large_data():
+    rng = np.random.default_rng(7)
+    n = 20_000
+    df = pd.DataFrame({
+        "Value": rng.normal(0, 1, n),
+        "Other": rng.normal(5, 2, n),
+        "Segment": rng.choice(["a", "b", "c"], n, p=[0.9, 0.09, 0.01]),
+    })
+    df.loc[rng.random(n) < 0.2, "Value"] = np.nan
+    return df
+
+
+# ✅ Stratified sampling keeps rare strata
+def test_stratified_sample(large_data):
+    sample = sample_rows(large_data, 500, stratify_by="Segment")
+
+    assert set(sample["Segment"]) == {"a", "b", "c"}
+    assert abs(len(sample) - 500) <= 3
+    assert sample.index.is_monotonic_increasing
+
+
+# ✅ Wilson interval covers the estimate and collapses with the full population
+def test_proportion_interval():
+    p, low, high = proportion_interval(20, 100, 10_000)
+    assert low < p < high
+    p, low, high = proportion_interval(20, 100, 100)
+    assert low == pytest.approx(0.2) and high == pytest.approx(0.2)
+
+
+# ✅ Approximate report is labeled and has intervals that cover the exact value
+def test_approximate_report(large_data):
+    summary = DataSummary(large_data, sample_size=2000)
+    approx = summary.generate_report(approximate=True)
+    exact = summary.generate_report()
+
+    assert approx["Profile Mode"]["Mode"] == "Approximate"
+    assert approx["Profile Mode"]["Rows Analyzed"] == 2000
+    assert exact["Profile Mode"]["Mode"] == "Exact"
+
+    missing = approx["Missing Values Report"].loc["Value"]
+    exact_pct = exact["Missing Values Report"].loc["Value", "Percentage"]
+    assert missing["CI Low %"] <= exact_pct <= missing["CI High %"]
+    assert set(approx) == set(exact)
+
+
+# ✅ Test missing patterns and co-missing pairs of the approximate report are scaled, with CIs
+def test_approximate_missing_patterns(large_data):
+    df = large_data.copy()
+    df.loc[df["Value"].isnull() & (df.index % 2 == 0), "Other"] = np.nan
+    summary = DataSummary(df, sample_size=2000)
+    approx, exact = summary.generate_report(approximate=True), summary.generate_report()
+
+    patterns = approx["Missing Value Patterns"].set_index("Missing Columns")
+    exact_patterns = exact["Missing Value Patterns"].set_index("Missing Columns")
+    assert patterns["Rows"].sum() == pytest.approx(len(df), rel=0.01)
+    for label in ["Value", "Value, Other"]:
+        assert patterns.loc[label, "CI Low %"] <= exact_patterns.loc[label, "Percentage"] <= patterns.loc[label, "CI High %"]
+
+    pair = approx["Co-Missing Columns"].iloc[0]
+    exact_pair = exact["Co-Missing Columns"].iloc[0]
+    assert pair["CI Low %"] <= 100 * exact_pair["Both Missing"] / len(df) <= pair["CI High %"]
+    assert abs(pair["Both Missing"] - exact_pair["Both Missing"]) < 0.2 * exact_pair["Both Missing"]
+
+
+# ✅ Test the approximate cardinality report sketches every row, not the sample
+def test_approximate_cardinality(large_data):
+    approx = DataSummary(large_data, sample_size=2000).generate_report(approximate=True)
+    distinct = approx["Cardinality Report"].set_index("Column")["Distinct (approx.)"]
+
+    assert abs(distinct["Other"] - len(large_data)) < 0.05 * len(large_data)
+    assert distinct["Segment"] == 3
+
+
+# ✅ Test sampled duplicate counts are corrected for pairs split by sampling
+def test_scale_duplicate_report():
+    rng = np.random.default_rng(3)
+    originals = pd.DataFrame({"id": np.arange(20_000), "value": rng.normal(size=20_000)})
+    df = pd.concat([originals, originals], ignore_index=True)  # 20,000 duplicates
+    sample = sample_rows(df, 5_000, random_state=0)
+    in_sample = int(sample.duplicated().sum())
+
+    scaled = scale_duplicate_report({"Total Duplicates": in_sample}, len(sample), len(df))
+    assert scaled["Duplicates In Sample"] == in_sample
+    assert scaled["Lower Bound"] < 20_000 * 0.2
+    assert abs(scaled["Total Duplicates"] - 20_000) < 0.15 * 20_000
+    assert "CI (95%)" not in scaled
+    assert scale_duplicate_report({"Total Duplicates": 0}, 5_000, 40_000)["Total Duplicates"] == 0
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.scaling import FeatureScaler
+
+
+@pytest.fixture
+def sample_data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "A": rng.normal(10, 3, 1000),
+        "B": rng.uniform(-5, 5, 1000),
+        "Label": ["x"] * 1000,
+    })
+
+
+def _chunks(df, size):
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size]
+
+
+# ✅ Chunked fit matches a single in-memory fit
+def test_chunked_fit_matches_full_fit(sample_data):
+    full = FeatureScaler(method="standard").fit(sample_data)
+    chunked = FeatureScaler(method="standard").fit_chunks(_chunks(sample_data, 128))
+
+    assert full.columns == ["A", "B"]
+    np.testing.assert_allclose(chunked.mean_, sample_data[["A", "B"]].mean().values)
+    np.testing.assert_allclose(chunked.variance_, sample_data[["A", "B"]].var(ddof=0).values)
+    np.testing.assert_allclose(chunked.min_, full.min_)
+    np.testing.assert_allclose(chunked.max_, full.max_)
+
+
+# ✅ Min-Max scaling maps to [0, 1] as float32 and ignores NaNs
+def test_minmax_transform_float32():
+    df = pd.DataFrame({"A": [1.0, None, 3.0, 5.0], "B": [2, 2, 2, 2]})
+    scaled = FeatureScaler(method="minmax").fit_transform(df)
+
+    assert scaled["A"].dtype == np.float32
+    assert scaled["A"].min() == 0 and scaled["A"].max() == 1
+    assert scaled["A"].isnull().sum() == 1
+    assert (scaled["B"] == 0).all()  # constant column does not divide by zero
+    assert df["A"].dtype == np.float64  # original frame untouched
+
+
+# ✅ In-place transform writes back into the frame
+def test_inplace_transform(sample_data):
+    scaler = FeatureScaler(method="standard").fit(sample_data)
+    result = scaler.transform(sample_data, inplace=True)
+
+    assert result is sample_data
+    assert abs(sample_data["A"].mean()) < 1e-4
+    assert sample_data["Label"].iloc[0] == "x"
+
+
+# ✅ Fitted parameters round-trip through JSON and apply to a later stream
+def test_serialization_round_trip(sample_data, tmp_path):
+    scaler = FeatureScaler(method="minmax").fit_chunks(_chunks(sample_data, 300))
+    path = tmp_path / "scaler.json"
+    scaler.save(path)
+
+    restored = FeatureScaler.load(path)
+    expected = scaler.transform(sample_data)
+    streamed = pd.concat(restored.transform_chunks(_chunks(sample_data.copy(), 300)))
+
+    np.testing.assert_allclose(streamed[["A", "B"]].values, expected[["A", "B"]].values)
+
+
+# ✅ Unknown methods and unfitted use raise
+def test_invalid_usage(sample_data):
+    with pytest.raises(ValueError):
+        FeatureScaler(method="robust")
+    with pytest.raises(ValueError):
+        FeatureScaler().transform(sample_data)
@@ -0,0 +1,113 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from src.infrastructure.session_snapshot import DATA_FILE, PICKLED_DATA_FILE, SnapshotStore
+
+KEY = "0123456789abcdef0123456789abcdef"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(root=str(tmp_path / "snapshots"), max_age_hours=1)
+
+
+@pytest.fixture
+def sample_df():
+    """Creates the column types a session holds: Arrow strings, nullable ints, categories, time zones, objects."""
+    n = 50_000
+    df = pd.DataFrame({
+        "city": pd.Series(np.resize(["Pune", "Delhi", None], n), dtype="string[pyarrow]"),
+        "count": pd.array(np.arange(n), dtype="Int64"),
+        "amount": np.linspace(0, 1, n),
+        "segment": pd.Categorical(np.resize(["a", "b"], n)),
+        "seen": pd.date_range("2024-01-01", periods=n, freq="min", tz="Asia/Kolkata"),
+        "note": np.resize(["x", "y", None], n).astype(object),
+        7: np.arange(n),  # non-string column label
+    })
+    df.loc[3, "count"] = pd.NA
+    return df
+
+
+# ✅ Test the dataset round-trips exactly through a memory-mapped Arrow file
+def test_round_trip(store, sample_df):
+    snapshot = store.snapshot(KEY)
+    assert not snapshot.exists
+    history = [{"Step": "Uploaded cities.csv", "Rows": len(sample_df), "Columns": 7, "Time": "2024-01-01 10:00:00"}]
+    snapshot.save(sample_df, 3, history)
+
+    assert snapshot.exists
+    assert DATA_FILE in os.listdir(snapshot.directory)
+    restored = snapshot.load_data()
+    pd.testing.assert_frame_equal(restored, sample_df)
+    assert str(restored["city"].dtype) == "string" and restored["city"].dtype.storage == "pyarrow"
+
+    manifest = store.snapshot(KEY).manifest()
+    assert manifest["version"] == 3 and manifest["history"] == history
+
+    # Sliced frames keep their index
+    sliced = sample_df.iloc[::2]
+    snapshot.save(sliced, 4)
+    pd.testing.assert_frame_equal(snapshot.load_data(), sliced)
+    labelled = sample_df.set_index("city").head(100)
+    snapshot.save(labelled, 5)
+    pd.testing.assert_frame_equal(snapshot.load_data(), labelled)
+
+
+# ✅ Test older saves never replace newer ones and odd frames fall back to pickle
+def test_versions_and_fallback(store, sample_df):
+    snapshot = store.snapshot(KEY)
+    snapshot.save(sample_df.head(10), 5)
+    assert snapshot.save(sample_df, 4)["version"] == 5
+    assert len(snapshot.load_data()) == 10
+    assert not [name for name in os.listdir(snapshot.directory) if name.endswith(".tmp")]
+
+    mixed = pd.DataFrame({"value": [1, "one", None]})
+    snapshot.save(mixed, 6)
+    assert sorted(os.listdir(snapshot.directory)) == [PICKLED_DATA_FILE, "manifest.json"]
+    pd.testing.assert_frame_equal(snapshot.load_data(), mixed)
+
+
+# ✅ Test the report is only restored for the dataset version it was computed on
+def test_report(store, sample_df):
+    snapshot = store.snapshot(KEY)
+    snapshot.save(sample_df, 1)
+    assert snapshot.load_report() is None
+
+    report = {"Duplicate Report": {"Total Duplicates": 0}, "Missing Values Report": sample_df.isna().sum().to_frame()}
+    snapshot.save_report(report, 1)
+    restored = snapshot.load_report()
+    pd.testing.assert_frame_equal(restored["Missing Values Report"], report["Missing Values Report"])
+
+    snapshot.save_report(report, 2)  # computed before the data of version 2 is saved
+    assert "report-1.pkl" not in os.listdir(snapshot.directory)
+    assert snapshot.load_report() is None
+    snapshot.save(sample_df.head(), 2)
+    assert snapshot.load_report()["Duplicate Report"] == {"Total Duplicates": 0}
+
+
+# ✅ Test keys are validated and stale snapshots are swept
+def test_store(store, sample_df):
+    assert store.snapshot("../etc") is None
+    assert store.snapshot(None) is None
+
+    stale = store.snapshot("f" * 32)
+    stale.save(sample_df.head(), 1)
+    old = time.time() - 2 * 3600
+    os.utime(stale.directory, (old, old))
+    store.snapshot(KEY).save(sample_df.head(), 1)
+
+    assert store.sweep_stale() == ["f" * 32]
+    assert store.snapshot(KEY).exists
+
+
+# ✅ Test a restore token works once and the claimed snapshot gets a new token
+def test_claim(store, sample_df):
+    store.snapshot(KEY).save(sample_df.head(), 2, [{"Step": "Uploaded cities.csv"}])
+    claimed = store.claim(KEY)
+    assert claimed.key != KEY and len(claimed.key) == 32
+    assert not store.snapshot(KEY).exists and store.claim(KEY) is None
+    assert claimed.manifest()["version"] == 2
+    pd.testing.assert_frame_equal(claimed.load_data(), sample_df.head())
+    assert store.claim("../etc") is None
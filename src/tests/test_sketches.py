@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.sketches import HyperLogLog, MisraGries
+from src.services.quality_analysis import CardinalityAnalyzer, ClassImbalanceAnalyzer
+
+
+# ✅ HyperLogLog stays within a few percent of the true distinct count
+@pytest.mark.parametrize("n", [10, 5_000, 200_000])
+def test_hyperloglog_estimate(n):
+    values = pd.Series(np.arange(n)).astype(str)
+    estimate = HyperLogLog().update(values, chunksize=50_000).estimate()
+    assert abs(estimate - n) <= max(2, 0.03 * n)
+
+
+# ✅ Sketches of partitions merge into the sketch of the union
+def test_hyperloglog_merge():
+    left = HyperLogLog().update(pd.Series(range(0, 60_000)))
+    right = HyperLogLog().update(pd.Series(range(30_000, 90_000)))
+    whole = HyperLogLog().update(pd.Series(range(0, 90_000)))
+
+    merged = left.merge(right)
+    np.testing.assert_array_equal(merged.registers, whole.registers)
+    assert HyperLogLog.from_bytes(merged.to_bytes()).estimate() == merged.estimate()
+
+
+# ✅ Misra-Gries is exact for few classes and bounded for many
+def test_misra_gries():
+    values = pd.Series(np.random.default_rng(0).zipf(1.5, 100_000))
+    exact = values.value_counts()
+
+    summary = MisraGries(capacity=50).update(values, chunksize=10_000)
+    assert len(summary.counters) <= 50
+    assert summary.error_bound <= len(values) / 51
+    for value, count in summary.top_k(3):
+        assert exact[value] - summary.error_bound <= count <= exact[value]
+
+    small = MisraGries(capacity=50).update(pd.Series(["a", "b", "a", None]))
+    assert small.is_exact and small.top_k() == [("a", 2), ("b", 1)]
+
+
+# ✅ Partition summaries merge
+def test_misra_gries_merge():
+    a = MisraGries(capacity=10).update(pd.Series(["x"] * 50 + ["y"] * 5))
+    b = MisraGries(capacity=10).update(pd.Series(["x"] * 20 + ["z"] * 30))
+    merged = a.merge(b)
+    assert merged.total == 105
+    assert merged.top_k(2) == [("x", 70), ("z", 30)]
+
+
+# ✅ Class distribution uses the sketch, with an "Other" bucket beyond capacity
+def test_class_imbalance_capacity():
+    df = pd.DataFrame({"Target": ["a"] * 500 + [f"rare{i}" for i in range(100)]})
+    report = ClassImbalanceAnalyzer.analyze_class_imbalance(df, "Target", max_classes=10)
+
+    assert report["Class"].iloc[0] == "a"
+    assert report["Class"].iloc[-1] == "Other (approx.)"
+    assert report["Count"].sum() == len(df)
+
+
+def test_cardinality_report():
+    df = pd.DataFrame({"id": range(1000), "flag": ["y", "n"] * 500})
+    report = CardinalityAnalyzer.analyze_cardinality(df).set_index("Column")
+
+    assert abs(report.loc["id", "Distinct (approx.)"] - 1000) <= 30
+    assert report.loc["flag", "Distinct (approx.)"] == 2
+    assert report.loc["flag", "Top Values"] == "y (500), n (500)"
@@ -0,0 +1,89 @@
+import gc
+import io
+import os
+import time
+import pandas as pd
+import pytest
+from src.infrastructure.upload_store import UploadStore
+from src.services.data_validation import FileValidation
+
+
+class FakeUpload(io.BytesIO):
+    """Mimics Streamlit's UploadedFile (a BytesIO with name and size)."""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return UploadStore(root=str(tmp_path / "uploads"), max_age_hours=1)
+
+
+@pytest.fixture
+def csv_upload():
+    df = pd.DataFrame({"id": range(1000), "city": ["Pune", "Delhi"] * 500})
+    return FakeUpload(df.to_csv(index=False).encode(), "cities.csv")
+
+
+# ✅ Test that uploads are spilled to disk, closed, and parsed from the file
+def test_spill_and_read(store, csv_upload):
+    uploads = store.session_area("session-a")
+    data_file = uploads.spill(csv_upload)
+
+    assert csv_upload.closed
+    assert data_file.name == "cities.csv"
+    assert os.path.dirname(data_file.path) == uploads.directory
+    assert data_file.size == os.path.getsize(data_file.path)
+
+    df = FileValidation().read_file(data_file)
+    assert df.shape == (1000, 2)
+    assert df["city"].iloc[1] == "Delhi"
+
+
+# ✅ Test that a new upload replaces the previous file of the session
+def test_new_upload_replaces_previous(store, csv_upload):
+    uploads = store.session_area("session-a")
+    first = uploads.spill(csv_upload)
+    second = uploads.spill(FakeUpload(b'{"a": 1}\n{"a": 2}\n', "rows.jsonl"))
+
+    assert not os.path.exists(first.path)
+    assert uploads.files() == [os.path.basename(second.path)]
+    assert FileValidation().read_file(second)["a"].tolist() == [1, 2]
+
+
+# ✅ Test cleanup when the session area is released or explicitly cleaned
+def test_session_cleanup(store, csv_upload):
+    released = store.session_area("released")
+    released.spill(csv_upload)
+    directory = released.directory
+    del released
+    gc.collect()
+    assert not os.path.exists(directory)
+
+    explicit = store.session_area("explicit")
+    explicit.spill(FakeUpload(b"a\n1\n", "a.csv"))
+    explicit.cleanup()
+    assert not os.path.exists(explicit.directory)
+    assert not explicit.alive
+
+
+# ✅ Test that stale session directories are swept
+def test_sweep_stale(store):
+    stale = os.path.join(store.root, "stale-session")
+    os.makedirs(stale)
+    old = time.time() - 2 * 3600
+    os.utime(stale, (old, old))
+    fresh = store.session_area("fresh-session")
+
+    assert store.sweep_stale() == ["stale-session"]
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh.directory)
+
+
+# ✅ Test that unparseable files are reported as None
+def test_read_invalid_file(store):
+    data_file = store.session_area("s").spill(FakeUpload(b"\x00\x01garbage", "broken.xlsx"))
+    assert FileValidation().read_file(data_file) is None
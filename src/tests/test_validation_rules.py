@@ -0,0 +1,116 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from src.domain.validation_rules import RuleSet, UniqueRule
+from src.services.bitmaps import RowBitmap
+from src.services.data_validation import RuleValidator
+
+
+SCHEMA = {
+    "columns": {
+        "id": {"type": "integer", "unique": True, "required": True},
+        "age": {"type": "number", "min": 0, "max": 120},
+        "email": {"regex": r"[^@\s]+@[^@\s]+\.\w+"},
+        "status": {"allowed": ["active", "inactive"]},
+    },
+    "conditions": [{"name": "end_after_start", "expression": "end >= start"}],
+}
+
+
+@pytest.fixture
+def sample_data():
+    return pd.DataFrame({
+        "id": [1, 2, 3, 3, None, 6],
+        "age": [25, -1, 40, 200, 30, "abc"],
+        "email": ["a@x.com", "bad", None, "c@y.org", "d@z.net", "e@w.io"],
+        "status": ["active", "inactive", "deleted", "active", None, "active"],
+        "start": [1, 5, 3, 4, 5, 6],
+        "end": [2, 4, 3, 5, 6, 7],
+    })
+
+
+# ✅ Bitmaps grow across unaligned chunks
+def test_row_bitmap_append():
+    mask = np.random.default_rng(0).random(1003) > 0.7
+    bitmap = RowBitmap()
+    for start in range(0, len(mask), 37):
+        bitmap.append(mask[start:start + 37])
+
+    assert bitmap == RowBitmap.from_mask(mask)
+    assert bitmap.count() == mask.sum()
+    np.testing.assert_array_equal(bitmap.indices(), np.flatnonzero(mask))
+    assert (~bitmap).count() == len(mask) - mask.sum()
+    assert RowBitmap.from_bytes(bitmap.to_bytes()) == bitmap
+
+
+# ✅ Schema compiles into rules and violations are counted
+def test_rule_violations(sample_data):
+    report = RuleValidator(RuleSet.from_json(json.dumps(SCHEMA))).validate(sample_data)
+    counts = report.violation_counts()
+
+    assert counts["id:required"] == 1
+    assert counts["id:unique"] == 1
+    assert counts["age:type"] == 1
+    assert counts["age:range"] == 2
+    assert counts["email:regex"] == 1
+    assert counts["status:allowed"] == 1
+    assert counts["end_after_start"] == 1
+    assert not report.is_valid
+    assert list(report.bitmaps["age:range"].indices()) == [1, 3]
+
+
+# ✅ Chunked validation gives the same result, uniqueness spans chunks
+def test_chunked_matches_full(sample_data):
+    validator = RuleValidator(SCHEMA)
+    full = validator.validate(sample_data)
+    chunked = validator.validate(sample_data, chunksize=2)
+
+    assert chunked.violation_counts() == full.violation_counts()
+    assert chunked.failing_rows() == full.failing_rows()
+    assert chunked.summary()["Violations"].sum() == full.summary()["Violations"].sum()
+
+
+# ✅ Multi-column uniqueness and YAML schemas
+def test_composite_unique_from_yaml():
+    df = pd.DataFrame({"first": ["a", "a", "b"], "last": ["x", "x", "x"]})
+    rule_set = RuleSet.from_yaml("unique:\n  - [first, last]\n")
+
+    assert isinstance(rule_set.rules[0], UniqueRule)
+    assert RuleValidator(rule_set).validate(df).violation_counts() == {"first+last:unique": 1}
+
+
+# ✅ Test rules with the same name keep separate results
+def test_duplicate_rule_names():
+    df = pd.DataFrame({"email": ["a", "a", "b", None], "price": [1, 5, 2, 3]})
+    rule_set = RuleSet.from_dict({
+        "columns": {"email": {"unique": True, "required": True}},
+        "unique": [["email"]],
+        "conditions": [{"name": "check", "expression": "price < 4"}, {"name": "check", "expression": "price > 1"}],
+    })
+    report = RuleValidator(rule_set).validate(df)
+    assert report.violation_counts() == {"email:required": 1, "email:unique": 1, "email:unique (2)": 1,
+                                         "check": 1, "check (2)": 1}
+    assert report.summary()["Violations"].tolist() == [1, 1, 1, 1, 1]
+    assert list(report.bitmaps["check (2)"].indices()) == [0]
+
+
+def test_unknown_rule_key():
+    with pytest.raises(ValueError):
+        RuleSet.from_dict({"columns": {"a": {"maximum": 3}}})
+
+
+# ✅ Test expressions are limited to columns, literals and operators, and must be conditions
+def test_expression_allow_list(sample_data):
+    for expression in ["start.__class__ == 1", "__import__('os').getcwd() == 1", "@start > 1", "start[0] > 1"]:
+        with pytest.raises(ValueError):
+            RuleSet.from_dict({"conditions": [expression]})
+
+    data = sample_data.assign(**{"unit price": [1, 2, 3, 4, 5, 6]})
+    rule = RuleSet.from_dict({"conditions": ["`unit price` <= end and status in ['active', 'inactive']"]}).rules[0]
+    assert rule.violations(data).tolist() == [False, False, True, False, True, False]
+
+    with pytest.raises(ValueError, match="must be a condition"):
+        RuleSet.from_dict({"conditions": ["end - start"]}).rules[0].violations(sample_data)
+    with pytest.raises(KeyError):
+        RuleSet.from_dict({"conditions": ["missing > 1"]}).rules[0].violations(sample_data)